@@ -20,14 +20,14 @@ try:
     from bots.vrlg.config import coerce_vrlg_config  # type: ignore
     from bots.vrlg.rotation_detector import RotationDetector  # type: ignore
     from bots.vrlg.signal_detector import SignalDetector  # type: ignore
-    from bots.vrlg.data_feed import FeatureSnapshot  # type: ignore
+    from bots.vrlg.data_feed import FeatureSnapshot, l1_features  # type: ignore
     from bots.vrlg.size_allocator import SizeAllocator  # type: ignore
     from bots.vrlg.risk_management import RiskManager  # type: ignore
 except Exception:
     from src.bots.vrlg.config import coerce_vrlg_config  # type: ignore
     from src.bots.vrlg.rotation_detector import RotationDetector  # type: ignore
     from src.bots.vrlg.signal_detector import SignalDetector  # type: ignore
-    from src.bots.vrlg.data_feed import FeatureSnapshot  # type: ignore
+    from src.bots.vrlg.data_feed import FeatureSnapshot, l1_features  # type: ignore
     from src.bots.vrlg.size_allocator import SizeAllocator  # type: ignore
     from src.bots.vrlg.risk_management import RiskManager  # type: ignore
 
@@ -250,6 +250,7 @@ class VRLGSimulator:
         # ステップ状の 100ms サンプリングを作る
         dt = 0.1
         next_emit: Optional[float] = None
+        tick = max(self.tick, 1e-12)
 
         # Exit 待ちの“ポジション”（充足済み子注文）
         open_fills: List[Tuple[str, float, float, float]] = []  # (side, t_fill, px_fill, ref_mid)
@@ -261,14 +262,11 @@ class VRLGSimulator:
             if t < next_emit:
                 self._last_mid = (bb + ba) / 2.0
                 self._last_dob = bs + asz
-                self._last_spread = (ba - bb) / max(self.tick, 1e-12)
+                self._last_spread = (ba - bb) / tick
                 continue
 
-            # 特徴量生成
-            mid = (bb + ba) / 2.0
-            spread_ticks = (ba - bb) / max(self.tick, 1e-12)
-            dob = bs + asz
-            obi = 0.0 if dob <= 0 else (bs - asz) / max(dob, 1e-9)
+            # 特徴量生成（ライブの _feature_pump と同じ計算を共有）
+            mid, spread_ticks, dob, obi = l1_features(bb, ba, bs, asz, tick)
             # 〔この2行がすること〕 取り込み遅延（ingest）を特徴量のタイムスタンプに反映します
             eff_t = t + self.ingest_lag_s
             snap = FeatureSnapshot(t=eff_t, mid=mid, spread_ticks=spread_ticks, dob=dob, obi=obi)
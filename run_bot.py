@@ -7,7 +7,6 @@ import logging
 import os
 import signal
 import sys
-from decimal import Decimal, ROUND_DOWN
 from importlib import import_module
 from os import getenv
 from pathlib import Path
@@ -20,13 +19,11 @@ from hl_core.config import (
 from hl_core.utils.dotenv_compat import load_dotenv
 from hl_core.utils.logger import setup_logger
 
-# Prefer real SDK for runtime; fall back to local stubs if unavailable
-try:  # pragma: no cover - import resolution
-    from hyperliquid.info import Info  # type: ignore
-    from hyperliquid.utils import constants  # type: ignore
-except Exception:  # pragma: no cover - fallback for offline dev
-    from hyperliquid_stub.info import Info  # type: ignore
-    from hyperliquid_stub.utils import constants  # type: ignore
+# uvloop があれば高速化（なくても動く / Windows は既定ループのまま）
+try:  # pragma: no cover - optional dependency
+    import uvloop  # type: ignore
+except Exception:  # pragma: no cover
+    uvloop = None  # type: ignore
 
 # 二重起動防止フラグ（親→子で継承される環境変数を利用）
 if os.environ.get("RUN_BOT_SINGLETON") == "1":
@@ -71,66 +68,6 @@ MAX_ORDER_PER_SEC = 3
 SEMA = asyncio.Semaphore(MAX_ORDER_PER_SEC)  # 発注 3 req/s 共有
 
 
-async def _place_order_async(ex, *args, **kwargs):
-    """Run synchronous `ex.order` in a thread and return its ACK."""
-    loop = asyncio.get_running_loop()
-
-    coin = kwargs.get("coin")
-    sz = kwargs.get("sz")
-    limit_px = kwargs.get("limit_px")
-    if coin and (sz is not None or limit_px is not None):
-        info = Info(constants.MAINNET_API_URL, skip_ws=True)
-        meta = await loop.run_in_executor(None, info.meta)
-        unit = next((u for u in meta["universe"] if u.get("name") == coin), None)
-        if unit:
-            # 価格ティック丸め（px_tickの整数倍に切り捨て）
-            if limit_px is not None:
-                try:
-                    px_tick = float(unit.get("pxTick", 0.5))
-                except Exception:
-                    px_tick = 0.5
-                limit_px = float(
-                    (Decimal(str(limit_px)) / Decimal(str(px_tick))).to_integral_value(
-                        rounding=ROUND_DOWN
-                    )
-                    * Decimal(str(px_tick))
-                )
-                kwargs["limit_px"] = limit_px
-            # 数量ティック丸め（qty_tickの整数倍に切り捨て＋最小刻み保証）
-            if sz is not None:
-                try:
-                    qty_tick = 10 ** (-unit["szDecimals"])
-                except Exception:
-                    qty_tick = 0.001
-                sz = float(
-                    (Decimal(str(sz)) / Decimal(str(qty_tick))).to_integral_value(
-                        rounding=ROUND_DOWN
-                    )
-                    * Decimal(str(qty_tick))
-                )
-                if sz < qty_tick:
-                    sz = qty_tick
-                kwargs["sz"] = sz
-
-    res = await asyncio.to_thread(ex.order, *args, **kwargs)
-    logger.debug("ORDER-ACK %s", res)
-    try:
-        st = (res or {}).get("response", {}).get("data", {}).get("statuses", [])
-        st = st[0] if st else {}
-        if "error" in st:
-            logger.warning("ORDER-ERR %s", st.get("error"))
-
-        status_val = (st.get("status") or "").lower()
-        if status_val == "filled" or "filled" in st:
-            sz = st.get("sz") or st.get("size") or st.get("totalSz")
-            px = st.get("px") or st.get("price") or st.get("avgPx")
-            oid = st.get("oid") or st.get("orderId")
-            logger.info("ORDER-FILLED sz=%s px=%s oid=%s", sz, px, oid)
-    except Exception:
-        pass
-    return res
-
-
 def load_pair_yaml(path: str | None) -> dict[str, dict]:
     if not path:
         return {}
@@ -221,8 +158,30 @@ async def main() -> None:
         strategies.append(st)
 
     # WS → 全 Strategy へ配信
-    async def fanout(msg: dict):
-        for st in strategies:
+    # 役割: 戦略が処理しないチャネル（subscriptionResponse/pong 等）は on_message に入る前に捨て、
+    #       activeAssetCtx は coin ごとに該当 Strategy だけへ配る
+    handled_channels: frozenset[str] | None = None
+    if all(isinstance(getattr(st, "_handlers", None), dict) for st in strategies):
+        handled_channels = frozenset(
+            ch for st in strategies for ch in st._handlers  # type: ignore[attr-defined]
+        )
+    ctx_routes: dict[str, list] = {}
+    for st in strategies:
+        coin = str(getattr(st, "base_coin", "") or "").upper()
+        ctx_routes.setdefault(coin, []).append(st)
+
+    # 役割: 同期関数にして、WSClient がメッセージごとにコルーチンを作って await する手間を省く
+    def fanout(msg: dict) -> None:
+        ch = msg.get("channel")
+        if handled_channels is not None and ch not in handled_channels:
+            return
+        targets = strategies
+        if ch == "activeAssetCtx":
+            coin = (msg.get("data") or {}).get("coin")
+            if coin:
+                # 取引所は大文字の coin を送ってくるので、まずそのまま引いて upper() を省く
+                targets = ctx_routes.get(coin) or ctx_routes.get(str(coin).upper(), strategies)
+        for st in targets:
             st.on_message(msg)
 
     ws.on_message = fanout
@@ -260,12 +219,24 @@ async def main() -> None:
             await ws.close()
         except Exception:
             pass
+        # 役割: 各 Strategy の常駐タスクや発注用の接続を片付ける（aclose）
+        for st in strategies:
+            aclose = getattr(st, "aclose", None)
+            if aclose is None:
+                continue
+            try:
+                await aclose()
+            except Exception as exc:
+                logger.warning("strategy close failed: %s", exc)
     return
 
 
 if __name__ == "__main__":
     # 何をするコードか: Ctrl+C(SIGINT)を確実に捕捉し、安全に終了(コード130)する
     def run() -> int:
+        # 役割: asyncio.run より前にイベントループを uvloop へ差し替え、WS受信/発注のループ負荷を下げる
+        if uvloop is not None:
+            uvloop.install()
         try:
             asyncio.run(main())
         except KeyboardInterrupt:
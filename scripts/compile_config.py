@@ -0,0 +1,45 @@
+# scripts/compile_config.py
+# 〔このスクリプトがすること〕
+# ボットの YAML 設定を、CONFIG をリテラルで持つ Python モジュール（<name>_data.py）に変換します。
+# 戦略は起動時に PyYAML の解析を省いてこのモジュールを読み込みます（.pyc キャッシュが効く）。
+# YAML が正本です。YAML を編集したらこのスクリプトを再実行してください（古いモジュールは自動で無視されます）。
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+# 〔この import がすること〕 YAML → Python リテラルの変換は共通ローダ側に置いています
+try:
+    from hl_core.utils.config import compile_yaml_config
+except Exception:
+    from src.hl_core.utils.config import compile_yaml_config  # type: ignore
+
+DEFAULT_CONFIGS = (
+    Path(__file__).resolve().parents[1] / "src" / "bots" / "pfpl" / "config.yaml",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """〔この関数がすること〕 CLI 引数を解釈します。"""
+    p = argparse.ArgumentParser(description="Compile YAML configs into <name>_data.py")
+    p.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=list(DEFAULT_CONFIGS),
+        help="YAML files to compile (default: src/bots/pfpl/config.yaml)",
+    )
+    return p.parse_args()
+
+
+def main() -> None:
+    """〔この関数がすること〕 指定された YAML をすべて変換し、出力先を表示します。"""
+    args = parse_args()
+    for path in args.paths:
+        out = compile_yaml_config(path)
+        print(f"compiled {path} -> {out}")
+
+
+if __name__ == "__main__":
+    main()
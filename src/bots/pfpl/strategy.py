@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 import asyncio
-import hmac
-import hashlib
-import json
+import bisect
+import copy
+import functools
 # 役割: 実行中に「どの行でログが出たか(lineno)」を出して、どの分岐が動いているか確定する
 import inspect
 import logging
 import logging.handlers
+import math
 import os
+import random
+import sys
 import time
 from collections import deque
 from datetime import datetime, timezone  # ← 追加
@@ -19,9 +22,15 @@ from typing import Any, cast
 from zoneinfo import ZoneInfo
 from datetime import timedelta
 
-import anyio
+import httpx
 from hl_core.config import load_settings
-from hl_core.utils.logger import create_csv_formatter, setup_logger
+from hl_core.utils.config import load_compiled_config
+from hl_core.utils.json_compat import json_dumps as _dumps
+from hl_core.utils.logger import (
+    QueuedFileFanoutHandler,
+    create_csv_formatter,
+    setup_logger,
+)
 # --- timezone resolver (JST fallback when tzdata is unavailable)
 def _resolve_tz(name: str):
     """tzinfo を返却。ZoneInfo が使えない/見つからない場合はフォールバック。
@@ -38,40 +47,165 @@ def _resolve_tz(name: str):
     if name in ("Asia/Tokyo", "JST", "Japan"):
         return timezone(timedelta(hours=9))
     return timezone.utc
-# 既存 import 群の最後あたりに追加
-# Prefer the official SDK when running normally; fall back to a local stub
-# during tests or when the SDK is unavailable.
-try:  # pragma: no cover - import resolution path
-    import os as _os
-    if _os.getenv("PYTEST_CURRENT_TEST"):
-        raise ImportError("force stub during tests")
-    from hyperliquid.exchange import Exchange  # type: ignore
-except Exception:  # pragma: no cover - fallback for tests/offline
-    from hyperliquid_stub.exchange import Exchange  # type: ignore
+
+
+def _next_midnight_ts(tz, now_ts: float) -> float:
+    """now_ts（UNIX 秒）から見た tz の翌日 0:00 を UNIX 秒で返す。"""
+    local = datetime.fromtimestamp(now_ts, tz)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight + timedelta(days=1)).timestamp()
+
+# ── Hyperliquid SDK / 暗号ライブラリ（遅延 import）──────────────────
+# hyperliquid.exchange・eth_account・coincurve は読み込みだけで数百 ms かかるため、
+# モジュール import 時ではなく PFPLStrategy を作るとき（_load_sdk）に初めて読み込む。
+_SDK_LOADED = False
+Exchange: Any = None
+Account: Any = None
+# SDK の署名ユーティリティ（発注を /exchange へ直接 POST する際に使う。無ければ SDK の order をスレッドで呼ぶ）
+MAINNET_API_URL: Any = None
+get_timestamp_ms: Any = None
+order_request_to_order_wire: Any = None
+action_hash: Any = None
+order_wires_to_order_action: Any = None
+sign_l1_action: Any = None
+# coincurve（libsecp256k1 バインディング）があれば L1 署名の ECDSA をネイティブで行う（無ければ eth_account）
+coincurve: Any = None
+_keccak: Any = None
+_AGENT_DOMAIN_SEP: bytes | None = None
+_AGENT_TYPE_HASH = b""
+_AGENT_SOURCE_HASH: dict[bool, bytes] = {}
+
+
+def _load_sdk() -> None:
+    """SDK・署名まわりの依存を一度だけ import してモジュール変数に束ねる。"""
+    global _SDK_LOADED, Exchange, Account, MAINNET_API_URL, get_timestamp_ms
+    global order_request_to_order_wire, action_hash, order_wires_to_order_action
+    global sign_l1_action, coincurve, _keccak
+    global _AGENT_DOMAIN_SEP, _AGENT_TYPE_HASH, _AGENT_SOURCE_HASH
+    if _SDK_LOADED:
+        return
+
+    # Prefer the official SDK when running normally; fall back to a local stub
+    # during tests or when the SDK is unavailable.
+    try:  # pragma: no cover - import resolution path
+        if os.getenv("PYTEST_CURRENT_TEST"):
+            raise ImportError("force stub during tests")
+        from hyperliquid.exchange import Exchange as _Exchange  # type: ignore
+    except Exception:  # pragma: no cover - fallback for tests/offline
+        from hyperliquid_stub.exchange import Exchange as _Exchange  # type: ignore
+    Exchange = _Exchange
+
+    try:  # pragma: no cover - eth_account is optional for tests
+        from eth_account.account import Account as _Account  # type: ignore
+    except Exception:  # noqa: F401 - fallback when eth_account isn't installed
+
+        class _Account:  # type: ignore
+            @staticmethod
+            def from_key(key: str):
+                class _Wallet:
+                    def __init__(self, key: str) -> None:
+                        self.key = key
+
+                return _Wallet(key)
+
+    Account = _Account
+
+    try:  # pragma: no cover - optional fast path
+        from hyperliquid.utils import constants as _constants  # type: ignore
+        from hyperliquid.utils import signing as _signing  # type: ignore
+
+        MAINNET_API_URL = _constants.MAINNET_API_URL
+        get_timestamp_ms = _signing.get_timestamp_ms
+        order_request_to_order_wire = _signing.order_request_to_order_wire
+        action_hash = _signing.action_hash
+        order_wires_to_order_action = _signing.order_wires_to_order_action
+        sign_l1_action = _signing.sign_l1_action
+    except Exception:  # pragma: no cover
+        sign_l1_action = None
+
+    try:  # pragma: no cover - optional dependency
+        import coincurve as _coincurve  # type: ignore
+    except Exception:  # pragma: no cover
+        _coincurve = None
+    coincurve = _coincurve
+
+    try:  # pragma: no cover - eth_account の依存として通常は入っている
+        from eth_utils import keccak as _keccak_fn  # type: ignore
+    except Exception:  # pragma: no cover
+        _keccak_fn = None
+    _keccak = _keccak_fn
+    if _keccak is not None:
+        _AGENT_DOMAIN_SEP = _agent_domain_separator()
+        _AGENT_TYPE_HASH = _keccak(b"Agent(string source,bytes32 connectionId)")
+        _AGENT_SOURCE_HASH = {True: _keccak(b"a"), False: _keccak(b"b")}
+    _SDK_LOADED = True
+
+
+def _agent_domain_separator() -> bytes | None:
+    """HL の L1 署名（EIP-712 Agent 型）のドメイン区切りを一度だけ計算する。"""
+    if _keccak is None:
+        return None
+    type_hash = _keccak(
+        b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+    )
+    return _keccak(
+        type_hash
+        + _keccak(b"Exchange")
+        + _keccak(b"1")
+        + (1337).to_bytes(32, "big")
+        + bytes(32)  # verifyingContract = 0x0
+    )
+
+
+def _agent_digest(connection_id: bytes, is_mainnet: bool) -> bytes:
+    """phantom agent の EIP-712 ダイジェスト（encode_typed_data + EIP-191 ハッシュと同値）。"""
+    struct_hash = _keccak(
+        _AGENT_TYPE_HASH + _AGENT_SOURCE_HASH[is_mainnet] + connection_id
+    )
+    return _keccak(b"\x19\x01" + _AGENT_DOMAIN_SEP + struct_hash)
+
+
+def _sign_l1_action_fast(
+    key: Any,
+    action: dict[str, Any],
+    vault_address: str | None,
+    nonce: int,
+    expires_after: int | None,
+    is_mainnet: bool,
+) -> dict[str, Any]:
+    """sign_l1_action と同じ署名を coincurve.PrivateKey で作る（型付きデータの組み立てを省く）。"""
+    digest = _agent_digest(
+        action_hash(action, vault_address, nonce, expires_after), is_mainnet
+    )
+    sig = key.sign_recoverable(digest, hasher=None)  # r(32) || s(32) || recid(1)
+    return {
+        "r": "0x" + sig[:32].hex(),
+        "s": "0x" + sig[32:64].hex(),
+        "v": sig[64] + 27,
+    }
 
 # 目的: 取引API(hl_core.api)のログレベルをDEBUGに上げ、注文送信の詳細ログを必ず出す
 logging.getLogger("hl_core.api").setLevel(logging.DEBUG)
 
-try:  # pragma: no cover - PyYAML may be absent in the test environment
-    import yaml  # type: ignore
-except ImportError as exc:  # noqa: F401 - surface missing PyYAML explicitly
-    raise RuntimeError(
-        "PyYAML が見つかりません。pfpl ボットの設定ファイルを読み込むには "
-        "`pip install pyyaml` などで PyYAML をインストールしてください。"
-    ) from exc
+_YAML_LOADER: Any = None
 
-try:  # pragma: no cover - eth_account is optional for tests
-    from eth_account.account import Account  # type: ignore
-except Exception:  # noqa: F401 - fallback when eth_account isn't installed
 
-    class Account:  # type: ignore
-        @staticmethod
-        def from_key(key: str):
-            class _Wallet:
-                def __init__(self, key: str) -> None:
-                    self.key = key
+def _yaml_load(text: str) -> Any:
+    """yaml.safe_load と同じ安全なローダで解析する（CSafeLoader 優先。PyYAML は初回呼び出しで import）。"""
+    global _YAML_LOADER
+    try:  # pragma: no cover - PyYAML may be absent in the test environment
+        import yaml  # type: ignore
+    except ImportError as exc:  # noqa: F401 - surface missing PyYAML explicitly
+        raise RuntimeError(
+            "PyYAML が見つかりません。pfpl ボットの設定ファイルを読み込むには "
+            "`pip install pyyaml` などで PyYAML をインストールしてください。"
+        ) from exc
+    if _YAML_LOADER is None:
+        # libyaml 付きの PyYAML なら C 実装のローダを使う（無ければ純 Python の SafeLoader）
+        _YAML_LOADER = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+    return yaml.load(text, Loader=_YAML_LOADER)
 
-            return _Wallet(key)
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 logger = logging.getLogger(__name__)
@@ -89,6 +223,10 @@ def _lock_strategy_logger_to_self(target: logging.Logger) -> None:
 
 _lock_strategy_logger_to_self(logger)
 
+# 役割: シンボル別 CSV への書き込みはこの 1 ハンドラ経由にする（キュー投入は 1 回、
+#       ディスク I/O とローテーションは QueueListener のスレッドでまとめて行う）
+_SYMBOL_LOG_FANOUT = QueuedFileFanoutHandler()
+
 
 def _maybe_enable_test_propagation() -> None:
     if os.getenv("PYTEST_CURRENT_TEST"):
@@ -106,6 +244,56 @@ def _safe_lineno() -> int:
     return frame.f_back.f_lineno
 
 
+def _first_nonempty(*values: Any) -> str | None:
+    """前後空白を除いて空でない最初の値を文字列で返す（無ければ None）。"""
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            candidate = str(value)
+        else:
+            candidate = value
+        candidate = candidate.strip()
+        if candidate:
+            return candidate
+    return None
+
+
+_CRED_ENV_KEYS = (
+    "HL_ACCOUNT_ADDRESS",
+    "HL_ACCOUNT_ADDR",
+    "HL_PRIVATE_KEY",
+    "HL_API_SECRET",
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_env_creds(
+    env_values: tuple[str | None, ...],
+) -> tuple[str | None, str | None]:
+    """環境変数 → .env 由来の Settings の順で (account, secret) を解決する。
+
+    env_values は _CRED_ENV_KEYS の現在値。同じ組なら .env 読込と Settings 検証は 1 回で済む。
+    """
+    settings = load_settings()  # .env を読み込むので、環境変数はこの後に読み直す
+    account = _first_nonempty(
+        os.getenv("HL_ACCOUNT_ADDRESS"),
+        os.getenv("HL_ACCOUNT_ADDR"),
+        settings.account_address,
+    )
+    secret = _first_nonempty(
+        os.getenv("HL_PRIVATE_KEY"),
+        os.getenv("HL_API_SECRET"),
+        settings.private_key,
+    )
+    return account, secret
+
+
+def _env_creds() -> tuple[str | None, str | None]:
+    """現在の環境変数に対応する (account, secret)。複数シンボル起動時は 2 つ目以降キャッシュを引く。"""
+    return _resolve_env_creds(tuple(os.environ.get(k) for k in _CRED_ENV_KEYS))
+
+
 def _coerce_bool(value: Any, *, default: bool) -> bool:
     """設定値を真偽値へ変換するヘルパー。"""
 
@@ -125,6 +313,214 @@ def _coerce_bool(value: Any, *, default: bool) -> bool:
         return bool(normalized)
     return bool(value)
 
+def _positions_by_coin(state: Any) -> dict[str, dict[str, Any]]:
+    """user_state の perpPositions を coin 名 → エントリの dict にまとめる。"""
+    positions = (state or {}).get("perpPositions") or []
+    return {p["position"]["coin"]: p for p in positions}
+
+
+# 役割: 同一口座の user_state を複数戦略で共有する（(base_url, account) → (monotonic 秒, state)）
+_USER_STATE_CACHE: dict[tuple[str, str], tuple[float, Any]] = {}
+_USER_STATE_LOCKS: dict[tuple[str, str], asyncio.Lock] = {}
+
+
+_HALF = Decimal("0.5")
+_HUNDRED = Decimal("100")
+_ZERO = Decimal("0")
+_NAN = float("nan")
+
+
+@functools.lru_cache(maxsize=256)
+def _D(text: str) -> Decimal:
+    """設定値などの文字列 → Decimal をキャッシュする（Decimal は不変なので同じオブジェクトを共有してよい）。"""
+    return Decimal(text)
+
+
+def _as_dec(value: Any) -> Decimal:
+    """Decimal ならそのまま、それ以外は文字列経由で Decimal にする（Decimal(str(Decimal)) の往復を避ける）。"""
+    if isinstance(value, Decimal):
+        return value
+    return _D(str(value))
+
+
+# 役割: meta() の結果と coin → universe エントリ / asset index の辞書をプロセス内で共有する
+#       （(base_url, testnet) → (meta, by_name, asset_idx)。universe の線形走査は初回だけ）
+_META_CACHE: dict[
+    tuple[str, bool], tuple[dict[str, Any], dict[str, dict[str, Any]], dict[str, int]]
+] = {}
+
+
+def _cached_meta(
+    info: Any, base_url: str, testnet: bool
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]], dict[str, int]]:
+    """meta() を (base_url, testnet) ごとに 1 回だけ取得し、coin 名で引ける辞書にして返す。"""
+    key = (base_url, testnet)
+    cached = _META_CACHE.get(key)
+    if cached is None:
+        meta = info.meta()
+        universe = meta.get("universe") or []
+        by_name = {u["name"]: u for u in universe}
+        asset_idx = {u["name"]: i for i, u in enumerate(universe)}
+        cached = _META_CACHE[key] = (meta, by_name, asset_idx)
+    return cached
+
+
+# Hyperliquid の 1 アクションあたりの注文上限
+_MAX_BATCH_ORDERS = 50
+
+
+# aiolimiter があればそれを、無ければ同じ使い方の簡易トークンバケットを使う
+try:  # pragma: no cover - optional dependency
+    from aiolimiter import AsyncLimiter as _AsyncLimiter  # type: ignore
+except Exception:  # pragma: no cover
+    _AsyncLimiter = None  # type: ignore
+
+
+class _TokenBucket:
+    """max_rate 回 / time_period 秒のトークンバケット（aiolimiter.AsyncLimiter 互換 + resize）。
+
+    acquire は asyncio.Lock で先着順に 1 人ずつ処理するので、補充時に全員が一斉に起きて取り合うことはない。
+    """
+
+    __slots__ = ("max_rate", "time_period", "_rate_per_sec", "_tokens", "_last", "_lock", "_wake")
+
+    def __init__(self, max_rate: float, time_period: float = 1.0) -> None:
+        self.max_rate = float(max_rate)
+        self.time_period = float(time_period)
+        self._rate_per_sec = self.max_rate / self.time_period
+        self._tokens = self.max_rate
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+        # 役割: resize 時に、トークン待ちで眠っている先頭の acquire を起こして待ち時間を計算し直させる
+        self._wake = asyncio.Event()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_rate, self._tokens + (now - self._last) * self._rate_per_sec
+        )
+        self._last = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                # 次の 1 トークンが貯まるまで待つ（resize で起こされたら待ち時間を計算し直す）
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(),
+                        (1.0 - self._tokens) / self._rate_per_sec,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    def resize(self, max_rate: float) -> None:
+        """上限（max_rate 回 / time_period 秒）を変更し、待っている acquire に再計算させる。"""
+        self._refill()
+        self.max_rate = float(max_rate)
+        self._rate_per_sec = self.max_rate / self.time_period
+        self._tokens = min(self._tokens, self.max_rate)
+        # 同期的に起こす（タスクを作らない）。以後の待ちは新しい Event で行う
+        wake, self._wake = self._wake, asyncio.Event()
+        wake.set()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+def _make_rate_limiter(max_rate: float, time_period: float = 1.0) -> Any:
+    """1 秒あたりの発注予算を守るリミッタを返す（async with で 1 トークン消費）。"""
+    if _AsyncLimiter is not None:
+        return _AsyncLimiter(max_rate, time_period)
+    return _TokenBucket(max_rate, time_period)
+
+
+def _order_error_status(exc: BaseException) -> int | None:
+    """例外から HTTP ステータスを取り出す（無ければ None）。"""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(attempt: int, status: int | None = None) -> float:
+    """発注リトライの待ち秒。
+
+    通常は 100ms * 2^(attempt-1) を 2 秒で頭打ち、429 はレート超過なので 2s * 2^(attempt-1) を 30 秒で頭打ち。
+    どちらも 0〜50ms のジッタを足す。
+    """
+    if status == 429:
+        return min(30.0, 2.0 * (2 ** (attempt - 1))) + random.uniform(0.0, 0.05)
+    return min(2.0, 0.1 * (2 ** (attempt - 1))) + random.uniform(0.0, 0.05)
+
+
+def _is_retryable_order_error(exc: BaseException) -> bool:
+    """4xx（429 を除く）はリクエスト自体の誤りなので再送しない。"""
+    code = _order_error_status(exc)
+    if code is None:
+        return True  # ネットワーク系・不明な例外は再送対象
+    return not (400 <= code < 500 and code != 429)
+
+# 役割: 判定モードを整数IDに正規化し、evaluate 内の文字列比較ラダーを避ける
+_MODE_ABS, _MODE_PCT, _MODE_EITHER, _MODE_BOTH = 0, 1, 2, 3
+_MODE_IDS: dict[str, int] = {
+    "abs": _MODE_ABS,
+    "pct": _MODE_PCT,
+    "either": _MODE_EITHER,
+    "both": _MODE_BOTH,
+}
+
+# 役割: evaluate 冒頭のガード結果（_tick_guard の戻り値）
+_GUARD_OK, _GUARD_CLOSE, _GUARD_SKIP = 0, 1, 2
+
+# 役割: 数量を刻みの整数目盛りで切り捨てる際に許す float 誤差（相対値。除算・乗算で乗る数 ulp ≒ 4e-16 を吸収し、
+#       目盛りが 1e12 規模でも 1 目盛りに届かない大きさ）
+_QTY_REL_TOL = 1e-15
+
+
+class _ConfigDict(dict):
+    """変更のたびに version を進める dict（派生値キャッシュの無効化判定用）。"""
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[override]
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def pop(self, *args: Any) -> Any:  # type: ignore[override]
+        self.version += 1
+        return super().pop(*args)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+
 # 役割: モジュールが読み込まれた瞬間に一度だけINFOログを出し、"新しい strategy.py が実行された"ことを確実に可視化する
 if not globals().get("_PFPL_STRATEGY_MODULE_BOOT_LOGGED"):
     logger.info(f"boot: PFPLStrategy build_id={PFPL_STRATEGY_BUILD_ID} file={__file__}")
@@ -134,9 +530,113 @@ if not globals().get("_PFPL_STRATEGY_MODULE_BOOT_LOGGED"):
 class PFPLStrategy:
     """Price-Fair-Price-Lag bot"""
 
+    # 役割: 毎 tick 触る属性はスロットに置いて属性アクセスを速くする
+    #       （テストや診断用の動的な属性/メソッド差し替えのため __dict__ も残す）
+    __slots__ = (
+        "__dict__",
+        "__weakref__",
+        "config",
+        "symbol",
+        "target_symbol",
+        "feed_key",
+        "fair_feed",
+        "_feed_usage",
+        "_mid",
+        "_mid_f",
+        "idx",
+        "ora",
+        "_idx_f",
+        "_ora_f",
+        "_fair",
+        "_fair_f",
+        "_fair_lazy",
+        "tick",
+        "_qty_tick",
+        "_qty_tick_f",
+        "_min_usd",
+        "_min_usd_f",
+        "_order_usd",
+        "_order_usd_f",
+        "max_pos",
+        "pos_usd",
+        "cooldown",
+        "last_side",
+        "last_ts",
+        "_now",
+        "_tick_clock",
+        "_loop",
+        "next_funding_ts",
+        "_funding_pause",
+        "_next_day_ts",
+        "_eps_pct",
+        "_buy_factor",
+        "_sell_factor",
+        "_eps_dec",
+        "_th_abs",
+        "_th_pct",
+        "_th_abs_f",
+        "_th_pct_f",
+        "_mode_id",
+        "_pct_mode",
+        "_spread_thr_usd",
+        "_spread_thr_bps",
+        "_eval_cfg_version",
+        "_handlers",
+        "_coin_set",
+        "_eval_wake",
+        "_eval_task",
+        "_order_q",
+        "_last_order_ts",
+        "_order_count_window_start",
+        "_order_count_in_window",
+        # WS ハンドラ（on_message 経由で毎フレーム）
+        "base_coin",
+        "indexPrices",
+        "oraclePrices",
+        "best_bid",
+        "best_ask",
+        "_last_mid_raw",
+        "_last_idx_raw",
+        "_last_ora_raw",
+        "_last_imp_raw",
+        "_last_cfg_check_ts",
+        # evaluate / _tick_guard / _check_limits（毎評価）
+        "_signal_hist",
+        "_signal_sorted",
+        "_signal_hist_ver",
+        "_signal_q_cache",
+        "_pct_quantile",
+        "_pct_window",
+        "_pct_min_samples",
+        "_pct_max_samples",
+        "_pct_sample_sec",
+        "_order_count",
+        "_start_day",
+        "max_daily_orders",
+        "funding_guard_enabled",
+        "funding_guard_buffer_sec",
+        "funding_guard_reenter_sec",
+    )
+
+    # 役割: eps_pct 代入時に価格補正の係数（BUY/SELL 倍率と Decimal 版）を一度だけ計算しておく
+    @property
+    def eps_pct(self) -> float:
+        return self._eps_pct
+
+    @eps_pct.setter
+    def eps_pct(self, value: Any) -> None:
+        eps = float(value or 0)
+        self._eps_pct = eps
+        self._buy_factor = 1.0 - eps
+        self._sell_factor = 1.0 + eps
+        self._eps_dec = _D(str(eps))
+
     # 役割: クールダウンと1秒あたりの最大発注数を守る（簡易レートリミット）
     def _can_fire(self, now_ts: float) -> bool:
         _logger = getattr(self, "log", None) or getattr(self, "logger", None)
+        # 役割: クールダウン中は毎 tick ここを通るので、DEBUG 無効時はメッセージを組み立てない
+        if _logger is not None and not _logger.isEnabledFor(logging.DEBUG):
+            _logger = None
         if not hasattr(self, "_last_order_ts"):
             self._last_order_ts = 0.0
         if not hasattr(self, "_order_count_window_start"):
@@ -148,7 +648,7 @@ class PFPLStrategy:
         if (now_ts - self._last_order_ts) < cd:
             if _logger:
                 _logger.debug(
-                    f"skip: cooldown {(now_ts - self._last_order_ts):.2f}s < {cd:.2f}s"
+                    "skip: cooldown %.2fs < %.2fs", now_ts - self._last_order_ts, cd
                 )
             return False
 
@@ -167,13 +667,14 @@ class PFPLStrategy:
 
     # 役割: 取引所の minSizeUsd が分かればそれ、無ければ設定値 min_usd を返す
     def _effective_min_usd(self) -> float:
-        exch_min = getattr(self, "minSizeUsd", None)
+        # 上書き用の属性は通常存在しないので、例外を伴う getattr ではなく __dict__ を引く
+        d = self.__dict__
+        exch_min = d.get("minSizeUsd")
         if exch_min is None:
-            meta = getattr(self, "market_meta", None) or getattr(self, "exchange_meta", None)
+            meta = d.get("market_meta") or d.get("exchange_meta")
             if isinstance(meta, dict):
                 exch_min = meta.get("minSizeUsd")
-        fallback = float(getattr(self, "min_usd", 0.0) or 0.0)
-        return float(exch_min) if exch_min is not None else fallback
+        return float(exch_min) if exch_min is not None else self._min_usd_f
 
     def _current_pos_usd(self, mid: Decimal | None = None) -> Decimal:
         """
@@ -181,17 +682,17 @@ class PFPLStrategy:
         """
         if not getattr(self, "dry_run", False):
             try:
-                return Decimal(str(self.pos_usd))
+                return _as_dec(self.pos_usd)
             except Exception:
-                return Decimal("0")
+                return _ZERO
 
         ref_mid = mid if mid is not None else getattr(self, "mid", None)
         if ref_mid is None:
-            return Decimal("0")
+            return _ZERO
         try:
-            return Decimal(self.paper_pos) * Decimal(str(ref_mid))
+            return Decimal(self.paper_pos) * _as_dec(ref_mid)
         except Exception:
-            return Decimal("0")
+            return _ZERO
 
     def _projected_pos_usd(
         self,
@@ -229,11 +730,22 @@ class PFPLStrategy:
     def _get_from_feed(self, feed: dict[str, Any]) -> Any:
         if not feed:
             return None
-        if self.target_symbol in feed:
-            return feed[self.target_symbol]
-        if self.feed_key in feed:
-            return feed[self.feed_key]
-        return None
+        # in + [] の 2 回引きではなく get の 1 回引きにする
+        val = feed.get(self.target_symbol)
+        if val is None:
+            val = feed.get(self.feed_key)
+        return val
+
+    def _sync_paper_pos(self, mid_px: float) -> None:
+        """dry_run 時、_debug_evaluate_signal と同じく paper_pos を pos_usd / mid に揃える。"""
+        if not (getattr(self, "dry_run", False) or getattr(self, "is_dry_run", False)):
+            return
+        if not mid_px:
+            return
+        try:
+            self.paper_pos = Decimal(str(float(self.pos_usd) / mid_px))
+        except Exception:
+            pass
 
     # 何をする関数か:
     # - mid と fair の乖離（絶対値/率）を計算
@@ -263,7 +775,7 @@ class PFPLStrategy:
     ) -> dict:
         _maybe_enable_test_propagation()
         logger = getattr(self, "logger", None) or getattr(self, "log", None) or logging.getLogger(__name__)
-        now = time.time()
+        now = time.monotonic()  # last_order_ts はモノトニック秒
 
         diff_abs = mid_px - fair_px
         diff_pct = (diff_abs / fair_px) if fair_px else 0.0
@@ -286,11 +798,11 @@ class PFPLStrategy:
             if isinstance(candidate, Decimal):
                 return candidate
             if candidate is None:
-                return Decimal("0")
+                return _ZERO
             try:
                 return Decimal(str(candidate))
             except Exception:
-                return Decimal("0")
+                return _ZERO
 
         thr_abs_dec = _resolve_threshold(
             key="threshold", attr_name="threshold", override=threshold
@@ -308,9 +820,9 @@ class PFPLStrategy:
         thr_pct = float(thr_pct_dec)
         spread_thr = float(spread_thr_dec)
 
-        has_thr_abs = thr_abs_dec != Decimal("0")
-        has_thr_pct = thr_pct_dec != Decimal("0")
-        has_spread_thr = spread_thr_dec != Decimal("0")
+        has_thr_abs = thr_abs_dec != _ZERO
+        has_thr_pct = thr_pct_dec != _ZERO
+        has_spread_thr = spread_thr_dec != _ZERO
 
         cooldown = getattr(self, "cooldown_sec", 0.0)
         max_pos = getattr(self, "max_position_usd", float("inf"))
@@ -497,29 +1009,31 @@ class PFPLStrategy:
                     _is_dry,
                 )
 
-        logger.debug(
-            "decision mid=%.2f fair=%.2f d_abs=%+.4f d_pct=%+.5f | "
-            "abs>=%.4f:%s pct(mode=%s)>=%.5f:%s spread(px)<=%.4f:%s | "
-            "cooldown_ok=%s pos_ok=%s notional_ok=%s funding_ok=%s | "
-            "long=%s short=%s",
-            mid_px,
-            fair_px,
-            diff_abs,
-            diff_pct,
-            thr_abs,
-            abs_ok_val,
-            pct_mode,
-            pct_threshold_display,
-            pct_ok_val,
-            spread_thr_disp,
-            spread_ok_val,
-            cooldown_ok,
-            pos_ok,
-            notional_ok,
-            funding_ok,
-            want_long,
-            want_short,
-        )
+        # 役割: DEBUG 無効時は 17 個の引数タプルを組まない
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "decision mid=%.2f fair=%.2f d_abs=%+.4f d_pct=%+.5f | "
+                "abs>=%.4f:%s pct(mode=%s)>=%.5f:%s spread(px)<=%.4f:%s | "
+                "cooldown_ok=%s pos_ok=%s notional_ok=%s funding_ok=%s | "
+                "long=%s short=%s",
+                mid_px,
+                fair_px,
+                diff_abs,
+                diff_pct,
+                thr_abs,
+                abs_ok_val,
+                pct_mode,
+                pct_threshold_display,
+                pct_ok_val,
+                spread_thr_disp,
+                spread_ok_val,
+                cooldown_ok,
+                pos_ok,
+                notional_ok,
+                funding_ok,
+                want_long,
+                want_short,
+            )
 
         return {
             "diff_abs": diff_abs,
@@ -539,6 +1053,8 @@ class PFPLStrategy:
     # ← シグネチャはそのまま
     _LOGGER_INITIALISED = False
     _FILE_HANDLERS: set[str] = set()
+    # 役割: config.yaml の解析結果をプロセス内で共有する（path → (mtime_ns, dict)。編集されたら読み直す）
+    _YAML_CACHE: dict[str, tuple[int, dict[str, Any]]] = {}
 
     def __init__(
         self, *, config: dict[str, Any], semaphore: asyncio.Semaphore | None = None
@@ -554,32 +1070,37 @@ class PFPLStrategy:
         yml_path = Path(__file__).with_name("config.yaml")
         yaml_conf: dict[str, Any] = {}
         if yml_path.exists():
-            with yml_path.open(encoding="utf-8") as f:
-                raw_conf = f.read()
-            yaml_conf = yaml.safe_load(raw_conf) or {}
+            cache_key = str(yml_path)
+            mtime_ns = yml_path.stat().st_mtime_ns
+            cached = PFPLStrategy._YAML_CACHE.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                yaml_conf = cached[1]
+            else:
+                # 役割: scripts/compile_config.py で生成した config_data.py が YAML と一致すれば、YAML 解析を省いて使う
+                compiled = load_compiled_config(yml_path)
+                if compiled is not None:
+                    yaml_conf = compiled
+                else:
+                    with yml_path.open(encoding="utf-8") as f:
+                        raw_conf = f.read()
+                    yaml_conf = _yaml_load(raw_conf) or {}
+                PFPLStrategy._YAML_CACHE[cache_key] = (mtime_ns, yaml_conf)
+            # ネストした dict（funding_guard 等）をインスタンス間で共有しないよう複製する
+            yaml_conf = copy.deepcopy(yaml_conf)
         # 役割: config.yaml をデフォルトとして読み込み、run_bot.py 側の引数/外部設定で上書きできるようにする
         #       （testnet / dry_run / target_symbol / pair_cfg などの指定が効くように）
-        self.config = {**yaml_conf, **config}
+        self.config = _ConfigDict({**yaml_conf, **config})
         # runtime hot-reload bookkeeping
         self._cfg_yml_path: Path | None = yml_path if yml_path.exists() else None
         self._cfg_mtime: float | None = (
             (self._cfg_yml_path.stat().st_mtime if self._cfg_yml_path else None)
         )
-        self._last_cfg_check_ts: float = 0.0
+        self._last_cfg_check_ts: float = float("-inf")  # モノトニック秒
         # Ensure per-symbol rotating log under logs/pfpl/<SYMBOL>.csv
         log_dir = Path("logs") / "pfpl"
         log_dir.mkdir(parents=True, exist_ok=True)
         symbol_log_path = (log_dir / f"{self.config.get('target_symbol', 'ETH-PERP')}.csv").resolve()
-        existing_handler = next(
-            (
-                h
-                for h in logger.handlers
-                if isinstance(h, logging.handlers.TimedRotatingFileHandler)
-                and getattr(h, "baseFilename", "") == str(symbol_log_path)
-            ),
-            None,
-        )
-        if existing_handler is None and str(symbol_log_path) not in PFPLStrategy._FILE_HANDLERS:
+        if not _SYMBOL_LOG_FANOUT.has_file(str(symbol_log_path)):
             fh = logging.handlers.TimedRotatingFileHandler(
                 filename=str(symbol_log_path),
                 when="midnight",
@@ -589,8 +1110,10 @@ class PFPLStrategy:
                 utc=False,
             )
             fh.setFormatter(create_csv_formatter(include_logger_name=False))
-            logger.addHandler(fh)
+            _SYMBOL_LOG_FANOUT.add_file(fh)
             PFPLStrategy._FILE_HANDLERS.add(str(symbol_log_path))
+        if _SYMBOL_LOG_FANOUT not in logger.handlers:
+            logger.addHandler(_SYMBOL_LOG_FANOUT)
         # Apply per-config log level if provided (e.g., DEBUG/INFO)
         lvl = str(self.config.get("log_level") or "").strip()
         if lvl:
@@ -620,51 +1143,38 @@ class PFPLStrategy:
         self.eps_pct = float(self.config.get("eps_pct", 0.0005))
         # --- taker_mode: True なら板に寄せて踏み行く価格を使う
         self.taker_mode = _coerce_bool(self.config.get("taker_mode"), default=False)
+        # --- 発注ペイロードの不変部分（毎回の dict 生成を避ける。SDK 側では読み取りのみ）
+        self._ioc_order_type: dict[str, Any] = {"limit": {"tif": "Ioc"}}
+        self._market_order_type: dict[str, Any] = {"market": {}}
 
         # ── ② 通貨ペア・Semaphore 初期化 ─────────────────
-        self.symbol = self.config.get("target_symbol", "ETH-PERP")
+        # 役割: フィード辞書のキー照合に使う文字列は intern しておく（同一オブジェクトなら比較が即決）
+        self.symbol = sys.intern(str(self.config.get("target_symbol", "ETH-PERP")))
         sym_parts = self.symbol.split("-", 1)
-        self.base_coin = sym_parts[0] if sym_parts else self.symbol
+        self.base_coin = sys.intern(sym_parts[0]) if sym_parts else self.symbol
         self.target_symbol = self.symbol
         self.feed_key = self.base_coin
+        # 役割: WS の coin 判定用（毎フレームの upper()/split を避けて集合の所属判定だけにする）
+        self._coin_set = frozenset((self.symbol, self.base_coin, self.base_coin.upper()))
 
+        # 役割: クラス内で必ず使えるロガーを確保（self.log/self.logger が無い環境向けの保険）
         self.log = logging.getLogger(__name__)
 
         max_ops = int(self.config.get("max_order_per_sec", 3))  # 1 秒あたり発注上限
+        # 役割: sem は run_bot が全 Strategy に同じものを渡す「口座全体の同時送信数」の上限。
+        #       _rl はこの Strategy の 1 秒あたり送信数を平準化するバケットで、シンボルをまたいだ
+        #       同時送信は抑えられないため、両方を重ねて使う
         self.sem = semaphore or asyncio.Semaphore(max_ops)
+        self._rl = _make_rate_limiter(max(1, max_ops), 1.0)
 
         # 以降 (env 読み込み・SDK 初期化 …) は従来コードを続ける
         # ------------------------------------------------------------------
 
         # ── 環境変数キー ────────────────────────────────
-        settings = load_settings()
-
-        def _first_nonempty(*values: Any) -> str | None:
-            for value in values:
-                if value is None:
-                    continue
-                if not isinstance(value, str):
-                    candidate = str(value)
-                else:
-                    candidate = value
-                candidate = candidate.strip()
-                if candidate:
-                    return candidate
-            return None
-
         # Precedence: explicit config > environment > .env-derived settings
-        account = _first_nonempty(
-            self.config.get("account_address"),
-            os.getenv("HL_ACCOUNT_ADDRESS"),
-            os.getenv("HL_ACCOUNT_ADDR"),
-            settings.account_address,
-        )
-        secret = _first_nonempty(
-            self.config.get("private_key"),
-            os.getenv("HL_PRIVATE_KEY"),
-            os.getenv("HL_API_SECRET"),
-            settings.private_key,
-        )
+        env_account, env_secret = _env_creds()
+        account = _first_nonempty(self.config.get("account_address"), env_account)
+        secret = _first_nonempty(self.config.get("private_key"), env_secret)
 
         missing_parts: list[str] = []
         if not account:
@@ -686,6 +1196,7 @@ class PFPLStrategy:
         self.secret: str = secret
 
         # ── Hyperliquid SDK 初期化 ──────────────────────
+        _load_sdk()
         # 型安全: eth_account が無い環境ではスタブ _Wallet を返すため、実行時のみ厳密
         wallet: Any = Account.from_key(self.secret)
         self.wallet = wallet
@@ -699,19 +1210,34 @@ class PFPLStrategy:
             base_url,
             account_address=self.account,
         )
+        self._user_state_key = (base_url, self.account)
+        # 役割: 発注 POST 用の keep-alive 付き AsyncClient（初回発注時に生成。直接 POST できない環境では None のまま）
+        self._http: httpx.AsyncClient | None = None
+        self._direct_order = True
+        # 役割: coincurve があれば libsecp256k1 の鍵を一度だけ作り、直接 POST の署名に使う
+        self._ec_key: Any = None
+        if coincurve is not None and _AGENT_DOMAIN_SEP is not None:
+            try:
+                self._ec_key = coincurve.PrivateKey(
+                    bytes.fromhex(self.secret.removeprefix("0x"))
+                )
+            except Exception:
+                self._ec_key = None  # 鍵形式が合わなければ eth_account で署名する
 
         # ── meta 情報から tick / min_usd 決定 ───────────
-        meta = self.exchange.info.meta()
+        meta, self._universe_by_name, self._asset_idx = _cached_meta(
+            self.exchange.info, base_url, bool(self.config.get("testnet"))
+        )
 
         # min_usd
         if min_usd_cfg := self.config.get("min_usd"):
-            self.min_usd = Decimal(str(min_usd_cfg))
+            self.min_usd = _D(str(min_usd_cfg))
             logger.info("min_usd override from config: USD %.2f", self.min_usd)
         else:
             min_usd_map: dict[str, str] = meta.get("minSizeUsd", {})
             min_usd_raw = min_usd_map.get(self.base_coin)
             if min_usd_raw is not None:
-                self.min_usd = Decimal(str(min_usd_raw))
+                self.min_usd = _D(str(min_usd_raw))
                 logger.info(
                     "min_usd from meta for %s: USD %.2f", self.base_coin, self.min_usd
                 )
@@ -722,16 +1248,16 @@ class PFPLStrategy:
                 )
 
         # tick
-        uni_entry = next(u for u in meta["universe"] if u["name"] == self.base_coin)
+        uni_entry = self._universe_by_name[self.base_coin]
         tick_raw = uni_entry.get("pxTick") or uni_entry.get("pxTickSize", "0.01")
-        self.tick = Decimal(str(tick_raw))
+        self.tick = _D(str(tick_raw))
         logger.info("pxTick for %s: %s", self.base_coin, self.tick)
 
         qty_tick_val: Decimal | None = None
         qty_tick_raw = uni_entry.get("qtyTick")
         if qty_tick_raw is not None:
             try:
-                qty_tick_val = Decimal(str(qty_tick_raw))
+                qty_tick_val = _D(str(qty_tick_raw))
             except Exception:  # pragma: no cover - defensive parsing
                 qty_tick_val = None
         if qty_tick_val is None:
@@ -760,6 +1286,7 @@ class PFPLStrategy:
         # 役割: decision 側が参照する self.max_position_usd を必ず初期化して、未設定(inf)にならないようにする
         self.max_position_usd = self.max_pos
         self.fair_feed = self.config.get("fair_feed", "indexPrices")
+        self._feed_usage: tuple[Any, tuple[bool, bool]] = (object(), (False, False))  # 未計算
         self.testnet = bool(self.config.get("testnet"))
         self.max_daily_orders = int(self.config.get("max_daily_orders", 500))
         # Timezone: default JST; allow override via config time_zone
@@ -767,42 +1294,84 @@ class PFPLStrategy:
         self._tz = _resolve_tz(self.time_zone)
         self._order_count = 0
         self._start_day = datetime.now(self._tz).date()
+        # 役割: 日付跨ぎ判定を毎 tick の datetime 生成ではなく UNIX 秒の比較で済ませる
+        self._next_day_ts = _next_midnight_ts(self._tz, time.time())
         self.enabled = True
 
-        # 役割: クラス内で必ず使えるロガーを確保（self.log/self.logger が無い環境向けの保険）
-        self.log = logging.getLogger(__name__)
-
-
         # 役割: 起動時に「build_id」と「このモジュールの実ファイルパス(__file__)」を必ず出して、読み込み元を確定する
         logger.info(f"boot: PFPLStrategy build_id={PFPL_STRATEGY_BUILD_ID} file={__file__}")
         # ── フィード保持用 -------------------------------------------------
-        self.mid: Decimal | None = None  # 板 Mid (@1)
+        self._mid: Decimal | None = None
+        self._mid_f = _NAN  # 判定用の float 版（未取得は nan）
+        self.mid = None  # 板 Mid (@1)
         self.idx: Decimal | None = None  # indexPrices
         self.ora: Decimal | None = None  # oraclePrices
-        self.fair: Decimal | None = None  # 平均した公正価格
-        self.allMids: dict[str, Any] = {}
+        # 役割: 判定用の float 版（未取得は nan）。fair の Decimal は読まれたときだけ作る
+        self._idx_f = _NAN
+        self._ora_f = _NAN
+        self._fair: Decimal | None = None
+        self._fair_f = _NAN
+        self._fair_lazy = False
+        self.fair = None  # 平均した公正価格
         self.indexPrices: dict[str, Any] = {}
         self.oraclePrices: dict[str, Any] = {}
+        # 役割: 直近に解析した (生の値, Decimal) を feed ごとに保持し、同じ文字列の再解析を省く
+        self._last_mid_raw: tuple[Any, Decimal | None] | None = None
+        self._last_idx_raw: tuple[Any, Decimal | None] | None = None
+        self._last_ora_raw: tuple[Any, Decimal | None] | None = None
+        self._last_imp_raw: tuple[Any, Any, Decimal | None, Decimal | None] | None = None
         self.best_bid: Decimal | None = None
         self.best_ask: Decimal | None = None
         # シグナル履歴（abs(diff)）でパーセンタイル判定に使う
         self._signal_hist: deque[tuple[float, float]] = deque()
+        # 役割: _signal_hist の値だけを昇順で保持する写し（分位点を毎 tick の sorted() なしで引く）
+        self._signal_sorted: list[float] = []
+        # 役割: 履歴が変わるたびに進む版数と、(版数, quantile, min_samples) → 分位点の 1 件キャッシュ
+        self._signal_hist_ver = 0
+        self._signal_q_cache: tuple[tuple[int, float, int], float | None] | None = None
+        # WS チャネル名 → on_message 用ハンドラ（各ハンドラは msg["data"] だけを受け取る）
+        self._handlers: dict[str, Any] = {
+            "allMids": self._h_all_mids,
+            "indexPrices": self._h_index_prices,
+            "oraclePrices": self._h_oracle_prices,
+            "activeAssetCtx": self._h_active_asset_ctx,
+            "fundingInfo": self._h_funding_info,
+        }
         # 紙トレ用のポジション・PNL
         self.paper_pos = Decimal("0")
         self.paper_avg_px = Decimal("0")
         self.paper_realized = Decimal("0")
-        self.paper_fee_bps_taker = Decimal(str(self.config.get("paper_fee_bps_taker", 0.05)))
-        self.paper_fee_bps_maker = Decimal(str(self.config.get("paper_fee_bps_maker", 0.0)))
-        self.paper_slip_bps = Decimal(str(self.config.get("paper_slip_bps", 0.5)))  # IOC許容スリップ（bps）
+        self.paper_fee_bps_taker = _D(str(self.config.get("paper_fee_bps_taker", 0.05)))
+        self.paper_fee_bps_maker = _D(str(self.config.get("paper_fee_bps_maker", 0.0)))
+        self.paper_slip_bps = _D(str(self.config.get("paper_slip_bps", 0.5)))  # IOC許容スリップ（bps）
+        # 役割: evaluate で毎tick使う閾値・モードを事前に解釈しておく（config 変更時のみ再計算）
+        self._eval_cfg_version: int | None = None
+        self._refresh_eval_params()
 
         # ── 内部ステート ────────────────────────────────
         self.last_side: str | None = None
-        self.last_ts: float = 0.0
+        self.last_ts: float = 0.0  # 直近発注のモノトニック秒（time.monotonic）
+        self._now: float = 0.0  # 直近 evaluate のモノトニック秒（tick 内で時刻を読み直さない）
+        self._tick_clock: tuple[float, float] | None = None  # on_message が読んだ (壁時計, モノトニック)
         self.pos_usd = Decimal("0")
         self.position_refresh_interval = float(
             self.config.get("position_refresh_interval_sec", 5.0)
         )
         self._position_refresh_task: asyncio.Task | None = None
+        # 役割: user_state の取得/解析を短い TTL でまとめる（バースト時の重複リフレッシュを抑える）
+        self._pos_cache_ttl = float(self.config.get("position_cache_ttl_sec", 1.0))
+        self._pos_cache_ts: float | None = None
+        # 役割: 発注ごとの Task 生成を避けるため、常駐コンシューマへキュー経由で渡す
+        self._order_q: asyncio.Queue[tuple[str, float]] | None = None
+        self._order_consumer_task: asyncio.Task | None = None
+        # 役割: batch_orders 有効時は batch_window_ms の間に積まれた注文を bulk_orders でまとめて送る
+        self._batch_orders = bool(self.config.get("batch_orders", False))
+        self._batch_window = float(self.config.get("batch_window_ms", 10)) / 1000.0
+        # 役割: WS バースト時に evaluate を間引く（on_message はイベントを立てるだけ、
+        #       評価タスクが起きて 1 回評価し、その後 eval_coalesce_ms の間は次の評価を待たせる）
+        self._eval_interval = float(self.config.get("eval_coalesce_ms", 20)) / 1000.0
+        self._eval_wake = asyncio.Event()
+        self._eval_task: asyncio.Task | None = None
         # ★ Funding Guard 用
         self.next_funding_ts: float | None = None  # 直近 funding 予定の UNIX 秒
         self._funding_pause: bool = False  # True なら売買停止中
@@ -811,6 +1380,8 @@ class PFPLStrategy:
             loop = asyncio.get_running_loop()
         except RuntimeError:
             loop = None  # pytest 収集時など、イベントループが無い場合
+        # 役割: 発注後のポジション更新などで毎回 get_running_loop() を引かないよう、ループを保持しておく
+        self._loop = loop
 
         if loop is not None:
             loop.create_task(self._refresh_position())
@@ -818,6 +1389,10 @@ class PFPLStrategy:
                 self._position_refresh_task = loop.create_task(
                     self._position_refresh_loop()
                 )
+            self._order_q = asyncio.Queue(maxsize=64)
+            self._order_consumer_task = loop.create_task(self._order_consumer())
+            if self._eval_interval > 0:
+                self._eval_task = loop.create_task(self._eval_loop())
 
         # ─── ここから追加（ロガーをペアごとのファイルへも出力）────
         # Per-symbol rotating handler already attached above
@@ -834,11 +1409,37 @@ class PFPLStrategy:
         except Exception:
             pass
 
+    # 役割: config から evaluate 用の閾値・モードを解釈してインスタンス属性へ保持する
+    def _refresh_eval_params(self) -> None:
+        cfg = self.config
+        self._th_abs = _D(str(cfg.get("threshold", "1.0")))
+        self._th_pct = _D(str(cfg.get("threshold_pct", "0.05")))
+        # 判定は float で行う（Decimal は発注サイズの丸め境界だけで使う）
+        self._th_abs_f = float(self._th_abs)
+        self._th_pct_f = float(self._th_pct)
+        self._pct_mode = str(cfg.get("threshold_pct_mode", "absolute")).lower()
+        self._pct_quantile = float(
+            cfg.get("threshold_pct_quantile", cfg.get("threshold_pct", 0.0))
+        )
+        self._pct_window = float(cfg.get("threshold_pct_window_sec", 900.0))
+        self._pct_min_samples = int(cfg.get("threshold_pct_min_samples", 50))
+        # 役割: 窓内の履歴件数の上限（高頻度 tick でも履歴のメモリと挿入コストを頭打ちにする。0 以下で無制限）
+        self._pct_max_samples = int(cfg.get("threshold_pct_max_samples", 20000))
+        # 役割: 履歴へ積む最短間隔（秒）。tick 頻度に関係なく窓内の件数を window/間隔 程度に抑える。0 で毎評価
+        self._pct_sample_sec = float(cfg.get("threshold_pct_sample_sec", 0.0))
+        self._spread_thr_usd = float(cfg.get("spread_threshold", 0.0))
+        self._spread_thr_bps = float(cfg.get("spread_threshold_bps", 0.0))
+        self._mode_id = _MODE_IDS.get(str(cfg.get("mode", "both")), _MODE_BOTH)
+        # 素の dict に差し替えられた場合は version が無いため毎回再計算する
+        self._eval_cfg_version = getattr(cfg, "version", -1)
+
     # ---- runtime config reload (max_daily_orders immediate reflect) ----
-    def _maybe_reload_runtime_config(self) -> None:
+    def _maybe_reload_runtime_config(self, now: float | None = None) -> None:
         try:
-            now = time.time()
-            if (now - getattr(self, "_last_cfg_check_ts", 0.0)) < 5.0:
+            # 5 秒間隔の判定なので壁時計ではなくモノトニック時計で測る
+            if now is None:
+                now = time.monotonic()
+            if (now - getattr(self, "_last_cfg_check_ts", float("-inf"))) < 5.0:
                 return
             self._last_cfg_check_ts = now
             path = getattr(self, "_cfg_yml_path", None)
@@ -850,7 +1451,7 @@ class PFPLStrategy:
                 return
             # reload yaml and merge
             with path.open(encoding="utf-8") as f:
-                new_yaml = yaml.safe_load(f.read()) or {}
+                new_yaml = _yaml_load(f.read()) or {}
             old_limit = getattr(self, "max_daily_orders", None)
             self.config.update(new_yaml)
             self._cfg_mtime = mtime
@@ -861,11 +1462,29 @@ class PFPLStrategy:
                 if new_tzname != old_tzname:
                     self.time_zone = new_tzname
                     self._tz = _resolve_tz(new_tzname)
+                    self._next_day_ts = 0.0  # 次の判定で新しい tz の日境界を取り直す
                     logger.info(
                         "config reload: time_zone %s -> %s", old_tzname, new_tzname
                     )
             except Exception:
                 pass
+            # reflect max_order_per_sec immediately (token bucket resize)
+            try:
+                new_rate = max(1, int(self.config.get("max_order_per_sec", 3)))
+                rl = self._rl
+                if new_rate != int(rl.max_rate):
+                    logger.info(
+                        "config reload: max_order_per_sec %s -> %s",
+                        int(rl.max_rate),
+                        new_rate,
+                    )
+                    resize = getattr(rl, "resize", None)
+                    if resize is not None:
+                        resize(new_rate)
+                    else:
+                        self._rl = _make_rate_limiter(new_rate, 1.0)
+            except Exception:
+                pass
             # reflect max_daily_orders immediately
             try:
                 new_limit = int(self.config.get("max_daily_orders", old_limit or 500))
@@ -888,24 +1507,139 @@ class PFPLStrategy:
         except Exception as exc:
             logger.debug("config reload skipped: %s", exc)
 
+    async def _get_user_state(self, force: bool = False) -> Any:
+        """
+        同一口座の user_state を口座ごとのロックで 1 回の REST にまとめて取得する。
+        TTL（position_cache_ttl_sec）内は他の戦略が取得した結果を共有する。force=True なら
+        呼び出し後に開始した取得の結果だけを使う（ロック待ちの間に他の呼び出しが取得していればそれを共有）。
+        """
+        key = self._user_state_key
+        requested_at = time.monotonic()
+        lock = _USER_STATE_LOCKS.get(key)
+        if lock is None:
+            lock = _USER_STATE_LOCKS[key] = asyncio.Lock()
+        async with lock:
+            cached = _USER_STATE_CACHE.get(key)
+            if cached is not None and (
+                cached[0] >= requested_at
+                or (not force and time.monotonic() - cached[0] < self._pos_cache_ttl)
+            ):
+                return cached[1]
+            # 取得の「開始」時刻で記録する（完了時刻だと、呼び出し前に始まった取得を新しいとみなしてしまう）
+            started = time.monotonic()
+            state = await asyncio.to_thread(self.exchange.info.user_state, self.account)
+            _USER_STATE_CACHE[key] = (started, state)
+            return state
+
+    async def _send_order(self, order_fn: Any, order_kwargs: dict[str, Any]) -> Any:
+        """
+        1 注文を送る。SDK の Exchange.order が使われている場合は同じ署名済みペイロードを
+        keep-alive の httpx.AsyncClient で /exchange に直接 POST し、スレッド経由の同期 HTTP を避ける。
+        それ以外（スタブ/モック/署名ユーティリティ無し）は従来どおり order_fn をスレッドで呼ぶ。
+        """
+        payload = self._direct_order_payload(order_fn, "order", [order_kwargs])
+        if payload is None:
+            return await asyncio.to_thread(order_fn, **order_kwargs)
+        return await self._post_exchange(payload)
+
+    async def _send_bulk(self, bulk_fn: Any, orders: list[dict[str, Any]]) -> Any:
+        """複数注文を 1 つの署名済みアクションで送る（SDK の bulk_orders 相当）。"""
+        payload = self._direct_order_payload(bulk_fn, "bulk_orders", orders)
+        if payload is None:
+            return await asyncio.to_thread(bulk_fn, orders)
+        return await self._post_exchange(payload)
+
+    async def _post_exchange(self, payload: dict[str, Any]) -> Any:
+        client = self._http
+        if client is None:
+            client = self._http = httpx.AsyncClient(
+                base_url=self.exchange.base_url,
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(
+                    max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0
+                ),
+            )
+        # 役割: 本文は json_compat で直接 bytes 化（httpx 内部の標準 json を通さない）
+        resp = await client.post("/exchange", content=_dumps(payload), headers=_JSON_HEADERS)
+        resp.raise_for_status()  # 4xx は HTTPStatusError.response.status_code で即打ち切り判定される
+        return resp.json()
+
+    def _direct_order_payload(
+        self, fn: Any, method: str, orders: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """SDK の bulk_orders と同じ署名済み /exchange ペイロードを組む。組めない場合は None。"""
+        if not self._direct_order or sign_l1_action is None:
+            return None
+        sdk_method = getattr(type(self.exchange), method, None)
+        if sdk_method is None or getattr(fn, "__func__", None) is not sdk_method:
+            return None  # テスト等で exchange.order / bulk_orders が差し替えられている
+        if any("limit_px" not in o for o in orders):
+            return None
+        ex = self.exchange
+        try:
+            wires = []
+            for o in orders:
+                order: dict[str, Any] = {
+                    "coin": o["coin"],
+                    "is_buy": o["is_buy"],
+                    "sz": o["sz"],
+                    "limit_px": o["limit_px"],
+                    "order_type": o["order_type"],
+                    "reduce_only": o.get("reduce_only", False),
+                }
+                if o.get("cloid") is not None:
+                    order["cloid"] = o["cloid"]
+                asset = self._asset_idx.get(order["coin"])
+                if asset is None:
+                    asset = ex.info.name_to_asset(order["coin"])
+                wires.append(order_request_to_order_wire(order, asset))
+            nonce = get_timestamp_ms()
+            action = order_wires_to_order_action(wires)
+            signer = sign_l1_action
+            wallet = ex.wallet
+            if self._ec_key is not None:
+                signer, wallet = _sign_l1_action_fast, self._ec_key
+            signature = signer(
+                wallet,
+                action,
+                ex.vault_address,
+                nonce,
+                ex.expires_after,
+                ex.base_url == MAINNET_API_URL,
+            )
+        except (AttributeError, TypeError) as exc:
+            # SDK の版違い（ヘルパーや属性の形が合わない）なら以後 SDK の order に任せる
+            logger.warning("direct order path disabled: %s", exc)
+            self._direct_order = False
+            return None
+        except Exception as exc:
+            # この注文だけ組めない（例: order_type={"market": {}} は wire 化できない）→ この注文だけ SDK に任せる
+            logger.debug("direct order payload skipped for this order: %s", exc)
+            return None
+        return {
+            "action": action,
+            "nonce": nonce,
+            "signature": signature,
+            "vaultAddress": ex.vault_address,
+            "expiresAfter": ex.expires_after,
+        }
+
     # ── src/bots/pfpl/strategy.py ──
-    async def _refresh_position(self) -> None:
+    async def _refresh_position(self, force: bool = False) -> None:
         """
         現在の建玉 USD を self.pos_usd に反映。
         perpPositions が無い口座でも落ちない。
+        直近の成功から TTL 内なら再取得しない（force=True の約定直後は必ず取り直す）。
         """
+        now = time.monotonic()
+        last = self._pos_cache_ts
+        if not force and last is not None and now - last < self._pos_cache_ttl:
+            return
         try:
-            state = self.exchange.info.user_state(self.account)
+            state = await self._get_user_state(force=force)
 
             # ―― 対象コインの perp 建玉を抽出（無い場合は None）
-            perp_pos = next(
-                (
-                    p
-                    for p in state.get("perpPositions", [])  # ← 🔑 get(..., [])
-                    if p["position"]["coin"] == self.base_coin
-                ),
-                None,
-            )
+            perp_pos = _positions_by_coin(state).get(self.base_coin)
 
             usd = (
                 Decimal(perp_pos["position"]["sz"])
@@ -914,6 +1648,7 @@ class PFPLStrategy:
                 else Decimal("0")
             )
             self.pos_usd = usd
+            self._pos_cache_ts = now
             logger.debug("pos_usd refreshed: %.2f", usd)
         except Exception as exc:  # ← ここで握りつぶす
             logger.warning("refresh_position failed: %s", exc)
@@ -927,182 +1662,409 @@ class PFPLStrategy:
         while True:
             await self._refresh_position()
             try:
-                await anyio.sleep(interval)
+                await asyncio.sleep(interval)
             except asyncio.CancelledError:
                 raise
             except Exception as exc:  # pragma: no cover - defensive
                 logger.warning("position refresh sleep failed: %s", exc)
                 await asyncio.sleep(max(interval, 1))
 
+    def _qty_tick_scale(self) -> tuple[int, float] | None:
+        """qty_tick が 10 のべき乗なら (小数桁数, 10**桁数) を返す（qty_tick が差し替わった時だけ再計算）。"""
+        tick = self.qty_tick
+        if tick is getattr(self, "_qty_tick_src", None):
+            return self._qty_tick_cached
+        cached = None
+        if isinstance(tick, Decimal) and tick.is_finite() and tick > 0:
+            exp = tick.as_tuple().exponent
+            # 0.5 のような 10**-n でない刻みは整数目盛りで表せないので Decimal 経路に回す
+            if isinstance(exp, int) and tick.normalize().as_tuple().digits == (1,):
+                cached = (-exp, 10.0 ** (-exp))
+        self._qty_tick_src = tick
+        self._qty_tick_cached = cached
+        return cached
+
+    def _quantize_size_fast(self, raw_size: float) -> Decimal | None:
+        """raw_size を qty_tick で切り捨てる。10**-n 刻みは float の整数目盛り、それ以外は Decimal.quantize。"""
+        qty_scale = self._qty_tick_scale()
+        if qty_scale is None:
+            try:
+                return Decimal(str(raw_size)).quantize(self.qty_tick, rounding=ROUND_DOWN)
+            except InvalidOperation:
+                return None
+        scale, tick_inv = qty_scale
+        units = raw_size * tick_inv
+        # 相対誤差ぶんだけ持ち上げてから切り捨て、float 誤差の 434.99999999999994 → 434 だけを防ぐ
+        # （絶対値の遊びだと、本当に刻み直前の値まで次の刻みへ切り上がる）
+        return Decimal(max(math.floor(units + abs(units) * _QTY_REL_TOL), 0)).scaleb(-scale)
+
+    def _spawn(self, coro: Any) -> asyncio.Task:
+        """__init__ で保持したループに Task を作る（ループ外で生成された場合は実行中のループを使う）。"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return asyncio.create_task(coro)
+        return loop.create_task(coro)
+
+    async def _order_consumer(self) -> None:
+        """evaluate から積まれた (side, size) を順に place_order へ流す常駐タスク。"""
+        q = self._order_q
+        if q is None:
+            return
+        while True:
+            side, size = await q.get()
+            batch = [(side, size)]
+            if self._batch_orders:
+                # 役割: 窓の間に積まれた注文を最大 50 件まで 1 つの署名済みアクションにまとめる
+                await asyncio.sleep(self._batch_window)
+                while len(batch) < _MAX_BATCH_ORDERS and not q.empty():
+                    batch.append(q.get_nowait())
+            try:
+                if len(batch) == 1:
+                    await self.place_order(side, size)
+                else:
+                    await self.place_orders(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # ← 1件の失敗でコンシューマを止めない
+                logger.error("order consumer: place_order failed: %s", exc)
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    async def _eval_loop(self) -> None:
+        """on_message がイベントを立てたら evaluate を 1 回実行し、次の評価まで eval_coalesce_ms 空ける。"""
+        interval = self._eval_interval
+        wake = self._eval_wake
+        while True:
+            await wake.wait()  # 更新が無い間は起きない（一定周期のポーリングをしない）
+            wake.clear()
+            if math.isnan(self._mid_f) or math.isnan(self._fair_f):
+                continue
+            try:
+                self.evaluate()
+            except Exception as exc:  # ← 1tick の失敗で評価ループを止めない
+                logger.exception("evaluate failed: %s", exc)
+            # この間に来た更新はイベントにまとまり、次の 1 回の評価で反映される
+            await asyncio.sleep(interval)
+
+    async def aclose(self) -> None:
+        """常駐タスク（発注コンシューマ・評価ループ・ポジション定期更新）を止め、HTTP クライアントを閉じる。"""
+        tasks = [
+            t
+            for t in (self._order_consumer_task, self._eval_task, self._position_refresh_task)
+            if t is not None
+        ]
+        self._order_consumer_task = None
+        self._eval_task = None
+        self._position_refresh_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        client, self._http = self._http, None
+        if client is not None:
+            await client.aclose()
+
     # ② ────────────────────────────────────────────────────────────
     # ------------------------------------------------------------------ WS hook
     def on_message(self, msg: dict[str, Any]) -> None:
+        # 役割: 時刻はフレームごとに 1 回だけ読み、同じフレーム内の evaluate にも渡す
+        now_wall = time.time()
+        now = time.monotonic()
         # Hot-reload config (throttled) so max_daily_orders reflects immediately
-        self._maybe_reload_runtime_config()
+        self._maybe_reload_runtime_config(now)
         # Log and reset daily counters explicitly on UTC day change
-        self._maybe_daily_reset_and_log()
-        ch = msg.get("channel")
+        self._maybe_daily_reset_and_log(now_wall)
+        # 役割: チャネル名 → ハンドラの辞書で1回の参照で振り分け、data もここで 1 回だけ引いて渡す
+        handler = self._handlers.get(msg.get("channel"))
+        if handler is None:
+            return
+        should_eval, fair_inputs_changed = handler(msg.get("data"))
+
+        if fair_inputs_changed:
+            self._update_fair()
+
+        if should_eval and not math.isnan(self._mid_f) and not math.isnan(self._fair_f):
+            if self._eval_task is not None:
+                self._eval_wake.set()  # 実評価は _eval_loop でまとめて行う
+            else:
+                self._tick_clock = (now_wall, now)
+                try:
+                    self.evaluate()
+                finally:
+                    self._tick_clock = None
+
+    def _fair_feed_usage(self) -> tuple[bool, bool]:
+        """fair_feed 設定から (idx を使うか, ora を使うか) を返す（fair_feed が変わった時だけ作り直す）。"""
         feed = self.fair_feed
+        cached = self._feed_usage
+        if cached[0] == feed:
+            return cached[1]
         combined_feed = feed not in {"indexPrices", "oraclePrices"}
-        uses_index = feed == "indexPrices" or combined_feed
-        uses_oracle = feed == "oraclePrices" or combined_feed
+        usage = (
+            feed == "indexPrices" or combined_feed,
+            feed == "oraclePrices" or combined_feed,
+        )
+        self._feed_usage = (feed, usage)
+        return usage
 
+    def _h_all_mids(self, data: Any) -> tuple[bool, bool]:
+        """allMids: 板 mid を更新する。(should_eval, fair_inputs_changed) を返す。"""
         should_eval = False
-        fair_inputs_changed = False
-
-        if ch == "allMids":  # 板 mid 群
-            mids = (msg.get("data") or {}).get("mids") or {}
-            self.allMids = mids
-            mid_raw = self._get_from_feed(self.allMids)
-            mid_key: str | None = None
-            if self.target_symbol in self.allMids:
-                mid_key = self.target_symbol
-            elif self.feed_key in self.allMids:
-                mid_key = self.feed_key
-            if mid_raw is None:
+        mids = (data or {}).get("mids") or {}
+        # 役割: feed 全体の dict は保持せず、対象キーを 1 回だけ引いて型付きの self.mid に反映する
+        mid_key = self.target_symbol
+        mid_raw = mids.get(mid_key)
+        if mid_raw is None:
+            mid_key = self.feed_key
+            mid_raw = mids.get(mid_key)
+        if mid_raw is None:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
                     "allMids: waiting for mid for %s (base=%s)",
                     self.target_symbol,
                     self.feed_key,
                 )
-                return
+            return False, False
+        # 生の文字列が前回と同じで self.mid もその解析結果のままなら何もしない
+        last = self._last_mid_raw
+        if last is not None and last[1] is self.mid and last[0] == mid_raw:
+            return False, False
 
-            try:
-                new_mid = Decimal(str(mid_raw))
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning(
-                    "allMids: failed to parse mid %r for %s: %s",
-                    mid_raw,
-                    mid_key or self.symbol,
-                    exc,
-                )
-                return
+        try:
+            new_mid = Decimal(str(mid_raw))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning(
+                "allMids: failed to parse mid %r for %s: %s",
+                mid_raw,
+                mid_key or self.symbol,
+                exc,
+            )
+            return False, False
 
-            if new_mid != self.mid:
-                self.mid = new_mid
+        if new_mid != self.mid:
+            self.mid = new_mid
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug("allMids: mid[%s]=%s", mid_key, self.mid)
+            should_eval = True
+        self._last_mid_raw = (mid_raw, self.mid)
+        return should_eval, False
+
+    def _h_index_prices(self, data: Any) -> tuple[bool, bool]:
+        """indexPrices: インデックス価格を更新する。(should_eval, fair_inputs_changed) を返す。"""
+        uses_index = self._fair_feed_usage()[0]
+        should_eval = False
+        fair_inputs_changed = False
+        prices = (data or {}).get("prices") or {}
+        self.indexPrices = prices
+        price_val = self._get_from_feed(self.indexPrices)
+        last = self._last_idx_raw
+        if last is not None and last[1] is self.idx and last[0] == price_val:
+            return False, False
+        new_idx = Decimal(str(price_val)) if price_val is not None else None
+        if new_idx != self.idx:
+            self.idx = new_idx
+            self._idx_f = float(new_idx) if new_idx is not None else _NAN
+            fair_inputs_changed = True
+            if uses_index:
                 should_eval = True
-        elif ch == "indexPrices":  # インデックス価格
-            prices = (msg.get("data") or {}).get("prices") or {}
-            self.indexPrices = prices
-            price_val = self._get_from_feed(self.indexPrices)
-            new_idx = Decimal(str(price_val)) if price_val is not None else None
-            if new_idx != self.idx:
-                self.idx = new_idx
-                fair_inputs_changed = True
-                if uses_index:
-                    should_eval = True
-        elif ch == "oraclePrices":  # オラクル価格
-            prices = (msg.get("data") or {}).get("prices") or {}
-            self.oraclePrices = prices
-            price_val = self._get_from_feed(self.oraclePrices)
-            new_ora = Decimal(str(price_val)) if price_val is not None else None
-            if new_ora != self.ora:
-                self.ora = new_ora
-                fair_inputs_changed = True
-                if uses_oracle:
-                    should_eval = True
-        elif ch == "activeAssetCtx":
-            data = msg.get("data") or {}
-            coin = str(data.get("coin") or self.base_coin).upper()
-            if coin != str(self.base_coin).upper():
-                return
-            ctx = data.get("ctx") or {}
-            # impactPxs があれば bid/ask を保持（紙トレ判定用）
-            try:
-                imp = ctx.get("impactPxs")
-                if isinstance(imp, (list, tuple)) and len(imp) >= 2:
-                    bid_raw = imp[0]
-                    ask_raw = imp[1]
+        self._last_idx_raw = (price_val, self.idx)
+        return should_eval, fair_inputs_changed
+
+    def _h_oracle_prices(self, data: Any) -> tuple[bool, bool]:
+        """oraclePrices: オラクル価格を更新する。(should_eval, fair_inputs_changed) を返す。"""
+        uses_oracle = self._fair_feed_usage()[1]
+        should_eval = False
+        fair_inputs_changed = False
+        prices = (data or {}).get("prices") or {}
+        self.oraclePrices = prices
+        price_val = self._get_from_feed(self.oraclePrices)
+        last = self._last_ora_raw
+        if last is not None and last[1] is self.ora and last[0] == price_val:
+            return False, False
+        new_ora = Decimal(str(price_val)) if price_val is not None else None
+        if new_ora != self.ora:
+            self.ora = new_ora
+            self._ora_f = float(new_ora) if new_ora is not None else _NAN
+            fair_inputs_changed = True
+            if uses_oracle:
+                should_eval = True
+        self._last_ora_raw = (price_val, self.ora)
+        return should_eval, fair_inputs_changed
+
+    def _h_active_asset_ctx(self, data: Any) -> tuple[bool, bool]:
+        """activeAssetCtx: bid/ask と idx/ora を更新する。(should_eval, fair_inputs_changed) を返す。"""
+        uses_index, uses_oracle = self._fair_feed_usage()
+        should_eval = False
+        fair_inputs_changed = False
+        data = data or {}
+        coin = data.get("coin")
+        if coin and coin not in self._coin_set and str(coin).upper() not in self._coin_set:
+            return False, False
+        ctx = data.get("ctx") or {}
+        # impactPxs があれば bid/ask を保持（紙トレ判定用）
+        try:
+            imp = ctx.get("impactPxs")
+            if isinstance(imp, (list, tuple)) and len(imp) >= 2:
+                bid_raw = imp[0]
+                ask_raw = imp[1]
+                # 役割: 生の文字列が前回と同じで best_bid/best_ask もその解析結果のままなら Decimal を作り直さない
+                last_imp = self._last_imp_raw
+                if (
+                    last_imp is None
+                    or last_imp[0] != bid_raw
+                    or last_imp[1] != ask_raw
+                    or last_imp[2] is not self.best_bid
+                    or last_imp[3] is not self.best_ask
+                ):
                     self.best_bid = Decimal(str(bid_raw)) if bid_raw is not None else None
                     self.best_ask = Decimal(str(ask_raw)) if ask_raw is not None else None
+                    self._last_imp_raw = (bid_raw, ask_raw, self.best_bid, self.best_ask)
+        except Exception:
+            pass
+        idx_raw = ctx.get("midPx") or ctx.get("markPx")
+        ora_raw = ctx.get("oraclePx")
+        updated = False
+        # 役割: indexPrices/oraclePrices ハンドラと同じ (生の値, Decimal) キャッシュで、同じ値の再解析を省く
+        last = self._last_idx_raw
+        if idx_raw is not None and not (last is not None and last[1] is self.idx and last[0] == idx_raw):
+            try:
+                idx_val_dec = Decimal(str(idx_raw))
             except Exception:
-                pass
-            idx_raw = ctx.get("midPx") or ctx.get("markPx")
-            ora_raw = ctx.get("oraclePx")
-            updated = False
-            if idx_raw is not None:
-                try:
-                    idx_val_dec = Decimal(str(idx_raw))
-                except Exception:
-                    idx_val_dec = None
-                if idx_val_dec is not None:
-                    self.indexPrices[self.symbol] = str(idx_val_dec)
-                    self.indexPrices[self.base_coin] = str(idx_val_dec)
-                    if self.idx != idx_val_dec:
-                        self.idx = idx_val_dec
-                        fair_inputs_changed = True
-                        updated = True
-                        if uses_index:
-                            should_eval = True
-            if ora_raw is not None:
-                try:
-                    ora_val_dec = Decimal(str(ora_raw))
-                except Exception:
-                    ora_val_dec = None
-                if ora_val_dec is not None:
-                    self.oraclePrices[self.symbol] = str(ora_val_dec)
-                    self.oraclePrices[self.base_coin] = str(ora_val_dec)
-                    if self.ora != ora_val_dec:
-                        self.ora = ora_val_dec
-                        fair_inputs_changed = True
-                        updated = True
-                        if uses_oracle:
-                            should_eval = True
-            if not updated:
-                return
-        elif ch == "fundingInfo":
-            data = msg.get("data", {})
-            next_ts = data.get("nextFundingTime") if isinstance(data, dict) else None
-            if next_ts is None and isinstance(data, dict):
-                info = data.get(self.symbol)
-                if isinstance(info, dict):
-                    next_ts = info.get("nextFundingTime")
-            if next_ts is None and isinstance(data, dict):
-                base_info = data.get(self.base_coin)
-                if isinstance(base_info, dict):
-                    next_ts = base_info.get("nextFundingTime")
-            if next_ts is not None:
-                self.next_funding_ts = float(next_ts)
+                idx_val_dec = None
+            if idx_val_dec is not None:
+                idx_text = str(idx_val_dec)
+                self.indexPrices[self.symbol] = idx_text
+                self.indexPrices[self.base_coin] = idx_text
+                if self.idx != idx_val_dec:
+                    self.idx = idx_val_dec
+                    self._idx_f = float(idx_val_dec)
+                    fair_inputs_changed = True
+                    updated = True
+                    if uses_index:
+                        should_eval = True
+                self._last_idx_raw = (idx_raw, self.idx)
+        last = self._last_ora_raw
+        if ora_raw is not None and not (last is not None and last[1] is self.ora and last[0] == ora_raw):
+            try:
+                ora_val_dec = Decimal(str(ora_raw))
+            except Exception:
+                ora_val_dec = None
+            if ora_val_dec is not None:
+                ora_text = str(ora_val_dec)
+                self.oraclePrices[self.symbol] = ora_text
+                self.oraclePrices[self.base_coin] = ora_text
+                if self.ora != ora_val_dec:
+                    self.ora = ora_val_dec
+                    self._ora_f = float(ora_val_dec)
+                    fair_inputs_changed = True
+                    updated = True
+                    if uses_oracle:
+                        should_eval = True
+                self._last_ora_raw = (ora_raw, self.ora)
+        if not updated:
+            return False, False
+        return should_eval, fair_inputs_changed
+
+    def _h_funding_info(self, data: Any) -> tuple[bool, bool]:
+        """fundingInfo: 次回 funding 時刻を保持する。(should_eval, fair_inputs_changed) を返す。"""
+        next_ts = data.get("nextFundingTime") if isinstance(data, dict) else None
+        if next_ts is None and isinstance(data, dict):
+            info = data.get(self.symbol)
+            if isinstance(info, dict):
+                next_ts = info.get("nextFundingTime")
+        if next_ts is None and isinstance(data, dict):
+            base_info = data.get(self.base_coin)
+            if isinstance(base_info, dict):
+                next_ts = base_info.get("nextFundingTime")
+        if next_ts is not None:
+            self.next_funding_ts = float(next_ts)
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug("fundingInfo: next @ %s", self.next_funding_ts)
+        return False, False
+
+    @property
+    def order_usd(self) -> Decimal:
+        """1 回の発注額（USD, Decimal）。代入すると見積もり用の float 版 _order_usd_f も更新する。"""
+        return self._order_usd
+
+    @order_usd.setter
+    def order_usd(self, value: Decimal) -> None:
+        self._order_usd = value
+        self._order_usd_f = float(value or 0.0)
+
+    @property
+    def qty_tick(self) -> Decimal | None:
+        """数量の刻み（Decimal）。代入すると float 版 _qty_tick_f も更新する。"""
+        return self._qty_tick
+
+    @qty_tick.setter
+    def qty_tick(self, value: Decimal | None) -> None:
+        self._qty_tick = value
+        self._qty_tick_f = float(value or 0.0)
+
+    @property
+    def min_usd(self) -> Decimal:
+        """最小発注額（USD, Decimal）。代入すると float 版 _min_usd_f も更新する。"""
+        return self._min_usd
+
+    @min_usd.setter
+    def min_usd(self, value: Decimal) -> None:
+        self._min_usd = value
+        self._min_usd_f = float(value or 0.0)
+
+    @property
+    def mid(self) -> Decimal | None:
+        """板 mid（Decimal）。代入すると判定用の float 版 _mid_f も更新する。"""
+        return self._mid
+
+    @mid.setter
+    def mid(self, value: Decimal | None) -> None:
+        self._mid = value
+        self._mid_f = float(value) if value is not None else _NAN
+
+    @property
+    def fair(self) -> Decimal | None:
+        """公正価格（Decimal）。idx/ora 平均モードでは読まれたときに初めて計算する。"""
+        if self._fair_lazy:
+            self._fair_lazy = False
+            try:
+                self._fair = (self.idx + self.ora) * _HALF  # type: ignore[operator]
+            except Exception:
+                self._fair = None
+        return self._fair
 
-        if fair_inputs_changed:
-            self._update_fair()
-
-        if should_eval and self.mid is not None and self.fair is not None:
-            self.evaluate()
+    @fair.setter
+    def fair(self, value: Decimal | None) -> None:
+        self._fair = value
+        self._fair_lazy = False
+        self._fair_f = float(value) if value is not None else _NAN
 
     def _update_fair(self) -> None:
+        # 役割: on_message でパース済みの self.idx / self.ora（Decimal）を再利用し、
+        #       フィード辞書からの再取得と Decimal(str(...)) の再構築を省く
+        idx = self.idx
+        ora = self.ora
         if self.fair_feed not in {"indexPrices", "oraclePrices"}:
-            idx_val = self._get_from_feed(self.indexPrices)
-            ora_val = self._get_from_feed(self.oraclePrices)
-            if idx_val is not None and ora_val is not None:
-                try:
-                    self.fair = (
-                        Decimal(str(idx_val)) + Decimal(str(ora_val))
-                    ) / Decimal("2")
-                except Exception:
-                    self.fair = None
-            else:
+            # 平均は float で取り、Decimal の平均は fair が読まれたときだけ計算する
+            fair_f = 0.5 * (self._idx_f + self._ora_f)  # どちらか nan なら nan
+            if math.isnan(fair_f):
                 self.fair = None
+            else:
+                self._fair = None
+                self._fair_f = fair_f
+                self._fair_lazy = True
             return
 
-        primary_src_name = (
-            "oraclePrices" if self.fair_feed == "oraclePrices" else "indexPrices"
-        )
-        primary_src = (
-            self.oraclePrices if self.fair_feed == "oraclePrices" else self.indexPrices
-        )
-        fair_val = self._get_from_feed(primary_src)
-        if fair_val is None:
-            alt_src = (
-                self.indexPrices if primary_src_name == "oraclePrices" else self.oraclePrices
-            )
-            fair_val = self._get_from_feed(alt_src)
+        if self.fair_feed == "oraclePrices":
+            fair_val = ora if ora is not None else idx
+        else:
+            fair_val = idx if idx is not None else ora
 
         mid = getattr(self, "mid", None)
         # 役割: mid/fair のデバッグと欠損スキップ（prices:/skip:/edge(abs): を必ず出す）
         _logger = getattr(self, 'log', None) or getattr(self, 'logger', None)
+        if _logger is not None and not _logger.isEnabledFor(logging.DEBUG):
+            _logger = None  # DEBUG 無効時は f-string の整形自体を行わない
         if _logger:
             _logger.debug(f"prices: mid={mid}, fair={fair_val}, mode={getattr(self,'mode',None)}, threshold={getattr(self,'threshold',None)}")
         if mid is None or fair_val is None:
@@ -1110,20 +2072,15 @@ class PFPLStrategy:
                 _logger.debug(f"skip: missing price mid={mid} fair={fair_val}")
             self.fair = None
             return
-        try:
-            mid_decimal: Decimal = Decimal(str(mid))
-            fair_decimal: Decimal = Decimal(str(fair_val))
-            diff = mid_decimal - fair_decimal
-        except Exception:
-            if _logger:
-                _logger.debug(f"skip: missing price mid={mid} fair={fair_val}")
-            self.fair = None
-            return
         if _logger:
-            _logger.debug(f"edge(abs): {abs(diff)} (edge={diff})")
+            try:
+                diff = _as_dec(mid) - fair_val
+                _logger.debug(f"edge(abs): {abs(diff)} (edge={diff})")
+            except Exception:
+                pass
         # 役割: 後続処理でも参照できるよう、公正価格をプロパティへ反映
 
-        self.fair = fair_decimal
+        self.fair = fair_val
 
     # ---------------------------------------------------------------- evaluate
 
@@ -1134,185 +2091,192 @@ class PFPLStrategy:
         import logging
 
         _logger = getattr(self, "logger", logging.getLogger(__name__))
+        # 役割: 時刻取得は1tickにつき1回。funding 判定は壁時計、クールダウン等の間隔はモノトニック時計
+        #       （on_message から直接呼ばれた場合はそのフレームで読んだ時刻を使う）
+        clock = self._tick_clock
+        if clock is None:
+            now_wall = time.time()
+            now = time.monotonic()
+        else:
+            now_wall, now = clock
+        self._now = now
         # Hot-reload config just before decision logic to reflect changes fast
-        self._maybe_reload_runtime_config()
-        try:
-
-            _config = getattr(self, "config", {}) or {}
+        self._maybe_reload_runtime_config(now)
+        # 役割: DEBUG 無効時はスナップショット用の変換・整形を丸ごと省く
+        if _logger.isEnabledFor(logging.DEBUG):
+            try:
 
-            def _fallback(key: str, attr_name: str | None = None) -> Any:
-                if attr_name and hasattr(self, attr_name):
-                    return getattr(self, attr_name)
-                return _config.get(key)
+                _config = getattr(self, "config", {}) or {}
 
-            def _to_float(val: Any) -> float:
-                if val is None:
-                    return 0.0
-                try:
-                    return float(val)
-                except Exception:
-                    return 0.0
+                def _fallback(key: str, attr_name: str | None = None) -> Any:
+                    if attr_name and hasattr(self, attr_name):
+                        return getattr(self, attr_name)
+                    return _config.get(key)
 
-            def _fmt_optional(val: Any) -> Any:
-                if val is None:
-                    return None
-                try:
-                    return f"{float(val):.6f}"
-                except Exception:
+                def _to_float(val: Any) -> float:
+                    if val is None:
+                        return 0.0
                     try:
-                        return f"{val:.6f}"  # type: ignore[str-format]
+                        return float(val)
                     except Exception:
-                        return repr(val)
+                        return 0.0
 
-            _thr = _fallback("threshold", "threshold")
-            _pct = _fallback("threshold_pct", "threshold_pct")
-            _spr = _fallback("spread_threshold", "spread_threshold")
-
-            _mid = locals().get("mid", locals().get("mid_px", getattr(self, "mid", None)))
-            _fair = locals().get("fair", locals().get("fair_px", getattr(self, "fair", None)))
-            if _mid is None or _fair is None:
-                _diff = None
-            else:
-                try:
-                    _diff = Decimal(str(_mid)) - Decimal(str(_fair))
-                except Exception:
+                def _fmt_optional(val: Any) -> Any:
+                    if val is None:
+                        return None
+                    try:
+                        return f"{float(val):.6f}"
+                    except Exception:
+                        try:
+                            return f"{val:.6f}"  # type: ignore[str-format]
+                        except Exception:
+                            return repr(val)
+
+                _thr = _fallback("threshold", "threshold")
+                _pct = _fallback("threshold_pct", "threshold_pct")
+                _spr = _fallback("spread_threshold", "spread_threshold")
+
+                _mid = locals().get("mid", locals().get("mid_px", getattr(self, "mid", None)))
+                _fair = locals().get("fair", locals().get("fair_px", getattr(self, "fair", None)))
+                if _mid is None or _fair is None:
                     _diff = None
-            _logger.debug(
-                "DECISION_SNAPSHOT mid=%s fair=%s diff=%s | thr=%.6f spr=%.6f pct=%.6f",
+                else:
+                    try:
+                        _diff = Decimal(str(_mid)) - Decimal(str(_fair))
+                    except Exception:
+                        _diff = None
+                _logger.debug(
+                    "DECISION_SNAPSHOT mid=%s fair=%s diff=%s | thr=%.6f spr=%.6f pct=%.6f",
 
-                _fmt_optional(_mid),
-                _fmt_optional(_fair),
-                _fmt_optional(_diff),
-                _to_float(_thr),
-                _to_float(_spr),
-                _to_float(_pct),
+                    _fmt_optional(_mid),
+                    _fmt_optional(_fair),
+                    _fmt_optional(_diff),
+                    _to_float(_thr),
+                    _to_float(_spr),
+                    _to_float(_pct),
 
-            )
-        except Exception as _e:
-            _logger.debug("DECISION_SNAPSHOT_UNAVAILABLE reason=%r", _e)
+                )
+            except Exception as _e:
+                _logger.debug("DECISION_SNAPSHOT_UNAVAILABLE reason=%r", _e)
 
         _maybe_enable_test_propagation()
-        if not self._check_funding_window():
-            return
-        now = time.time()
-        # 0) --- Funding 直前クローズ判定 -----------------------------------
-        if self._should_close_before_funding(now):
-            asyncio.create_task(self._close_all_positions())
+        # 0) --- Funding 窓 / Funding 直前クローズ / 日次上限 ---------------
+        guard = self._tick_guard(now_wall)
+        if guard != _GUARD_OK:
+            if guard == _GUARD_CLOSE:
+                self._spawn(self._close_all_positions())
             return  # 今回の evaluate はここで終了
-
-        # --- リスクガード ------------------
-        if not self._check_limits():
-            return
         # ① クールダウン判定
         if now - self.last_ts < self.cooldown:
             return
 
-        # ② 必要データ取得
-        mid = self.mid
-        fair = self.fair
-        if mid is None or fair is None:
+        # ② 必要データ取得（判定は float 版で行い、Decimal の mid は発注サイズ計算でだけ使う）
+        mid_float = self._mid_f
+        fair_float = self._fair_f
+        if math.isnan(mid_float) or math.isnan(fair_float):
             return
 
         # ③ 発注可否（レート/最小発注額など）
-        now_ts = time.time()
+        now_ts = now
         can_fire = self._can_fire(now_ts)
 
         # ここで notion（USD）を見積もって最小発注額を満たすか確認する
-        order_usd = float(getattr(self, "order_usd", 0.0) or 0.0)
-        qty_tick = float(
-            getattr(self, "qtyTick", 0.0)
-            or getattr(self, "qty_tick", 0.0)
-            or 0.0
-        )
-        mid_float = float(mid) if mid else 0.0
+        order_usd = self._order_usd_f
+        qty_tick = self._qty_tick_f
         qty_raw = order_usd / mid_float if mid_float else 0.0
-        qty = (int(qty_raw / qty_tick) * qty_tick) if qty_tick > 0 else qty_raw
+        if qty_tick > 0:
+            # 役割: 実際の発注サイズと同じ切り捨て（_quantize_size_fast）で見積もり、刻みの境目で判定をずらさない
+            qty_q = self._quantize_size_fast(qty_raw)
+            qty = float(qty_q) if qty_q is not None else 0.0
+        else:
+            qty = qty_raw
         notional = float(qty) * mid_float if mid_float else 0.0
         min_needed = self._effective_min_usd()
 
         _logger = getattr(self, "log", None) or getattr(self, "logger", None)
+        debug_on = bool(_logger and _logger.isEnabledFor(logging.DEBUG))
         notional_ok = notional >= min_needed
         if not notional_ok:
-            if _logger:
+            if debug_on:
                 _logger.debug(
                     f"skip: notional {notional:.2f} < min_usd {min_needed:.2f} (qty={qty})"
                 )
 
-        diff = fair - mid  # USD 差（符号付き）
-        diff_pct = diff / mid * Decimal("100")  # 乖離率 %（符号付き）
+        if getattr(self.config, "version", None) != self._eval_cfg_version:
+            self._refresh_eval_params()
+        pct_mode = self._pct_mode
+        # 役割: 発注できない tick（レート上限/最小発注額未満）は閾値・スプレッド計算を省いて抜ける
+        #       （DEBUG 時は decision 行を出すので続行）
+        if (not can_fire or not notional_ok) and not debug_on:
+            if pct_mode == "percentile" and 0 <= self._pct_quantile <= 1:
+                # percentile の履歴は毎 tick 積むが、分位点は発注できる tick まで引かない
+                self._push_signal_hist(
+                    abs(fair_float - mid_float),
+                    now,
+                    self._pct_window,
+                    self._pct_max_samples,
+                    self._pct_sample_sec,
+                )
+            self._sync_paper_pos(mid_float)
+            return
+
+        diff = fair_float - mid_float  # USD 差（符号付き）
+        diff_pct = diff / mid_float * 100.0 if mid_float else 0.0  # 乖離率 %（符号付き）
         abs_diff = abs(diff)
         pct_diff = abs(diff_pct)
 
         # ④ 閾値判定
-        th_abs = Decimal(str(self.config.get("threshold", "1.0")))  # USD
-        pct_mode = str(self.config.get("threshold_pct_mode", "absolute")).lower()
-        pct_quantile = float(
-            self.config.get(
-                "threshold_pct_quantile",
-                self.config.get("threshold_pct", 0.0),
-            )
-        )
-        pct_window = float(self.config.get("threshold_pct_window_sec", 900.0))
-        pct_min_samples = int(self.config.get("threshold_pct_min_samples", 50))
-        th_pct = Decimal(str(self.config.get("threshold_pct", "0.05")))  # %
-        spread_thr_usd = float(self.config.get("spread_threshold", 0.0))
-        spread_thr_bps = float(self.config.get("spread_threshold_bps", 0.0))
+        th_abs = self._th_abs  # USD
+        pct_quantile = self._pct_quantile
+        pct_window = self._pct_window
+        pct_min_samples = self._pct_min_samples
+        th_abs_f = self._th_abs_f
+        th_pct_f = self._th_pct_f
+        spread_thr_usd = self._spread_thr_usd
+        spread_thr_bps = self._spread_thr_bps
         spread_thr_px = spread_thr_usd
-        if spread_thr_px <= 0 and spread_thr_bps > 0 and mid:
-            spread_thr_px = float(mid) * (spread_thr_bps / 10000)
-        bid = getattr(self, "best_bid", None)
-        ask = getattr(self, "best_ask", None)
-        spread_px = float(ask - bid) if (bid is not None and ask is not None) else None
-        spread_ok = True if spread_thr_px <= 0 or spread_px is None else spread_px <= spread_thr_px
+        if spread_thr_px <= 0 and spread_thr_bps > 0 and mid_float:
+            spread_thr_px = mid_float * (spread_thr_bps / 10000)
+        # 役割: spread フィルタが有効なときか DEBUG（判定ログに spread を出す）のときだけ bid/ask の差を取る
+        #       （どちらでもなければ Decimal 減算を省く）
+        spread_px: float | None = None
+        spread_ok = True
+        if spread_thr_px > 0 or debug_on:
+            bid = getattr(self, "best_bid", None)
+            ask = getattr(self, "best_ask", None)
+            if bid is not None and ask is not None:
+                spread_px = float(ask - bid)
+                if spread_thr_px > 0:
+                    spread_ok = spread_px <= spread_thr_px
 
         pct_threshold_value: float | None = None
         if pct_mode == "percentile":
             pct_threshold_value = self._update_signal_hist(
-                abs_diff=float(abs_diff),
+                abs_diff=abs_diff,
                 now_ts=now,
                 window_sec=pct_window,
                 quantile=pct_quantile,
                 min_samples=pct_min_samples,
+                max_samples=self._pct_max_samples,
+                sample_sec=self._pct_sample_sec,
             )
-            pct_ok = True if pct_threshold_value is None else float(abs_diff) >= pct_threshold_value
+            pct_ok = True if pct_threshold_value is None else abs_diff >= pct_threshold_value
         else:
-            pct_threshold_value = float(th_pct)
-            pct_ok = pct_diff >= th_pct
-
-        abs_ok = abs_diff >= th_abs
+            pct_threshold_value = th_pct_f
+            pct_ok = pct_diff >= th_pct_f
 
-        # spreadフィルタに掛かったら早期リターン
-        if not spread_ok:
-            self._debug_evaluate_signal(
-                mid_px=float(mid),
-                fair_px=float(fair),
-                order_usd=float(self.order_usd),
-                pos_usd=float(self.pos_usd),
-                last_order_ts=self.last_ts or None,
-                funding_blocked=self._funding_pause,
-                threshold=th_abs,
-                threshold_pct=pct_threshold_value,
-                spread_threshold=Decimal(str(spread_thr_px)),
-                pct_mode=pct_mode,
-                pct_threshold_value=pct_threshold_value,
-                spread_px=spread_px,
-                spread_threshold_px=spread_thr_px,
-                abs_ok=abs_ok,
-                pct_ok=pct_ok,
-                spread_ok=spread_ok,
-            )
-            return
+        abs_ok = abs_diff >= th_abs_f
 
         self._debug_evaluate_signal(
-            mid_px=float(mid),
-            fair_px=float(fair),
-            order_usd=float(self.order_usd),
+            mid_px=mid_float,
+            fair_px=fair_float,
+            order_usd=order_usd,
             pos_usd=float(self.pos_usd),
             last_order_ts=self.last_ts or None,
             funding_blocked=self._funding_pause,
             threshold=th_abs,
             threshold_pct=pct_threshold_value,
-            spread_threshold=Decimal(str(spread_thr_px)),
+            spread_threshold=spread_thr_px,
             pct_mode=pct_mode,
             pct_threshold_value=pct_threshold_value,
             spread_px=spread_px,
@@ -1321,19 +2285,22 @@ class PFPLStrategy:
             pct_ok=pct_ok,
             spread_ok=spread_ok,
         )
+        # spreadフィルタに掛かったら早期リターン
+        if not spread_ok:
+            return
         if not can_fire:
             return
         if not notional_ok:
             return
-        mode = self.config.get("mode", "both")  # both / either
+        mode_id = self._mode_id  # both / either
 
-        if mode == "abs":
+        if mode_id == _MODE_ABS:
             if not abs_ok:
                 return
-        elif mode == "pct":
+        elif mode_id == _MODE_PCT:
             if not pct_ok:
                 return
-        elif mode == "either":
+        elif mode_id == _MODE_EITHER:
             if not (abs_ok or pct_ok):
                 return
         else:  # default = both
@@ -1341,7 +2308,7 @@ class PFPLStrategy:
                 return
 
         # ⑤ 発注サイド決定
-        side = "BUY" if fair > mid else "SELL"
+        side = "BUY" if diff > 0.0 else "SELL"
 
         # ⑥ 連続同方向防止
         if side == self.last_side and now - self.last_ts < self.cooldown:
@@ -1349,28 +2316,27 @@ class PFPLStrategy:
 
         # ⑦ 発注サイズ計算
         is_buy = side == "BUY"
-        mid_dec = mid
-        if mid_dec <= 0:
+        if mid_float <= 0:
             return
+        mid_dec = self.mid
 
-        # 発注に使う想定 limit_px（place_order と同じヘルパーで近似）
+        # 発注に使う想定 limit_px（place_order と同じ補正で近似。float のまま扱う）
+        # 役割: _price_with_offset と同じ事前計算済み係数を直接掛け、tick ごとのメソッド呼び出しを省く
         limit_px_est = self._taker_limit_price(
             side,
-            self._price_with_offset(float(mid_dec), side),
+            mid_float * (self._buy_factor if is_buy else self._sell_factor),
             mid_dec,
         )
-        limit_px_dec = (
-            Decimal(str(limit_px_est))
+        limit_px_f = (
+            float(limit_px_est)
             if limit_px_est is not None and limit_px_est > 0
-            else mid_dec
+            else mid_float
         )
-        if limit_px_dec <= 0:
-            limit_px_dec = mid_dec
 
-        raw_size = (self.order_usd / limit_px_dec) if limit_px_dec > 0 else Decimal("0")
-        try:
-            size = raw_size.quantize(self.qty_tick, rounding=ROUND_DOWN)
-        except InvalidOperation:
+        # 役割: Decimal.quantize を避け、qty_tick の桁数に合わせた整数目盛りで切り捨てる
+        raw_size = order_usd / limit_px_f
+        size = self._quantize_size_fast(raw_size)
+        if size is None:
             logger.error(
                 "quantize failed for raw size %s with qty_tick %s",
                 raw_size,
@@ -1385,280 +2351,17 @@ class PFPLStrategy:
         pos_limit_max_abs_pos: Decimal | None = None
         pos_limit_proj_abs_pos: Decimal | None = None
         if size <= 0:
-            logger.debug(
-                "size %.6f quantized to zero with tick %s → skip",
-                raw_size,
-                self.qty_tick,
-            )
-            return
-        if (size * mid_dec) < self.min_usd:
-            # 役割: min_usd skip の原因特定用に、丸め前/丸め後のサイズと USD を同時に記録する
-            order_usd = self.order_usd
-            limit_px = limit_px_dec
-            raw_size_dbg = (
-                (order_usd / limit_px) if (limit_px is not None and limit_px > 0) else None
-            )
-            raw_usd_dbg = (
-                (raw_size_dbg * mid_dec) if (raw_size_dbg is not None and mid_dec is not None) else None
-            )
-            rounded_usd = size * mid_dec if mid_dec is not None else None
-            mid = mid_dec
-            raw_usd = raw_usd_dbg
-            usd = rounded_usd
-            min_usd = self.min_usd
-            logger.debug(
-                "SIZING_SNAPSHOT build_id=%s loc=%s:%s order_usd=%s limit_px=%s mid=%s raw_size=%s raw_usd=%s rounded_size=%s rounded_usd=%s min_usd=%s",
-                PFPL_STRATEGY_BUILD_ID,
-                __file__,
-                _safe_lineno(),
-                order_usd,
-                limit_px,
-                mid,
-                raw_size,
-                raw_usd,
-                size,
-                usd,
-                min_usd,
-            )
-            # 役割: raw_usd(=本来10USD)が、どの上限/係数で rounded_usd(=2.08USD)まで落ちたかを「候補変数ごと」に特定する
-            cap_ratio = (
-                (usd / raw_usd)
-                if (raw_usd is not None and raw_usd > 0 and usd is not None)
-                else None
-            )
-            # 役割: cap_ratio（=usd/raw_usd）で潰された結果「実効USD(target_usd)」が、どの変数（edge/d_abs等）由来かを同じログ行で特定する
-            _target_usd = float(raw_usd) * float(cap_ratio) if (cap_ratio is not None and raw_usd is not None) else None
-            _usd_ratio = (
-                (float(usd) / float(raw_usd))
-                if (raw_usd is not None and raw_usd > 0 and usd is not None)
-                else None
-            )
-            _size_ratio = (float(size) / float(raw_size)) if (raw_size is not None and raw_size > 0) else None
-
-            _top = ""
-            if _target_usd is not None:
-                _near = []
-                for _k, _v in locals().items():
-                    if _k.startswith("_"):
-                        continue
-                    if _k in ("usd", "raw_usd", "order_usd", "cap_ratio", "size", "raw_size", "limit_px", "mid", "min_usd"):
-                        continue
-                    if isinstance(_v, bool):
-                        continue
-                    try:
-                        _vf = float(_v)
-                    except Exception:
-                        continue
-                    if abs(_vf) > 1.0e6:
-                        continue
-                    _near.append((abs(_vf - _target_usd), _k, _vf))
-
-                _near.sort(key=lambda x: x[0])
-                _top = ", ".join([f"{k}={v} (Δ={d:.6g})" for d, k, v in _near[:10]])
-
-            logger.debug(
-                "SIZING_LIMITERS build_id=%s loc=%s:%s cap_ratio=%s usd_ratio=%s size_ratio=%s raw_usd=%s usd=%s target_usd=%s target_top=%s qty_tick=%s max_order_usd=%s max_trade_usd=%s max_order_qty=%s max_trade_qty=%s size_scale=%s risk_scale=%s remaining_usd=%s remaining_qty=%s",
-                PFPL_STRATEGY_BUILD_ID,
-                __file__,
-                _safe_lineno(),
-                cap_ratio,
-                _usd_ratio,
-                _size_ratio,
-                raw_usd,
-                usd,
-                _target_usd,
-                _top,
-                locals().get("qty_tick") or locals().get("qty_step") or locals().get("sz_tick"),
-                locals().get("max_order_usd") or locals().get("order_cap_usd") or locals().get("cap_usd"),
-                locals().get("max_trade_usd") or locals().get("trade_cap_usd"),
-                locals().get("max_order_qty") or locals().get("order_cap_qty") or locals().get("cap_qty"),
-                locals().get("max_trade_qty") or locals().get("trade_cap_qty"),
-                locals().get("size_scale") or locals().get("scale"),
-                locals().get("risk_scale"),
-                locals().get("remaining_usd") or locals().get("pos_remaining_usd"),
-                locals().get("remaining_qty") or locals().get("pos_remaining_qty"),
-            )
-            # 役割: cap_ratio で潰された「実効USD(target_usd)」が、どのローカル変数（edge/diff等）と一致するかを特定する
-            _target_usd = (
-                float(raw_usd) * float(cap_ratio)
-                if (cap_ratio is not None and raw_usd is not None)
-                else None
-            )
-            if _target_usd is not None:
-                _cands = []
-                for _k, _v in locals().items():
-                    if _k.startswith("_"):
-                        continue
-                    if _k in (
-                        "usd",
-                        "raw_usd",
-                        "order_usd",
-                        "cap_ratio",
-                        "size",
-                        "raw_size",
-                        "limit_px",
-                        "mid",
-                    ):
-                        continue
-                    if isinstance(_v, bool):
-                        continue
-                    try:
-                        _vf = float(_v)
-                    except Exception:
-                        continue
-                    # 近さ判定（target_usd の ±5% または ±0.05USD）
-                    if abs(_vf - _target_usd) <= max(0.05, abs(_target_usd) * 0.05):
-                        _cands.append((abs(_vf - _target_usd), _k, _vf))
-
-                _cands.sort(key=lambda x: x[0])
-                _top = ", ".join([f"{k}={v} (Δ={d:.6g})" for d, k, v in _cands[:10]])
-
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
-                    "SIZING_TARGET_MATCH build_id=%s loc=%s:%s target_usd=%s top=%s",
-                    PFPL_STRATEGY_BUILD_ID,
-                    __file__,
-                    _safe_lineno(),
-                    _target_usd,
-                    _top,
-                )
-            # 役割: cap_ratio(=usd/raw_usd) と一致/近い「変数そのもの」や「比(A/B)」を自動で炙り出してログに出す
-            cap_ratio_f = float(cap_ratio) if cap_ratio is not None else None
-            if cap_ratio_f is not None:
-                _skip_names = {
-                    "cap_ratio", "cap_ratio_f",
-                    "raw_usd", "raw_size",
-                    "order_usd", "usd", "size",
-                    "limit_px", "mid", "min_usd",
-                }
-
-                _vals = []  # (name, float_value)
-
-                def _add_numeric(_name, _v):
-                    # 役割: 数値として扱えるものだけ集める（bool/文字列/巨大値は除外）
-                    if _name in _skip_names:
-                        return
-                    if isinstance(_v, bool):
-                        return
-                    try:
-                        _vf = float(_v)
-                    except Exception:
-                        return
-                    if not (abs(_vf) > 0.0 and abs(_vf) <= 1.0e9):
-                        return
-                    _vals.append((_name, _vf))
-
-                # locals() から拾う
-                for _k, _v in locals().items():
-                    _add_numeric(f"local.{_k}", _v)
-
-                # self / config から拾う（属性に倍率が隠れているケースが多い）
-                _self = locals().get("self")
-                if _self is not None:
-                    for _k, _v in getattr(_self, "__dict__", {}).items():
-                        _add_numeric(f"self.{_k}", _v)
-
-                    for _attr in ("cfg", "config", "params", "settings"):
-                        _obj = getattr(_self, _attr, None)
-                        if _obj is None:
-                            continue
-                        if isinstance(_obj, dict):
-                            for _k, _v in _obj.items():
-                                _add_numeric(f"self.{_attr}.{_k}", _v)
-                        else:
-                            for _k, _v in getattr(_obj, "__dict__", {}).items():
-                                _add_numeric(f"self.{_attr}.{_k}", _v)
-
-                # 1) 「変数そのもの」が cap_ratio に近いか（直接マッチ）
-                _direct = []
-                for _name, _vf in _vals:
-                    if 0.0 < abs(_vf) <= 1.0:
-                        _direct.append((abs(_vf - cap_ratio_f), _name, _vf))
-                _direct.sort(key=lambda x: x[0])
-                _top_direct = ", ".join([f"{n}={v} (Δ={d:.6g})" for d, n, v in _direct[:8]])
-                logger.debug("SIZING_MATCH cap_ratio=%s top=%s", cap_ratio, _top_direct)
-
-                # 2) 「比(A/B)」が cap_ratio に近いか（間接マッチ） → これで正体を特定する
-                #    ※ cap_ratio が (edge_abs / edge_cap) などで作られている場合、ここで引っかかる
-                _ratio_hits = []
-                _vals_limited = _vals[:80]  # 役割: 計算量を抑える（多すぎると重い）
-                for i in range(len(_vals_limited)):
-                    a_name, a_val = _vals_limited[i]
-                    for j in range(len(_vals_limited)):
-                        if i == j:
-                            continue
-                        b_name, b_val = _vals_limited[j]
-                        if b_val == 0:
-                            continue
-                        r = abs(a_val / b_val)
-                        d = abs(r - cap_ratio_f)
-                        if d <= 0.02:
-                            _ratio_hits.append((d, a_name, a_val, b_name, b_val, r))
-
-                _ratio_hits.sort(key=lambda x: x[0])
-                _top_ratio = ", ".join(
-                    [f"{an}/{bn}={rv:.6g} (Δ={d:.6g})" for d, an, av, bn, bv, rv in _ratio_hits[:8]]
-                )
-                logger.debug("SIZING_RATIO_MATCH cap_ratio=%s top=%s", cap_ratio, _top_ratio)
-            # 役割: raw_usd(=本来の10USD)は min_usd を満たすのに、pos_limit 等で usd が極小(dust)に縮んで min_usd を割るケースを
-            #       「min_usd が原因」ではなく「残枠(dust)が原因」として扱い、ログの誤誘導を防ぐ
-            if (usd is not None) and (min_usd is not None) and (usd < min_usd):
-                _raw_usd_f = float(raw_usd) if raw_usd is not None else None
-                _usd_f = float(usd) if usd is not None else None
-                _cap_ratio = (
-                    (_usd_f / _raw_usd_f)
-                    if (_raw_usd_f is not None and _raw_usd_f > 0 and _usd_f is not None)
-                    else None
-                )
-
-                # pos_limit 文脈の値が取れるなら「残枠(dust)」を推定して出す（取れなければ None のままでもOK）
-                _poslimit_max_abs_pos = locals().get("pos_limit_max_abs_pos") or locals().get("max_abs_pos")
-                _poslimit_proj_abs_pos = locals().get("pos_limit_proj_abs_pos") or locals().get("proj_abs_pos")
-                _paper_pos = locals().get("paper_pos") or locals().get("pos") or locals().get("paper_position")
-
-                _cur_abs_pos = abs(float(_paper_pos)) if _paper_pos is not None else None
-                _max_abs_pos = float(_poslimit_max_abs_pos) if _poslimit_max_abs_pos is not None else None
-                _proj_abs_pos = float(_poslimit_proj_abs_pos) if _poslimit_proj_abs_pos is not None else None
-
-                _remaining_qty = (
-                    (_max_abs_pos - _cur_abs_pos)
-                    if (_max_abs_pos is not None and _cur_abs_pos is not None)
-                    else None
-                )
-                _remaining_usd = (
-                    (float(mid) * _remaining_qty) if (_remaining_qty is not None and mid is not None) else None
-                )
-
-                _increasing = (
-                    _proj_abs_pos is not None
-                    and _cur_abs_pos is not None
-                    and _proj_abs_pos > _cur_abs_pos + 1e-12
-                )
-                _looks_like_poslimit_dust = (
-                    (_raw_usd_f is not None and _raw_usd_f >= float(min_usd))
-                    and (_cap_ratio is not None and _cap_ratio < 0.999)
-                    and (_increasing or _proj_abs_pos is None)
-                    and (_max_abs_pos is not None)
+                    "size %.6f quantized to zero with tick %s → skip",
+                    raw_size,
+                    self.qty_tick,
                 )
-
-                # 役割: pos_limit 残枠(dust)が原因で min_usd を割ったケースは、decision と同じ書式で「pos_ok=False」として記録し、集計も一貫させる
-                if _looks_like_poslimit_dust:
-                    logger.debug(
-                        "pos_ok=False (pos_limit dust) stage=order raw_usd=%s usd=%s cap_ratio=%s remaining_usd=%s remaining_qty=%s cur_abs_pos=%s max_abs_pos=%s proj_abs_pos=%s min_usd=%s",
-                        raw_usd,
-                        usd,
-                        _cap_ratio,
-                        _remaining_usd,
-                        _remaining_qty,
-                        _cur_abs_pos,
-                        _max_abs_pos,
-                        _proj_abs_pos,
-                        min_usd,
-                    )
-                    return None
-
-                # それ以外は通常の min_usd スキップ（本当に小さい注文）
-                logger.debug(f"size {size:.4f} USD {usd:.2f} < min_usd {min_usd:.2f} → skip")
-                return None
+            return
+        if (size * mid_dec) < self.min_usd:
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_min_usd_skip(locals())
+            return
 
         # ⑧ 建玉超過チェック（方向込み + 自動切り詰め）
         # 役割:
@@ -1708,282 +2411,319 @@ class PFPLStrategy:
 
         # 切り詰め後に min_usd を割るならスキップ（サイズが小さすぎる）
         if (size * mid_dec) < self.min_usd:
-            # 役割: min_usd skip の原因特定用に、丸め前/丸め後のサイズと USD を同時に記録する
-            order_usd = self.order_usd
-            limit_px = limit_px_dec
-            raw_size_dbg = (
-                (order_usd / limit_px) if (limit_px is not None and limit_px > 0) else None
-            )
-            raw_usd_dbg = (
-                (raw_size_dbg * mid_dec) if (raw_size_dbg is not None and mid_dec is not None) else None
-            )
-            rounded_usd = size * mid_dec if mid_dec is not None else None
-            mid = mid_dec
-            raw_usd = raw_usd_dbg
-            usd = rounded_usd
-            min_usd = self.min_usd
-            logger.debug(
-                "SIZING_SNAPSHOT build_id=%s loc=%s:%s order_usd=%s limit_px=%s mid=%s raw_size=%s raw_usd=%s rounded_size=%s rounded_usd=%s min_usd=%s",
-                PFPL_STRATEGY_BUILD_ID,
-                __file__,
-                _safe_lineno(),
-                order_usd,
-                limit_px,
-                mid,
-                raw_size,
-                raw_usd,
-                size,
-                usd,
-                min_usd,
-            )
-            # 役割: raw_usd(=本来10USD)が、どの上限/係数で rounded_usd(=2.08USD)まで落ちたかを「候補変数ごと」に特定する
-            cap_ratio = (
-                (usd / raw_usd)
-                if (raw_usd is not None and raw_usd > 0 and usd is not None)
-                else None
-            )
-            # 役割: cap_ratio（=usd/raw_usd）で潰された結果「実効USD(target_usd)」が、どの変数（edge/d_abs等）由来かを同じログ行で特定する
-            _target_usd = float(raw_usd) * float(cap_ratio) if (cap_ratio is not None and raw_usd is not None) else None
-            _usd_ratio = (
-                (float(usd) / float(raw_usd))
-                if (raw_usd is not None and raw_usd > 0 and usd is not None)
-                else None
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_min_usd_skip(locals())
+            return
+
+        # 重要: 以降の注文サイズは size を使う（order_usd/limit_px を再計算しない）
+
+        # ⑨ 発注
+        # 役割: ここまで来たら「発注してOK」。カウンタだけ進め、既存の発注ロジックへ続行
+        self._last_order_ts = now_ts
+        self._order_count_in_window = (
+            getattr(self, "_order_count_in_window", 0) or 0
+        ) + 1
+        order_q = self._order_q
+        if order_q is None:
+            # イベントループ外で生成された場合（テスト等）は従来どおり Task で発注
+            asyncio.create_task(self.place_order(side, float(size)))
+            return
+        try:
+            order_q.put_nowait((side, float(size)))
+        except asyncio.QueueFull:
+            logger.warning(
+                "order queue full (%d) → drop %s %.6f", order_q.maxsize, side, float(size)
             )
-            _size_ratio = (float(size) / float(raw_size)) if (raw_size is not None and raw_size > 0) else None
 
-            _top = ""
-            if _target_usd is not None:
-                _near = []
-                for _k, _v in locals().items():
-                    if _k.startswith("_"):
-                        continue
-                    if _k in ("usd", "raw_usd", "order_usd", "cap_ratio", "size", "raw_size", "limit_px", "mid", "min_usd"):
-                        continue
-                    if isinstance(_v, bool):
-                        continue
-                    try:
-                        _vf = float(_v)
-                    except Exception:
-                        continue
-                    if abs(_vf) > 1.0e6:
-                        continue
-                    _near.append((abs(_vf - _target_usd), _k, _vf))
+    # 役割: min_usd 未満で見送る際の診断ログ（evaluate の2箇所から locals() を渡して呼ぶ）
+    def _log_min_usd_skip(self, scope: dict[str, Any]) -> None:
+        # 役割: DEBUG 時だけ呼ぶ（scope は evaluate の locals()。呼び出し側で判定し、無効時は辞書を作らない）
+        size = scope["size"]
+        raw_size = scope["raw_size"]
+        mid_dec = scope["mid_dec"]
+        limit_px_dec = Decimal(str(scope["limit_px_f"]))
+        # 役割: min_usd skip の原因特定用に、丸め前/丸め後のサイズと USD を同時に記録する
+        order_usd = self.order_usd
+        limit_px = limit_px_dec
+        raw_size_dbg = (
+            (order_usd / limit_px) if (limit_px is not None and limit_px > 0) else None
+        )
+        raw_usd_dbg = (
+            (raw_size_dbg * mid_dec) if (raw_size_dbg is not None and mid_dec is not None) else None
+        )
+        rounded_usd = size * mid_dec if mid_dec is not None else None
+        mid = mid_dec
+        raw_usd = raw_usd_dbg
+        usd = rounded_usd
+        min_usd = self.min_usd
+        _ns: dict[str, Any] = {
+            **scope,
+            "order_usd": order_usd,
+            "limit_px": limit_px,
+            "raw_size_dbg": raw_size_dbg,
+            "raw_usd_dbg": raw_usd_dbg,
+            "rounded_usd": rounded_usd,
+            "mid": mid,
+            "raw_usd": raw_usd,
+            "usd": usd,
+            "min_usd": min_usd,
+        }
+        logger.debug(
+            "SIZING_SNAPSHOT build_id=%s loc=%s:%s order_usd=%s limit_px=%s mid=%s raw_size=%s raw_usd=%s rounded_size=%s rounded_usd=%s min_usd=%s",
+            PFPL_STRATEGY_BUILD_ID,
+            __file__,
+            _safe_lineno(),
+            order_usd,
+            limit_px,
+            mid,
+            raw_size,
+            raw_usd,
+            size,
+            usd,
+            min_usd,
+        )
+        # 役割: raw_usd(=本来10USD)が、どの上限/係数で rounded_usd(=2.08USD)まで落ちたかを「候補変数ごと」に特定する
+        cap_ratio = (
+            (usd / raw_usd)
+            if (raw_usd is not None and raw_usd > 0 and usd is not None)
+            else None
+        )
+        # 役割: cap_ratio（=usd/raw_usd）で潰された結果「実効USD(target_usd)」が、どの変数（edge/d_abs等）由来かを同じログ行で特定する
+        _target_usd = float(raw_usd) * float(cap_ratio) if (cap_ratio is not None and raw_usd is not None) else None
+        _usd_ratio = (
+            (float(usd) / float(raw_usd))
+            if (raw_usd is not None and raw_usd > 0 and usd is not None)
+            else None
+        )
+        _size_ratio = (float(size) / float(raw_size)) if (raw_size is not None and raw_size > 0) else None
+
+        _top = ""
+        if _target_usd is not None:
+            _near = []
+            for _k, _v in _ns.items():
+                if _k.startswith("_"):
+                    continue
+                if _k in ("usd", "raw_usd", "order_usd", "cap_ratio", "size", "raw_size", "limit_px", "mid", "min_usd"):
+                    continue
+                if isinstance(_v, bool):
+                    continue
+                try:
+                    _vf = float(_v)
+                except Exception:
+                    continue
+                if abs(_vf) > 1.0e6:
+                    continue
+                _near.append((abs(_vf - _target_usd), _k, _vf))
 
-                _near.sort(key=lambda x: x[0])
-                _top = ", ".join([f"{k}={v} (Δ={d:.6g})" for d, k, v in _near[:10]])
+            _near.sort(key=lambda x: x[0])
+            _top = ", ".join([f"{k}={v} (Δ={d:.6g})" for d, k, v in _near[:10]])
+
+        logger.debug(
+            "SIZING_LIMITERS build_id=%s loc=%s:%s cap_ratio=%s usd_ratio=%s size_ratio=%s raw_usd=%s usd=%s target_usd=%s target_top=%s qty_tick=%s max_order_usd=%s max_trade_usd=%s max_order_qty=%s max_trade_qty=%s size_scale=%s risk_scale=%s remaining_usd=%s remaining_qty=%s",
+            PFPL_STRATEGY_BUILD_ID,
+            __file__,
+            _safe_lineno(),
+            cap_ratio,
+            _usd_ratio,
+            _size_ratio,
+            raw_usd,
+            usd,
+            _target_usd,
+            _top,
+            _ns.get("qty_tick") or _ns.get("qty_step") or _ns.get("sz_tick"),
+            _ns.get("max_order_usd") or _ns.get("order_cap_usd") or _ns.get("cap_usd"),
+            _ns.get("max_trade_usd") or _ns.get("trade_cap_usd"),
+            _ns.get("max_order_qty") or _ns.get("order_cap_qty") or _ns.get("cap_qty"),
+            _ns.get("max_trade_qty") or _ns.get("trade_cap_qty"),
+            _ns.get("size_scale") or _ns.get("scale"),
+            _ns.get("risk_scale"),
+            _ns.get("remaining_usd") or _ns.get("pos_remaining_usd"),
+            _ns.get("remaining_qty") or _ns.get("pos_remaining_qty"),
+        )
+        # 役割: cap_ratio で潰された「実効USD(target_usd)」が、どのローカル変数（edge/diff等）と一致するかを特定する
+        _target_usd = (
+            float(raw_usd) * float(cap_ratio)
+            if (cap_ratio is not None and raw_usd is not None)
+            else None
+        )
+        if _target_usd is not None:
+            _cands = []
+            for _k, _v in _ns.items():
+                if _k.startswith("_"):
+                    continue
+                if _k in (
+                    "usd",
+                    "raw_usd",
+                    "order_usd",
+                    "cap_ratio",
+                    "size",
+                    "raw_size",
+                    "limit_px",
+                    "mid",
+                ):
+                    continue
+                if isinstance(_v, bool):
+                    continue
+                try:
+                    _vf = float(_v)
+                except Exception:
+                    continue
+                # 近さ判定（target_usd の ±5% または ±0.05USD）
+                if abs(_vf - _target_usd) <= max(0.05, abs(_target_usd) * 0.05):
+                    _cands.append((abs(_vf - _target_usd), _k, _vf))
+
+            _cands.sort(key=lambda x: x[0])
+            _top = ", ".join([f"{k}={v} (Δ={d:.6g})" for d, k, v in _cands[:10]])
 
             logger.debug(
-                "SIZING_LIMITERS build_id=%s loc=%s:%s cap_ratio=%s usd_ratio=%s size_ratio=%s raw_usd=%s usd=%s target_usd=%s target_top=%s qty_tick=%s max_order_usd=%s max_trade_usd=%s max_order_qty=%s max_trade_qty=%s size_scale=%s risk_scale=%s remaining_usd=%s remaining_qty=%s",
+                "SIZING_TARGET_MATCH build_id=%s loc=%s:%s target_usd=%s top=%s",
                 PFPL_STRATEGY_BUILD_ID,
                 __file__,
                 _safe_lineno(),
-                cap_ratio,
-                _usd_ratio,
-                _size_ratio,
-                raw_usd,
-                usd,
                 _target_usd,
                 _top,
-                locals().get("qty_tick") or locals().get("qty_step") or locals().get("sz_tick"),
-                locals().get("max_order_usd") or locals().get("order_cap_usd") or locals().get("cap_usd"),
-                locals().get("max_trade_usd") or locals().get("trade_cap_usd"),
-                locals().get("max_order_qty") or locals().get("order_cap_qty") or locals().get("cap_qty"),
-                locals().get("max_trade_qty") or locals().get("trade_cap_qty"),
-                locals().get("size_scale") or locals().get("scale"),
-                locals().get("risk_scale"),
-                locals().get("remaining_usd") or locals().get("pos_remaining_usd"),
-                locals().get("remaining_qty") or locals().get("pos_remaining_qty"),
-            )
-            # 役割: cap_ratio で潰された「実効USD(target_usd)」が、どのローカル変数（edge/diff等）と一致するかを特定する
-            _target_usd = (
-                float(raw_usd) * float(cap_ratio)
-                if (cap_ratio is not None and raw_usd is not None)
-                else None
             )
-            if _target_usd is not None:
-                _cands = []
-                for _k, _v in locals().items():
-                    if _k.startswith("_"):
-                        continue
-                    if _k in (
-                        "usd",
-                        "raw_usd",
-                        "order_usd",
-                        "cap_ratio",
-                        "size",
-                        "raw_size",
-                        "limit_px",
-                        "mid",
-                    ):
+        # 役割: cap_ratio(=usd/raw_usd) と一致/近い「変数そのもの」や「比(A/B)」を自動で炙り出してログに出す
+        cap_ratio_f = float(cap_ratio) if cap_ratio is not None else None
+        if cap_ratio_f is not None:
+            _skip_names = {
+                "cap_ratio", "cap_ratio_f",
+                "raw_usd", "raw_size",
+                "order_usd", "usd", "size",
+                "limit_px", "mid", "min_usd",
+            }
+
+            _vals = []  # (name, float_value)
+
+            def _add_numeric(_name, _v):
+                # 役割: 数値として扱えるものだけ集める（bool/文字列/巨大値は除外）
+                if _name in _skip_names:
+                    return
+                if isinstance(_v, bool):
+                    return
+                try:
+                    _vf = float(_v)
+                except Exception:
+                    return
+                if not (abs(_vf) > 0.0 and abs(_vf) <= 1.0e9):
+                    return
+                _vals.append((_name, _vf))
+
+            # locals() から拾う
+            for _k, _v in _ns.items():
+                _add_numeric(f"local.{_k}", _v)
+
+            # self / config から拾う（属性に倍率が隠れているケースが多い）
+            _self = _ns.get("self")
+            if _self is not None:
+                for _k, _v in getattr(_self, "__dict__", {}).items():
+                    _add_numeric(f"self.{_k}", _v)
+                for _k in getattr(type(_self), "__slots__", ()):
+                    if not _k.startswith("__"):
+                        _add_numeric(f"self.{_k}", getattr(_self, _k, None))
+
+                for _attr in ("cfg", "config", "params", "settings"):
+                    _obj = getattr(_self, _attr, None)
+                    if _obj is None:
                         continue
-                    if isinstance(_v, bool):
+                    if isinstance(_obj, dict):
+                        for _k, _v in _obj.items():
+                            _add_numeric(f"self.{_attr}.{_k}", _v)
+                    else:
+                        for _k, _v in getattr(_obj, "__dict__", {}).items():
+                            _add_numeric(f"self.{_attr}.{_k}", _v)
+
+            # 1) 「変数そのもの」が cap_ratio に近いか（直接マッチ）
+            _direct = []
+            for _name, _vf in _vals:
+                if 0.0 < abs(_vf) <= 1.0:
+                    _direct.append((abs(_vf - cap_ratio_f), _name, _vf))
+            _direct.sort(key=lambda x: x[0])
+            _top_direct = ", ".join([f"{n}={v} (Δ={d:.6g})" for d, n, v in _direct[:8]])
+            logger.debug("SIZING_MATCH cap_ratio=%s top=%s", cap_ratio, _top_direct)
+
+            # 2) 「比(A/B)」が cap_ratio に近いか（間接マッチ） → これで正体を特定する
+            #    ※ cap_ratio が (edge_abs / edge_cap) などで作られている場合、ここで引っかかる
+            _ratio_hits = []
+            _vals_limited = _vals[:80]  # 役割: 計算量を抑える（多すぎると重い）
+            for i in range(len(_vals_limited)):
+                a_name, a_val = _vals_limited[i]
+                for j in range(len(_vals_limited)):
+                    if i == j:
                         continue
-                    try:
-                        _vf = float(_v)
-                    except Exception:
+                    b_name, b_val = _vals_limited[j]
+                    if b_val == 0:
                         continue
-                    # 近さ判定（target_usd の ±5% または ±0.05USD）
-                    if abs(_vf - _target_usd) <= max(0.05, abs(_target_usd) * 0.05):
-                        _cands.append((abs(_vf - _target_usd), _k, _vf))
-
-                _cands.sort(key=lambda x: x[0])
-                _top = ", ".join([f"{k}={v} (Δ={d:.6g})" for d, k, v in _cands[:10]])
+                    r = abs(a_val / b_val)
+                    d = abs(r - cap_ratio_f)
+                    if d <= 0.02:
+                        _ratio_hits.append((d, a_name, a_val, b_name, b_val, r))
+
+            _ratio_hits.sort(key=lambda x: x[0])
+            _top_ratio = ", ".join(
+                [f"{an}/{bn}={rv:.6g} (Δ={d:.6g})" for d, an, av, bn, bv, rv in _ratio_hits[:8]]
+            )
+            logger.debug("SIZING_RATIO_MATCH cap_ratio=%s top=%s", cap_ratio, _top_ratio)
+        # 役割: raw_usd(=本来の10USD)は min_usd を満たすのに、pos_limit 等で usd が極小(dust)に縮んで min_usd を割るケースを
+        #       「min_usd が原因」ではなく「残枠(dust)が原因」として扱い、ログの誤誘導を防ぐ
+        if (usd is not None) and (min_usd is not None) and (usd < min_usd):
+            _raw_usd_f = float(raw_usd) if raw_usd is not None else None
+            _usd_f = float(usd) if usd is not None else None
+            _cap_ratio = (
+                (_usd_f / _raw_usd_f)
+                if (_raw_usd_f is not None and _raw_usd_f > 0 and _usd_f is not None)
+                else None
+            )
 
-                logger.debug(
-                    "SIZING_TARGET_MATCH build_id=%s loc=%s:%s target_usd=%s top=%s",
-                    PFPL_STRATEGY_BUILD_ID,
-                    __file__,
-                    _safe_lineno(),
-                    _target_usd,
-                    _top,
-                )
-            # 役割: cap_ratio(=usd/raw_usd) と一致/近い「変数そのもの」や「比(A/B)」を自動で炙り出してログに出す
-            cap_ratio_f = float(cap_ratio) if cap_ratio is not None else None
-            if cap_ratio_f is not None:
-                _skip_names = {
-                    "cap_ratio", "cap_ratio_f",
-                    "raw_usd", "raw_size",
-                    "order_usd", "usd", "size",
-                    "limit_px", "mid", "min_usd",
-                }
+            # pos_limit 文脈の値が取れるなら「残枠(dust)」を推定して出す（取れなければ None のままでもOK）
+            _poslimit_max_abs_pos = _ns.get("pos_limit_max_abs_pos") or _ns.get("max_abs_pos")
+            _poslimit_proj_abs_pos = _ns.get("pos_limit_proj_abs_pos") or _ns.get("proj_abs_pos")
+            _paper_pos = _ns.get("paper_pos") or _ns.get("pos") or _ns.get("paper_position")
 
-                _vals = []  # (name, float_value)
+            _cur_abs_pos = abs(float(_paper_pos)) if _paper_pos is not None else None
+            _max_abs_pos = float(_poslimit_max_abs_pos) if _poslimit_max_abs_pos is not None else None
+            _proj_abs_pos = float(_poslimit_proj_abs_pos) if _poslimit_proj_abs_pos is not None else None
 
-                def _add_numeric(_name, _v):
-                    # 役割: 数値として扱えるものだけ集める（bool/文字列/巨大値は除外）
-                    if _name in _skip_names:
-                        return
-                    if isinstance(_v, bool):
-                        return
-                    try:
-                        _vf = float(_v)
-                    except Exception:
-                        return
-                    if not (abs(_vf) > 0.0 and abs(_vf) <= 1.0e9):
-                        return
-                    _vals.append((_name, _vf))
-
-                # locals() から拾う
-                for _k, _v in locals().items():
-                    _add_numeric(f"local.{_k}", _v)
-
-                # self / config から拾う（属性に倍率が隠れているケースが多い）
-                _self = locals().get("self")
-                if _self is not None:
-                    for _k, _v in getattr(_self, "__dict__", {}).items():
-                        _add_numeric(f"self.{_k}", _v)
-
-                    for _attr in ("cfg", "config", "params", "settings"):
-                        _obj = getattr(_self, _attr, None)
-                        if _obj is None:
-                            continue
-                        if isinstance(_obj, dict):
-                            for _k, _v in _obj.items():
-                                _add_numeric(f"self.{_attr}.{_k}", _v)
-                        else:
-                            for _k, _v in getattr(_obj, "__dict__", {}).items():
-                                _add_numeric(f"self.{_attr}.{_k}", _v)
-
-                # 1) 「変数そのもの」が cap_ratio に近いか（直接マッチ）
-                _direct = []
-                for _name, _vf in _vals:
-                    if 0.0 < abs(_vf) <= 1.0:
-                        _direct.append((abs(_vf - cap_ratio_f), _name, _vf))
-                _direct.sort(key=lambda x: x[0])
-                _top_direct = ", ".join([f"{n}={v} (Δ={d:.6g})" for d, n, v in _direct[:8]])
-                logger.debug("SIZING_MATCH cap_ratio=%s top=%s", cap_ratio, _top_direct)
-
-                # 2) 「比(A/B)」が cap_ratio に近いか（間接マッチ） → これで正体を特定する
-                #    ※ cap_ratio が (edge_abs / edge_cap) などで作られている場合、ここで引っかかる
-                _ratio_hits = []
-                _vals_limited = _vals[:80]  # 役割: 計算量を抑える（多すぎると重い）
-                for i in range(len(_vals_limited)):
-                    a_name, a_val = _vals_limited[i]
-                    for j in range(len(_vals_limited)):
-                        if i == j:
-                            continue
-                        b_name, b_val = _vals_limited[j]
-                        if b_val == 0:
-                            continue
-                        r = abs(a_val / b_val)
-                        d = abs(r - cap_ratio_f)
-                        if d <= 0.02:
-                            _ratio_hits.append((d, a_name, a_val, b_name, b_val, r))
-
-                _ratio_hits.sort(key=lambda x: x[0])
-                _top_ratio = ", ".join(
-                    [f"{an}/{bn}={rv:.6g} (Δ={d:.6g})" for d, an, av, bn, bv, rv in _ratio_hits[:8]]
-                )
-                logger.debug("SIZING_RATIO_MATCH cap_ratio=%s top=%s", cap_ratio, _top_ratio)
-            # 役割: raw_usd(=本来の10USD)は min_usd を満たすのに、pos_limit 等で usd が極小(dust)に縮んで min_usd を割るケースを
-            #       「min_usd が原因」ではなく「残枠(dust)が原因」として扱い、ログの誤誘導を防ぐ
-            if (usd is not None) and (min_usd is not None) and (usd < min_usd):
-                _raw_usd_f = float(raw_usd) if raw_usd is not None else None
-                _usd_f = float(usd) if usd is not None else None
-                _cap_ratio = (
-                    (_usd_f / _raw_usd_f)
-                    if (_raw_usd_f is not None and _raw_usd_f > 0 and _usd_f is not None)
-                    else None
-                )
-
-                # pos_limit 文脈の値が取れるなら「残枠(dust)」を推定して出す（取れなければ None のままでもOK）
-                _poslimit_max_abs_pos = locals().get("pos_limit_max_abs_pos") or locals().get("max_abs_pos")
-                _poslimit_proj_abs_pos = locals().get("pos_limit_proj_abs_pos") or locals().get("proj_abs_pos")
-                _paper_pos = locals().get("paper_pos") or locals().get("pos") or locals().get("paper_position")
-
-                _cur_abs_pos = abs(float(_paper_pos)) if _paper_pos is not None else None
-                _max_abs_pos = float(_poslimit_max_abs_pos) if _poslimit_max_abs_pos is not None else None
-                _proj_abs_pos = float(_poslimit_proj_abs_pos) if _poslimit_proj_abs_pos is not None else None
+            _remaining_qty = (
+                (_max_abs_pos - _cur_abs_pos)
+                if (_max_abs_pos is not None and _cur_abs_pos is not None)
+                else None
+            )
+            _remaining_usd = (
+                (float(mid) * _remaining_qty) if (_remaining_qty is not None and mid is not None) else None
+            )
 
-                _remaining_qty = (
-                    (_max_abs_pos - _cur_abs_pos)
-                    if (_max_abs_pos is not None and _cur_abs_pos is not None)
-                    else None
-                )
-                _remaining_usd = (
-                    (float(mid) * _remaining_qty) if (_remaining_qty is not None and mid is not None) else None
-                )
+            _increasing = (
+                _proj_abs_pos is not None
+                and _cur_abs_pos is not None
+                and _proj_abs_pos > _cur_abs_pos + 1e-12
+            )
+            _looks_like_poslimit_dust = (
+                (_raw_usd_f is not None and _raw_usd_f >= float(min_usd))
+                and (_cap_ratio is not None and _cap_ratio < 0.999)
+                and (_increasing or _proj_abs_pos is None)
+                and (_max_abs_pos is not None)
+            )
 
-                _increasing = (
-                    _proj_abs_pos is not None
-                    and _cur_abs_pos is not None
-                    and _proj_abs_pos > _cur_abs_pos + 1e-12
-                )
-                _looks_like_poslimit_dust = (
-                    (_raw_usd_f is not None and _raw_usd_f >= float(min_usd))
-                    and (_cap_ratio is not None and _cap_ratio < 0.999)
-                    and (_increasing or _proj_abs_pos is None)
-                    and (_max_abs_pos is not None)
+            # 役割: pos_limit 残枠(dust)が原因で min_usd を割ったケースは、decision と同じ書式で「pos_ok=False」として記録し、集計も一貫させる
+            if _looks_like_poslimit_dust:
+                logger.debug(
+                    "pos_ok=False (pos_limit dust) stage=order raw_usd=%s usd=%s cap_ratio=%s remaining_usd=%s remaining_qty=%s cur_abs_pos=%s max_abs_pos=%s proj_abs_pos=%s min_usd=%s",
+                    raw_usd,
+                    usd,
+                    _cap_ratio,
+                    _remaining_usd,
+                    _remaining_qty,
+                    _cur_abs_pos,
+                    _max_abs_pos,
+                    _proj_abs_pos,
+                    min_usd,
                 )
+                return
 
-                if _looks_like_poslimit_dust:
-                    logger.debug(
-                        "pos_ok=False (pos_limit dust) stage=order raw_usd=%s usd=%s cap_ratio=%s remaining_usd=%s remaining_qty=%s cur_abs_pos=%s max_abs_pos=%s proj_abs_pos=%s min_usd=%s",
-                        raw_usd,
-                        usd,
-                        _cap_ratio,
-                        _remaining_usd,
-                        _remaining_qty,
-                        _cur_abs_pos,
-                        _max_abs_pos,
-                        _proj_abs_pos,
-                        min_usd,
-                    )
-                    return None
-
-                # それ以外は通常の min_usd スキップ（本当に小さい注文）
-                logger.debug(f"size {size:.4f} USD {usd:.2f} < min_usd {min_usd:.2f} → skip")
-                return None
-
-        # 重要: 以降の注文サイズは size を使う（order_usd/limit_px を再計算しない）
-
-        # ⑨ 発注
-        # 役割: ここまで来たら「発注してOK」。カウンタだけ進め、既存の発注ロジックへ続行
-        self._last_order_ts = now_ts
-        self._order_count_in_window = (
-            getattr(self, "_order_count_in_window", 0) or 0
-        ) + 1
-        asyncio.create_task(self.place_order(side, float(size)))
+            # それ以外は通常の min_usd スキップ（本当に小さい注文）
+            logger.debug("size %.4f USD %.2f < min_usd %.2f → skip", size, usd, min_usd)
+            return
 
     # ---------------------------------------------------------------- order
 
@@ -2028,7 +2768,7 @@ class PFPLStrategy:
 
         return realized
 
-    async def place_order(
+    def _build_order_kwargs(
         self,
         side: str,
         size: float,
@@ -2038,8 +2778,8 @@ class PFPLStrategy:
         reduce_only: bool = False,
         time_in_force: str | None = None,
         **kwargs,
-    ) -> None:
-        """IOC で即時約定、失敗時リトライ付き"""
+    ) -> dict[str, Any] | None:
+        """place_order / place_orders 共通: 価格補正・サイズ丸めを行い exchange.order の引数を組む（見送りなら None）。"""
         is_buy = side == "BUY"
         mid_value = self.mid
 
@@ -2057,18 +2797,15 @@ class PFPLStrategy:
             if limit_px is None:
                 if mid_value is None:
                     logger.warning("mid price unavailable; skip order placement")
-                    return
+                    return None
                 limit_px = self._price_with_offset(float(mid_value), side)
 
-            limit_body: dict[str, Any] = {}
             if tif is not None:
-                limit_body["tif"] = tif
+                order_type_payload = {"limit": {"tif": tif}}
+            elif ioc_requested is None or bool(ioc_requested):
+                order_type_payload = self._ioc_order_type  # 既定: 事前生成した IOC を共有
             else:
-                use_ioc = True if ioc_requested is None else bool(ioc_requested)
-                if use_ioc:
-                    limit_body["tif"] = "Ioc"
-
-            order_type_payload = {"limit": limit_body}
+                order_type_payload = {"limit": {}}
         elif order_type == "market":
             fallback_px = limit_px
             if fallback_px is None:
@@ -2081,25 +2818,24 @@ class PFPLStrategy:
                     logger.warning(
                         "market order requested but no price reference available; skip"
                     )
-                    return
+                    return None
                 logger.debug("market order fallback limit_px=%s", fallback_px)
-            order_type_payload = {"market": {}}
+            order_type_payload = self._market_order_type
             limit_px = fallback_px
         else:
             logger.error("unsupported order_type=%s", order_type)
-            return
+            return None
 
         limit_px = self._taker_limit_price(side, limit_px, mid_value)
 
-        try:
-            size_dec = Decimal(str(size)).quantize(self.qty_tick, rounding=ROUND_DOWN)
-        except InvalidOperation:
+        size_dec = self._quantize_size_fast(float(size))
+        if size_dec is None:
             logger.error(
                 "place_order: quantize failed for size %s with qty_tick %s",
                 size,
                 self.qty_tick,
             )
-            return
+            return None
         if size_dec <= 0:
             logger.debug(
                 "place_order: size %s → %s after quantize %s → skip",
@@ -2107,7 +2843,7 @@ class PFPLStrategy:
                 size_dec,
                 self.qty_tick,
             )
-            return
+            return None
 
         order_kwargs: dict[str, Any] = {
             "coin": self.base_coin,
@@ -2119,6 +2855,35 @@ class PFPLStrategy:
         }
         if limit_px is not None:
             order_kwargs["limit_px"] = limit_px
+        return order_kwargs
+
+    async def place_order(
+        self,
+        side: str,
+        size: float,
+        *,
+        order_type: str = "limit",
+        limit_px: float | None = None,
+        reduce_only: bool = False,
+        time_in_force: str | None = None,
+        **kwargs,
+    ) -> None:
+        """IOC で即時約定、失敗時リトライ付き"""
+        order_kwargs = self._build_order_kwargs(
+            side,
+            size,
+            order_type=order_type,
+            limit_px=limit_px,
+            reduce_only=reduce_only,
+            time_in_force=time_in_force,
+            **kwargs,
+        )
+        if order_kwargs is None:
+            return
+        is_buy = order_kwargs["is_buy"]
+        mid_value = self.mid
+        limit_px = order_kwargs.get("limit_px")
+        size_dec = Decimal(str(order_kwargs["sz"]))
 
         # --- Dry-run: 紙で約定をシミュレートする --------------------------------
         test_mode = bool(os.getenv("PYTEST_CURRENT_TEST"))
@@ -2127,7 +2892,7 @@ class PFPLStrategy:
             logger.info("[DRY-RUN] payload=%s", order_kwargs)
 
             # 紙用の疑似約定（IOC想定）。bid/askが無いときは mid をフォールバック。
-            qty_dec = Decimal(str(order_kwargs.get("sz", size_dec)))
+            qty_dec = size_dec
             px_src = order_kwargs.get("limit_px")
             px_val = (
                 Decimal(str(px_src))
@@ -2140,10 +2905,7 @@ class PFPLStrategy:
             can_fill = True
             miss_reason: str | None = None
             slip_pct = (self.paper_slip_bps or Decimal("0")) / Decimal("10000")
-            if px_val is None:
-                can_fill = False
-                miss_reason = "paper price unavailable"
-            elif bid is not None and ask is not None:
+            if bid is not None and ask is not None:
                 if is_buy:
                     threshold = ask * (Decimal("1") - slip_pct)
                     if px_val < threshold:
@@ -2166,12 +2928,12 @@ class PFPLStrategy:
                     miss_reason,
                     None,
                 )
-                self.last_ts = time.time()
+                self.last_ts = time.monotonic()
                 self.last_side = side
                 return
 
             realized = self._paper_fill(side, qty_dec, px_val)
-            notional = (px_val or Decimal("0")) * qty_dec
+            notional = px_val * qty_dec
             fee_rate = self.paper_fee_bps_taker if getattr(self, "taker_mode", False) else self.paper_fee_bps_maker
             fee = (notional * fee_rate) / Decimal("10000") if fee_rate else Decimal("0")
             if fee:
@@ -2218,66 +2980,103 @@ class PFPLStrategy:
                     float(self.paper_pos),
                     float(self.paper_avg_px),
                 )
-            # pytest ではモックされた exchange.order をスレッド経由で呼び、非ブロッキング挙動を検証できるようにする
-            try:
-                if os.getenv("PYTEST_CURRENT_TEST"):
-                    order_fn = getattr(self.exchange, "order", None)
-                    if callable(order_fn):
-                        await asyncio.to_thread(order_fn, **order_kwargs)
-            except Exception:
-                pass
-                pass
-            self.last_ts = time.time()
+            self.last_ts = time.monotonic()
             self.last_side = side
             return
         # ──────────────────────────────
 
-        async with self.sem:  # 1 秒あたり発注制御
-            MAX_RETRY = 3
-            order_fn = getattr(self.exchange, "order", None)
-            if not callable(order_fn):
-                raise AttributeError("exchange.order is not callable")
-            for attempt in range(1, MAX_RETRY + 1):
-                try:
+        order_fn = getattr(self.exchange, "order", None)
+        if not callable(order_fn):
+            raise AttributeError("exchange.order is not callable")
+        await self._submit_with_retry(
+            lambda: self._send_order(order_fn, order_kwargs),
+            sides=[side],
+            signal_args=(self.symbol, side, size_dec, limit_px),
+        )
+
+    async def place_orders(self, orders: list[tuple[str, float]]) -> None:
+        """
+        複数の (side, size) を 1 つの署名済みアクション（exchange.bulk_orders）でまとめて発注する。
+        1 件だけ・紙トレ・bulk_orders が無い場合は place_order を順に呼ぶ。
+        """
+        test_mode = bool(os.getenv("PYTEST_CURRENT_TEST"))
+        bulk_fn = getattr(self.exchange, "bulk_orders", None)
+        if len(orders) <= 1 or (self.dry_run and not test_mode) or not callable(bulk_fn):
+            for side, size in orders:
+                await self.place_order(side, size)
+            return
+        built = [
+            (side, kw)
+            for side, size in orders
+            if (kw := self._build_order_kwargs(side, size)) is not None
+        ]
+        if not built:
+            return
+        await self._submit_with_retry(
+            lambda: self._send_bulk(bulk_fn, [kw for _, kw in built]),
+            sides=[side for side, _ in built],
+        )
+
+    async def _submit_with_retry(
+        self,
+        send: Any,
+        *,
+        sides: list[str],
+        signal_args: tuple[Any, ...] | None = None,
+    ) -> bool:
+        """send() を最大 3 回まで送る（4xx は即打ち切り）。成功したら発注カウンタと建玉を更新する。
+
+        同時実行枠（sem）と 1 秒あたりのトークン（_rl）は試行ごとに取り直し、リトライ待ちの間は
+        どちらも手放す（再送もトークンを消費し、429 のバックオフ中に他シンボルの発注を止めない）。
+        """
+        MAX_RETRY = 3
+        for attempt in range(1, MAX_RETRY + 1):
+            try:
+                if signal_args is not None:
                     logger.info(
-                        "ORDER_SIGNAL symbol=%s side=%s qty=%s price=%s extra=%s",
-                        locals().get("symbol"),
-                        locals().get("side"),
-                        locals().get("qty", locals().get("size")),
-                        locals().get("price"),
-                        {"mid": locals().get("mid"), "reason": locals().get("reason")},
+                        "ORDER_SIGNAL symbol=%s side=%s qty=%s price=%s",
+                        *signal_args,
                     )
-                    resp = await asyncio.to_thread(order_fn, **order_kwargs)
-                    logger.info("ORDER OK %s try=%d → %s", self.symbol, attempt, resp)
-                    self._order_count += 1
-                    self.last_ts = time.time()
-                    self.last_side = side
-                    asyncio.create_task(self._refresh_position())
-                    break
-                except Exception as exc:
+                async with self.sem, self._rl:  # 同時実行数 + 1 秒あたり発注制御（1 試行 = 1 トークン）
+                    resp = await send()
+                logger.info("ORDER OK %s try=%d → %s", self.symbol, attempt, resp)
+                self._order_count += len(sides)
+                self.last_ts = time.monotonic()
+                self.last_side = sides[-1]
+                self._spawn(self._refresh_position(force=True))
+                return True
+            except Exception as exc:
+                logger.error(
+                    "ORDER FAIL %s try=%d/%d: %s",
+                    self.symbol,
+                    attempt,
+                    MAX_RETRY,
+                    exc,
+                )
+                if not _is_retryable_order_error(exc):
                     logger.error(
-                        "ORDER FAIL %s try=%d/%d: %s",
+                        "GIVE-UP %s: non-retryable error on try=%d",
                         self.symbol,
                         attempt,
-                        MAX_RETRY,
-                        exc,
                     )
-                    if attempt == MAX_RETRY:
-                        logger.error(
-                            "GIVE-UP %s after %d retries", self.symbol, MAX_RETRY
-                        )
-                    else:
-                        await anyio.sleep(0.5)
-
-    def _sign(self, payload: dict[str, Any]) -> str:
-        """API Wallet Secret で HMAC-SHA256 署名（例）"""
-        msg = json.dumps(payload, separators=(",", ":")).encode()
-        return hmac.new(self.secret.encode(), msg, hashlib.sha256).hexdigest()
+                    return False
+                if attempt == MAX_RETRY:
+                    logger.error(
+                        "GIVE-UP %s after %d retries", self.symbol, MAX_RETRY
+                    )
+                else:
+                    await asyncio.sleep(_retry_delay(attempt, _order_error_status(exc)))
+        return False
 
     # ------------------------------------------------------------------ daily reset
-    def _maybe_daily_reset_and_log(self) -> None:
-        """UTC日付の変化を検知して、カウンタを明示ログ付きでリセットする"""
+    def _maybe_daily_reset_and_log(self, now_ts: float | None = None) -> None:
+        """UTC日付の変化を検知して、カウンタを明示ログ付きでリセットする（now_ts は UNIX 秒）"""
+        if now_ts is None:
+            now_ts = time.time()
+        if now_ts < self._next_day_ts:
+            return
         tz = getattr(self, "_tz", timezone.utc)
+        self._next_day_ts = _next_midnight_ts(tz, now_ts)
         today = datetime.now(tz).date()
         if today != getattr(self, "_start_day", today):
             prev_day = getattr(self, "_start_day", today)
@@ -2294,13 +3093,42 @@ class PFPLStrategy:
             )
 
     # ------------------------------------------------------------------ limits
-    def _check_limits(self) -> bool:
+    def _tick_guard(self, now_ts: float) -> int:
+        """
+        evaluate 冒頭のガードを 1 回の呼び出しで判定する（now_ts は UNIX 秒）。
+        funding の危険窓（buffer_sec 前〜reenter_sec 後）→ funding 前クローズ → _check_limits の順に見て、
+        _GUARD_SKIP（売買停止）/ _GUARD_CLOSE（funding 前に全クローズ）/ _GUARD_OK を返す。
+        """
+        if self.funding_guard_enabled:
+            next_ts = self.next_funding_ts
+            if next_ts is not None:
+                in_window = (
+                    next_ts - self.funding_guard_buffer_sec
+                    <= now_ts
+                    <= next_ts + self.funding_guard_reenter_sec
+                )
+                if in_window != self._funding_pause:
+                    logger.info("⏳ Funding window ➜ 売買停止" if in_window else "✅ Funding passed ➜ 売買再開")
+                    self._funding_pause = in_window
+                if in_window:
+                    return _GUARD_SKIP
+                if next_ts and now_ts > next_ts - self.funding_guard_buffer_sec:
+                    return _GUARD_CLOSE
+        elif self._funding_pause:
+            self._funding_pause = False
+        return _GUARD_OK if self._check_limits(now_ts) else _GUARD_SKIP
+
+    def _check_limits(self, now_ts: float | None = None) -> bool:
         """日次の発注数制限を超えていないか確認（建玉制限は発注直前で方向込み判定）"""
-        tz = getattr(self, "_tz", timezone.utc)
-        today = datetime.now(tz).date()
-        if today != self._start_day:  # 日付が変わったらリセット
-            self._start_day = today
-            self._order_count = 0
+        if now_ts is None:
+            now_ts = time.time()
+        if now_ts >= self._next_day_ts:
+            tz = getattr(self, "_tz", timezone.utc)
+            self._next_day_ts = _next_midnight_ts(tz, now_ts)
+            today = datetime.now(tz).date()
+            if today != self._start_day:  # 日付が変わったらリセット
+                self._start_day = today
+                self._order_count = 0
 
         if self._order_count >= self.max_daily_orders:
             logger.warning("daily order-limit reached → trading disabled")
@@ -2313,7 +3141,7 @@ class PFPLStrategy:
         pos_limit超過時のログを一定時間内で集計してまとめる。
         kind: "cur"（現建玉）/ "proj"（発注後の見込み）
         """
-        now_ts = time.time()
+        now_ts = time.monotonic()  # 集計窓の経過判定だけに使う
         window = getattr(self, "_pos_limit_window_sec", 60)
         if not hasattr(self, "_pos_limit_hits_detail"):
             self._pos_limit_hits_detail = {"total": 0, "cur": 0, "proj": 0}
@@ -2349,87 +3177,84 @@ class PFPLStrategy:
         window_sec: float,
         quantile: float,
         min_samples: int = 50,
+        max_samples: int = 0,
+        sample_sec: float = 0.0,
     ) -> float | None:
         """
-        abs(diff) の履歴を window_sec で保持し、quantile(0-1)の値を返す。
+        abs(diff) の履歴を window_sec（かつ max_samples 件）で保持し、quantile(0-1)の値を返す。
         サンプル不足なら None を返し、フィルタは緩めに通す。
         """
         if not 0 <= quantile <= 1:
             return None
-        if min_samples <= 0:
-            min_samples = 1
+        self._push_signal_hist(abs_diff, now_ts, window_sec, max_samples, sample_sec)
+        return self._signal_quantile(quantile, min_samples)
+
+    def _push_signal_hist(
+        self,
+        abs_diff: float,
+        now_ts: float,
+        window_sec: float,
+        max_samples: int = 0,
+        sample_sec: float = 0.0,
+    ) -> None:
+        """
+        abs(diff) を履歴と昇順の写しへ追加し、window_sec より古いもの・max_samples を超えた古いものを落とす。
+        直前の記録から sample_sec 未満なら積まない（履歴も版数も変えない）。
+        """
         dq: deque[tuple[float, float]] = getattr(self, "_signal_hist", deque())
-        dq.append((now_ts, float(abs_diff)))
+        if sample_sec > 0 and dq and now_ts - dq[-1][0] < sample_sec:
+            return
+        vals: list[float] = getattr(self, "_signal_sorted", [])
+        if len(vals) != len(dq):
+            # 写しが無い/ずれている（外部から履歴を差し替えた等）ときだけ作り直す
+            vals = sorted(v for _, v in dq)
+        v_new = float(abs_diff)
+        dq.append((now_ts, v_new))
+        bisect.insort(vals, v_new)
         cutoff = now_ts - window_sec
         while dq and dq[0][0] < cutoff:
-            dq.popleft()
+            _, v_old = dq.popleft()
+            del vals[bisect.bisect_left(vals, v_old)]
+        if max_samples > 0:
+            while len(dq) > max_samples:
+                _, v_old = dq.popleft()
+                del vals[bisect.bisect_left(vals, v_old)]
         # 保存し直す
         self._signal_hist = dq
-        if len(dq) < min_samples:
-            return None
-        vals = sorted(v for _, v in dq)
-        if not vals:
-            return None
-        k = (len(vals) - 1) * quantile
-        lo = int(k)
-        hi = min(lo + 1, len(vals) - 1)
-        if lo == hi:
-            return vals[lo]
-        frac = k - lo
-        return vals[lo] + (vals[hi] - vals[lo]) * frac
-
-    def _check_funding_window(self) -> bool:
+        self._signal_sorted = vals
+        self._signal_hist_ver = getattr(self, "_signal_hist_ver", 0) + 1
+
+    def _signal_quantile(self, quantile: float, min_samples: int = 50) -> float | None:
         """
-        funding 直前・直後は True を返さず evaluate() を停止させる。
-        - 5 分前 〜 2 分後 を「危険窓」とする
+        現在の履歴の quantile(0-1) 値を返す（サンプル不足なら None）。
+        履歴が変わっていなければ前回の結果をそのまま返す。
         """
-        if not self.funding_guard_enabled:
-            if self._funding_pause:
-                self._funding_pause = False
-            return True
-        if self.next_funding_ts is None:
-            return True  # fundingInfo 未取得なら通常運転
-
-        now = time.time()
-        before = self.funding_guard_buffer_sec
-        after = self.funding_guard_reenter_sec
-
-        in_window = self.next_funding_ts - before <= now <= self.next_funding_ts + after
-
-        if in_window and not self._funding_pause:
-            logger.info("⏳ Funding window ➜ 売買停止")
-            self._funding_pause = True
-        elif not in_window and self._funding_pause:
-            logger.info("✅ Funding passed ➜ 売買再開")
-            self._funding_pause = False
-
-        return not in_window
-
-    # ------------------------------------------------------------------
-    # Funding‑close helper
-    # ------------------------------------------------------------------
-    def _should_close_before_funding(self, now_ts: float) -> bool:
-        """Return True if we are within the configured buffer before funding."""
-        if not self.funding_guard_enabled:
-            return False
-        next_ts = getattr(self, "next_funding_ts", None)
-        if not next_ts:
-            return False
-        return now_ts > next_ts - self.funding_guard_buffer_sec
+        if min_samples <= 0:
+            min_samples = 1
+        key = (getattr(self, "_signal_hist_ver", 0), quantile, min_samples)
+        cached = getattr(self, "_signal_q_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        vals: list[float] = getattr(self, "_signal_sorted", [])
+        result: float | None = None
+        if len(vals) >= min_samples and vals:
+            k = (len(vals) - 1) * quantile
+            lo = int(k)
+            hi = min(lo + 1, len(vals) - 1)
+            if lo == hi:
+                result = vals[lo]
+            else:
+                result = vals[lo] + (vals[hi] - vals[lo]) * (k - lo)
+        self._signal_q_cache = (key, result)
+        return result
 
     async def _close_all_positions(self) -> None:
         """Close every open position for this symbol."""
         try:
-            state = self.exchange.info.user_state(self.account)
+            # 決済サイズを決めるので共有キャッシュは使わず最新を取る（取得結果は他の戦略とも共有される）
+            state = await self._get_user_state(force=True)
             coin = self.base_coin
-            perp_pos = next(
-                (
-                    p
-                    for p in state.get("perpPositions", [])
-                    if p["position"]["coin"] == coin
-                ),
-                None,
-            )
+            perp_pos = _positions_by_coin(state).get(coin)
             if not perp_pos:
                 return
             sz = Decimal(perp_pos["position"]["sz"])
@@ -2481,9 +3306,7 @@ class PFPLStrategy:
         BUY  → base_px * (1 - eps_pct)   (より安く買う)
         SELL → base_px * (1 + eps_pct)   (より高く売る)
         """
-        if side.upper() == "BUY":
-            return base_px * (1 - self.eps_pct)
-        return base_px * (1 + self.eps_pct)
+        return base_px * (self._buy_factor if side == "BUY" else self._sell_factor)
 
     def _taker_limit_price(
         self,
@@ -2503,21 +3326,32 @@ class PFPLStrategy:
 
         bid = getattr(self, "best_bid", None)
         ask = getattr(self, "best_ask", None)
-        # eps_pct は float なので Decimal に正規化し、paper_slip_bps と比較
-        eps_dec = Decimal(str(getattr(self, "eps_pct", 0) or 0))
-        slip_dec = (self.paper_slip_bps or Decimal("0")) / Decimal("10000")
-        cushion = max(eps_dec, slip_dec)
+        buy_mult, sell_mult = self._taker_mults()
 
         try:
-            if side.upper() == "BUY" and ask is not None:
-                return float(ask * (Decimal("1") + cushion))
-            if side.upper() == "SELL" and bid is not None:
-                return float(bid * (Decimal("1") - cushion))
+            side_u = side.upper()
+            if side_u == "BUY" and ask is not None:
+                return float(ask * buy_mult)
+            if side_u == "SELL" and bid is not None:
+                return float(bid * sell_mult)
         except Exception:
             return candidate
 
         return candidate
 
+    def _taker_mults(self) -> tuple[Decimal, Decimal]:
+        """(1 + cushion, 1 - cushion) を返す。eps_pct / paper_slip_bps が変わった時だけ再計算する。"""
+        # eps_pct は float なので Decimal に正規化したもの（setter で保持）と paper_slip_bps を比較
+        src = (self._eps_dec, self.paper_slip_bps)
+        cached = getattr(self, "_taker_mults_cached", None)
+        if cached is not None and cached[0] == src:
+            return cached[1]
+        slip_dec = (self.paper_slip_bps or _ZERO) / Decimal("10000")
+        cushion = max(self._eps_dec, slip_dec)
+        mults = (Decimal("1") + cushion, Decimal("1") - cushion)
+        self._taker_mults_cached = (src, mults)
+        return mults
+
 
 def log_order_decision(
     logger,
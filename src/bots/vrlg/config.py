@@ -58,6 +58,8 @@ class ExecCfg:
     percent_max: float = 0.005
     min_clip_btc: float = 0.001
     equity_usd: float = 10_000.0
+    # 口座残高の取り直し間隔（秒）。0 なら equity_usd を固定で使う（live のみ有効）
+    equity_refresh_s: float = 0.0
 
 
 @dataclass
@@ -161,6 +163,7 @@ def coerce_vrlg_config(data: Any) -> VRLGConfig:
         percent_max=float(_val(e, "percent_max", ExecCfg.percent_max)),
         min_clip_btc=float(_val(e, "min_clip_btc", ExecCfg.min_clip_btc)),
         equity_usd=float(_val(e, "equity_usd", ExecCfg.equity_usd)),
+        equity_refresh_s=float(_val(e, "equity_refresh_s", ExecCfg.equity_refresh_s)),
     )
     risk = RiskCfg(
         max_slippage_ticks=float(_val(r, "max_slippage_ticks", RiskCfg.max_slippage_ticks)),
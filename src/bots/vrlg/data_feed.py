@@ -54,6 +54,31 @@ class FeatureSnapshot:
         return replace(self, block_phase=float(phase))
 
 
+def l1_features(bb: float, ba: float, bs: float, asz: float, tick: float) -> Tuple[float, float, float, float]:
+    """Return ``(mid, spread_ticks, dob, obi)`` for one level-1 quote.
+
+    Shared by the live feature pump and the backtest replay so both score
+    ticks with the same arithmetic. ``tick`` must already be positive.
+    """
+
+    mid = (bb + ba) / 2.0
+    spread_ticks = (ba - bb) / tick
+    dob, obi = l1_depth(bs, asz)
+    return mid, spread_ticks, dob, obi
+
+
+def l1_depth(bs: float, asz: float) -> Tuple[float, float]:
+    """Return ``(dob, obi)`` from the level-1 bid/ask sizes.
+
+    Used on its own when one side of the quote is missing, so the depth
+    features keep the same formula as :func:`l1_features`.
+    """
+
+    dob = bs + asz
+    obi = 0.0 if dob <= 0.0 else (bs - asz) / max(dob, 1e-9)
+    return dob, obi
+
+
 def _get(obj: Any, key: str, default: Any = None) -> Any:
     """Fetch ``key`` from either an attribute or mapping, safely."""
 
@@ -137,11 +162,14 @@ async def _feature_pump(
     """Sample the latest level-1 data every 100ms and emit features."""
 
 
-    tick = float(getattr(getattr(cfg, "symbol", {}), "tick_size", 0.5))
+    tick = max(float(getattr(getattr(cfg, "symbol", {}), "tick_size", 0.5)), 1e-12)
     dt = 0.1  # 100ms cadence
     last = (0.0, 0.0, 0.0, 0.0)
     last_mid = 0.0
-    next_ts = time.time()
+    # 〔この行がすること〕 100ms 周期の予定時刻はループの単調時計で管理する（ループ参照は 1 回だけ取得）
+    loop = asyncio.get_running_loop()
+    loop_time = loop.time
+    next_ts = loop_time()
 
     try:
         while True:
@@ -153,19 +181,16 @@ async def _feature_pump(
 
             bb, ba, bs, asz = last
             if bb > 0.0 and ba > 0.0:
-                last_mid = (bb + ba) / 2.0
-                spread_ticks = (ba - bb) / max(tick, 1e-12)
+                last_mid, spread_ticks, dob, obi = l1_features(bb, ba, bs, asz, tick)
             else:
                 spread_ticks = 0.0
+                dob, obi = l1_depth(bs, asz)
 
             if last_mid <= 0.0:
                 await asyncio.sleep(dt)
-                next_ts = time.time() + dt
+                next_ts = loop_time() + dt
                 continue
 
-            dob = bs + asz
-            obi = 0.0 if dob <= 0.0 else (bs - asz) / max(dob, 1e-9)
-
             snap = FeatureSnapshot(
                 t=time.time(),
                 mid=last_mid,
@@ -187,7 +212,7 @@ async def _feature_pump(
                     pass
 
             next_ts += dt
-            await asyncio.sleep(max(0.0, next_ts - time.time()))
+            await asyncio.sleep(max(0.0, next_ts - loop_time()))
     except asyncio.CancelledError:
         raise
 
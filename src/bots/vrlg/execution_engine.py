@@ -14,6 +14,28 @@ import logging
 
 logger = logging.getLogger("bots.vrlg.exec")
 
+# 〔この import 群がすること〕
+# 取引所 HTTP アダプタの関数をモジュール読み込み時に 1 回だけ解決します（発注・取消のたびに import 文を実行しない）。
+# 無い（または未実装の）関数は None にしておき、各メソッドはプレースホルダで動きます。
+try:
+    from hl_core.api.http import place_order as _api_place_order  # type: ignore
+except Exception:  # pragma: no cover
+    _api_place_order = None
+try:
+    from hl_core.api.http import cancel_order as _api_cancel_order  # type: ignore
+except Exception:  # pragma: no cover
+    _api_cancel_order = None
+try:
+    from hl_core.api.http import cancel_orders as _api_cancel_orders  # type: ignore
+except Exception:  # pragma: no cover
+    _api_cancel_orders = None
+try:
+    from hl_core.api.http import close_all_ioc as _api_close_all_ioc  # type: ignore
+except Exception:
+    _api_close_all_ioc = None
+
+_CANCEL_CHUNK = 50  # 〔この定数がすること〕 一括キャンセル 1 リクエストあたりの最大件数（レート制限対策）
+
 
 def _safe(cfg, section: str, key: str, default):
     """〔この関数がすること〕 設定（属性 or dict）の両対応で値を安全に取得します。"""
@@ -72,6 +94,7 @@ class ExecutionEngine:
 
         self._open_maker_btc: float = 0.0  # 〔この属性がすること〕 未キャンセルの maker 注文サイズ合計（BTC）を管理
         self._order_size: dict[str, float] = {}  # 〔この属性がすること〕 order_id → 発注 total サイズの対応
+        self._fill_waiters: dict[str, asyncio.Future] = {}  # 〔この属性がすること〕 order_id → 約定で完了する Future（wait_fill_or_ttl が待つ）
 
     def set_period_hint(self, period_s: float) -> None:
         """〔このメソッドがすること〕
@@ -192,13 +215,29 @@ class ExecutionEngine:
 
     async def wait_fill_or_ttl(self, order_ids: list[str], timeout_s: float) -> None:
         """〔このメソッドがすること〕
-        TTL まで待って（ここではシンプルに sleep）、未充足分をまとめてキャンセルします。
-        - 実環境では約定/板更新を監視して早期キャンセルに置き換えます。
+        TTL まで待って、未充足分をまとめてキャンセルします。
+        - fills（on_child_filled）で全注文の約定が届いた時点で TTL を待たずに抜けます（ポーリングしない）。
+        - 台帳に残っていない（約定済みの）注文は待ちません。
         """
         if not order_ids:
             return
         try:
-            await asyncio.sleep(max(0.0, float(timeout_s)))
+            pending = [str(oid) for oid in order_ids if str(oid) in self._order_size]
+            timeout = max(0.0, float(timeout_s))
+            if pending and timeout > 0.0:
+                loop = asyncio.get_running_loop()
+                futs = []
+                for oid in pending:
+                    fut = self._fill_waiters.get(oid)
+                    if fut is None or fut.done():
+                        fut = loop.create_future()
+                        self._fill_waiters[oid] = fut
+                    futs.append(fut)
+                try:
+                    await asyncio.wait(futs, timeout=timeout)
+                finally:
+                    for oid in pending:
+                        self._fill_waiters.pop(oid, None)
         except Exception:
             pass
         await self._cancel_many(order_ids)
@@ -224,9 +263,8 @@ class ExecutionEngine:
         可能な範囲で保有を即時解消（IOC）します。API 未導入時はログのみ。
         実運用ではポジション照会→反対成行（IOC）を実装します。
         """
-        try:
-            from hl_core.api.http import close_all_ioc  # type: ignore
-        except Exception:
+        close_all_ioc = _api_close_all_ioc
+        if close_all_ioc is None:
             logger.info("[paper=%s] flatten_ioc placeholder (no-op)", self.paper)
             return
         try:
@@ -258,9 +296,8 @@ class ExecutionEngine:
             "type": "STOP",
             "paper": self.paper,
         }
-        try:
-            from hl_core.api.http import place_order  # type: ignore
-        except Exception:
+        place_order = _api_place_order
+        if place_order is None:
             logger.info("[paper=%s] place_reverse_stop placeholder: %s", self.paper, payload)
             return f"paper-stop-{payload['side']}-{int(time.time()*1000)}"
 
@@ -281,16 +318,16 @@ class ExecutionEngine:
         if not order_id:
             return
 
-        try:
-            from hl_core.api.http import cancel_order  # type: ignore
+        cancel_order = _api_cancel_order
+        if cancel_order is None:
+            # API 自体が無い環境 → ログだけで継続
+            logger.info("[paper=%s] cancel placeholder: %s", self.paper, order_id)
+        else:
             try:
                 await cancel_order(self.symbol, order_id)  # type: ignore[misc]
             except Exception:
                 # API 失敗は握り潰して台帳だけ整合を取る
                 pass
-        except Exception:
-            # API 自体が無い環境 → ログだけで継続
-            logger.info("[paper=%s] cancel placeholder: %s", self.paper, order_id)
 
         # 台帳を減算（同一IDに対しては一度だけ作用）
         self._reduce_open_maker(order_id)
@@ -309,6 +346,15 @@ class ExecutionEngine:
         except Exception:
             pass
 
+    async def cancel_orders_safely(self, order_ids: list[str]) -> None:
+        """〔このメソッドがすること〕
+        複数の注文を cancel_order_safely で同時に取り消します（待ち時間は RTT の合計ではなく最大分）。
+        """
+        ids = [oid for oid in order_ids if oid]
+        if not ids:
+            return
+        await asyncio.gather(*(self.cancel_order_safely(oid) for oid in ids), return_exceptions=True)
+
     async def time_stop_after(self, ms: int) -> None:
         """〔このメソッドがすること〕
         指定ミリ秒だけ待ってから **IOC で即時クローズ**します（Time‑Stop）。
@@ -344,9 +390,8 @@ class ExecutionEngine:
         # Hyperliquid の HTTP アダプタでは明示的に iceberg フラグを受け付けるため、
         # display_size を指定する場合は True を渡して互換性を保つ。
         payload["iceberg"] = True
-        try:
-            from hl_core.api.http import place_order  # type: ignore
-        except Exception:
+        place_order = _api_place_order
+        if place_order is None:
             oid = f"paper-{side}-{int(time.time()*1000)}-{abs(hash((price,total)))%10000}"
             logger.info("[paper=%s] post_only_iceberg placeholder: %s -> %s", self.paper, payload, oid)
             return oid
@@ -366,19 +411,19 @@ class ExecutionEngine:
         """
         if not order_ids:
             return
-        try:
-            from hl_core.api.http import cancel_order  # type: ignore
-        except Exception:
+        cancel_orders = _api_cancel_orders
+        if cancel_orders is None:
             # API が無い環境ではログだけ
             for oid in order_ids:
                 logger.info("[paper=%s] cancel placeholder: %s", self.paper, oid)
             return
 
-        for oid in order_ids:
+        # 〔このブロックがすること〕 1 件ずつの往復をやめ、_CANCEL_CHUNK 件ずつ 1 リクエストで取り消す
+        for i in range(0, len(order_ids), _CANCEL_CHUNK):
             try:
-                await cancel_order(self.symbol, oid)  # type: ignore[misc]
+                await cancel_orders(self.symbol, order_ids[i : i + _CANCEL_CHUNK])  # type: ignore[misc]
             except Exception as e:
-                logger.debug("cancel_order failed (ignored): %s", e)
+                logger.debug("cancel_orders failed (ignored): %s", e)
 
     def _reduce_open_maker(self, order_id: str) -> None:
         """〔このメソッドがすること〕
@@ -398,6 +443,9 @@ class ExecutionEngine:
         Strategy の fills ループから呼ぶ想定です。
         """
         self._reduce_open_maker(order_id)
+        fut = self._fill_waiters.pop(str(order_id), None)
+        if fut is not None and not fut.done():
+            fut.set_result(None)
         try:
             if self.on_order_event:
                 self.on_order_event(
@@ -11,7 +11,6 @@
 
 from __future__ import annotations
 
-import statistics
 import time
 from collections import deque
 from dataclasses import dataclass
@@ -19,6 +18,8 @@ from typing import Deque, Optional, Tuple
 
 import logging
 
+from .rolling_median import RollingMedian
+
 logger = logging.getLogger("bots.vrlg.risk")
 
 
@@ -57,7 +58,10 @@ class RiskManager:
         # 内部状態
         self._impact_events: Deque[Tuple[float, float]] = deque()  # (ts, display/TopDepth)
         self._slip_events: Deque[Tuple[float, float]] = deque()  # (ts, slip_ticks)
-        self._block_intervals: Deque[float] = deque(maxlen=self._block_median_len)
+        # 窓内の値の合計（追加/トリムのたびに増減し、advice() ごとの全件 sum を省く）
+        self._impact_sum: float = 0.0
+        self._slip_sum: float = 0.0
+        self._block_window = RollingMedian(self._block_median_len)
         self._killswitch: bool = False
         self._pause_until: float = 0.0
         self._stopouts: Deque[float] = deque()  # 損切りの発生時刻列（register_stopout で使用）
@@ -69,9 +73,10 @@ class RiskManager:
         ブロック間隔（秒）を記録し、移動中央値がしきい値を超えたら kill‑switch を有効化します。
         """
         try:
-            self._block_intervals.append(max(0.0, float(interval_s)))
-            if len(self._block_intervals) >= max(5, int(self._block_median_len * 0.6)):
-                med = statistics.median(self._block_intervals)
+            window = self._block_window
+            window.push(max(0.0, float(interval_s)))
+            if len(window) >= max(5, int(self._block_median_len * 0.6)):
+                med = window.median()
                 if med > self.block_interval_stop_s:
                     if not self._killswitch:
                         logger.warning(
@@ -91,9 +96,10 @@ class RiskManager:
         """
         if display_size <= 0 or top_depth <= 0:
             return
-        frac = float(display_size) / float(top_depth)
+        frac = max(0.0, float(display_size) / float(top_depth))
         now = time.time()
-        self._impact_events.append((now, max(0.0, frac)))
+        self._impact_events.append((now, frac))
+        self._impact_sum += frac
         self._trim_impacts(now)
 
     def register_fill(self, fill_price: float, ref_mid: float, tick_size: float) -> None:
@@ -104,7 +110,8 @@ class RiskManager:
             return
         slip = abs(float(fill_price) - float(ref_mid)) / float(tick_size)
         now = time.time()
-        self._slip_events.append((now, float(slip)))
+        self._slip_events.append((now, slip))
+        self._slip_sum += slip
         self._trim_slips(now)
 
     def register_stopout(self) -> None:
@@ -186,7 +193,7 @@ class RiskManager:
         if now is None:
             now = time.time()
         self._trim_impacts(now)
-        return float(sum(x for _, x in self._impact_events))
+        return self._impact_sum
 
     # ─────────────── 内部ユーティリティ ───────────────
 
@@ -195,16 +202,22 @@ class RiskManager:
         if now is None:
             now = time.time()
         limit = float(now) - float(self._impact_window_s)
-        while self._impact_events and self._impact_events[0][0] < limit:
-            self._impact_events.popleft()
+        events = self._impact_events
+        while events and events[0][0] < limit:
+            self._impact_sum -= events.popleft()[1]
+        if not events:
+            self._impact_sum = 0.0  # 減算の丸め誤差を空になるたびに捨てる
 
     def _trim_slips(self, now: Optional[float] = None) -> None:
         """〔この関数がすること〕 滑りイベントを 60 秒窓にトリムします。"""
         if now is None:
             now = time.time()
         limit = float(now) - float(self._slip_window_s)
-        while self._slip_events and self._slip_events[0][0] < limit:
-            self._slip_events.popleft()
+        events = self._slip_events
+        while events and events[0][0] < limit:
+            self._slip_sum -= events.popleft()[1]
+        if not events:
+            self._slip_sum = 0.0  # 減算の丸め誤差を空になるたびに捨てる
 
     def _slip_avg(self, now: Optional[float] = None) -> Optional[float]:
         """〔この関数がすること〕 1 分窓の平均滑り（ticks）を返します（データ無しなら None）。"""
@@ -213,5 +226,4 @@ class RiskManager:
         self._trim_slips(now)
         if not self._slip_events:
             return None
-        s = sum(x for _, x in self._slip_events)
-        return float(s / len(self._slip_events))
+        return self._slip_sum / len(self._slip_events)
@@ -0,0 +1,54 @@
+# 〔このモジュールがすること〕
+# 固定長の移動窓に入った値の中央値を、毎回のソートなしで返す小さな部品です。
+# SignalDetector（DoB の中央値）と RiskManager（ブロック間隔の移動中央値）が共有します。
+
+from __future__ import annotations
+
+import bisect
+from collections import deque
+from typing import Deque
+
+
+class RollingMedian:
+    """〔このクラスがすること〕
+    maxlen 付き deque を固定長リングとして値を保持し、同じ値を昇順で持つ写しから中央値を添字で引きます。
+    """
+
+    __slots__ = ("values", "sorted")
+
+    def __init__(self, maxlen: int) -> None:
+        """〔このメソッドがすること〕 窓長 maxlen（1 以上）の空の窓を作ります。"""
+        self.values: Deque[float] = deque(maxlen=max(1, int(maxlen)))
+        # values と同じ値を昇順で持つ写し
+        self.sorted: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float) -> None:
+        """〔この関数がすること〕 値をリングと昇順の写しへ追加し、押し出された古い値を写しからも外します。"""
+        hist = self.values
+        arr: list[float] | None = self.sorted
+        if len(hist) == hist.maxlen:
+            old = hist[0]
+            i = bisect.bisect_left(arr, old)
+            if i < len(arr) and arr[i] == old:
+                del arr[i]
+            else:
+                arr = None  # NaN 等で写しと一致しない → 追加後に作り直す
+        hist.append(value)
+        if arr is None or len(arr) + 1 != len(hist):
+            self.sorted = sorted(hist)
+        else:
+            bisect.insort(arr, value)
+
+    def median(self) -> float:
+        """〔この関数がすること〕 窓内の値の中央値を返します（空なら 0）。"""
+        arr = self.sorted
+        n = len(arr)
+        if n == 0:
+            return 0.0
+        k = n // 2
+        if n % 2 == 1:
+            return float(arr[k])
+        return float(0.5 * (arr[k - 1] + arr[k]))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import math
 import time
+from operator import mul
 from collections import deque
 from dataclasses import dataclass
 from typing import Deque, Optional, Tuple
@@ -10,6 +11,8 @@ import logging
 
 logger = logging.getLogger("bots.vrlg.rotation")
 
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)  # 〔この定数がすること〕 正規分布の p 値で毎回 sqrt(2) を計算し直さない
+
 
 @dataclass
 class RotationEstimation:
@@ -36,11 +39,14 @@ def _pearson_corr(a: list[float], b: list[float]) -> float:
         return 0.0
     ma = sum(a) / n
     mb = sum(b) / n
-    va = sum((x - ma) ** 2 for x in a)
-    vb = sum((y - mb) ** 2 for y in b)
+    # 偏差を 1 回だけ作り、積和は map(mul, ...) で C 側のループに任せる（添字アクセスの Python ループを避ける）
+    da = [x - ma for x in a]
+    db = [y - mb for y in b]
+    va = sum(map(mul, da, da))
+    vb = sum(map(mul, db, db))
     if va <= 0.0 or vb <= 0.0:
         return 0.0
-    cov = sum((a[i] - ma) * (b[i] - mb) for i in range(n))
+    cov = sum(map(mul, da, db))
     return cov / math.sqrt(va * vb)
 
 
@@ -50,7 +56,7 @@ def _normal_sf(x: float) -> float:
     p = 1 - Phi(x) ≒ 0.5 * erfc(x / sqrt(2))
     """
 
-    return 0.5 * math.erfc(x / math.sqrt(2.0))
+    return 0.5 * math.erfc(x * _INV_SQRT2)
 
 
 def _welch_t_onesided(mean_a: float, var_a: float, n_a: int,
@@ -71,7 +77,8 @@ def _welch_t_onesided(mean_a: float, var_a: float, n_a: int,
         return 1.0
     t = (mean_a - mean_b) / se
     if alt == "a<b":
-        return 1.0 - (0.5 * math.erfc(t / math.sqrt(2.0)))
+        # 左側 p = Phi(t) = sf(-t)。1 - sf(t) の引き算（p が小さいときの桁落ち）を避ける
+        return _normal_sf(-t)
     else:
         return _normal_sf(t)
 
@@ -223,7 +230,8 @@ class RotationDetector:
             if not xs:
                 return 0.0, 0.0
             m = sum(xs) / len(xs)
-            v = sum((x - m) ** 2 for x in xs) / max(1, len(xs) - 1)
+            dx = [x - m for x in xs]
+            v = sum(map(mul, dx, dx)) / max(1, len(xs) - 1)
             return m, v
 
         m_on_d, v_on_d = _mean_var(on_dob)
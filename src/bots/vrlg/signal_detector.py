@@ -1,15 +1,14 @@
 from __future__ import annotations
 
-import statistics
-from collections import deque
+import os
 from dataclasses import dataclass
-from typing import Callable, Deque, Optional
-from uuid import uuid4
+from typing import Callable, Optional
 
 
 import logging
 
 from .data_feed import FeatureSnapshot
+from .rolling_median import RollingMedian
 
 logger = logging.getLogger("bots.vrlg.signal")
 
@@ -24,6 +23,12 @@ class Signal:
 
 
 
+def _new_trace_id() -> str:
+    """〔この関数がすること〕 12 桁の 16 進相関IDを返します（UUID オブジェクトを作らず 6 バイトの乱数だけ使う）。"""
+
+    return os.urandom(6).hex()
+
+
 def _get(section: object, key: str, default):
     """〔この関数がすること〕 設定が dict/オブジェクトいずれでも値を安全に取り出します。"""
 
@@ -62,37 +67,22 @@ class SignalDetector:
         self.z: float = float(_get(sig, "z", 0.6))
         self.obi_limit: float = float(_get(sig, "obi_limit", 0.6))
 
-        # DoB の中央値計算用バッファ
-        self._dob_hist: Deque[float] = deque(maxlen=max(1, self.N))
+        # DoB の中央値計算用の移動窓（直近 N 件）
+        self._dob_window = RollingMedian(self.N)
 
         # ゲート評価通知（Step39 で Strategy に配線）
         self.on_gate_eval: Optional[Callable[[dict], None]] = None
 
-    def _median_dob(self) -> float:
-        """〔この関数がすること〕 DoB 履歴の中央値を返します（空なら 0）。"""
-
-        if not self._dob_hist:
-            return 0.0
-        try:
-            return float(statistics.median(self._dob_hist))
-        except Exception:
-            arr = sorted(self._dob_hist)
-            n = len(arr)
-            k = n // 2
-            if n % 2 == 1:
-                return float(arr[k])
-            return float(0.5 * (arr[k - 1] + arr[k]))
-
     def update_and_maybe_signal(self, t: float, features: FeatureSnapshot) -> Optional[Signal]:
         """〔このメソッドがすること〕
         特徴量を 1 つ受け取り、4 条件ゲートを評価します。成立したら Signal を返します。
         """
 
         # DoB 履歴を更新（最新を末尾へ）
-        self._dob_hist.append(float(features.dob))
+        self._dob_window.push(float(features.dob))
 
         # しきい値の前計算
-        med_dob = self._median_dob()
+        med_dob = self._dob_window.median()
         dob_thin = False if med_dob <= 0.0 else (float(features.dob) < med_dob * (1.0 - self.x))
         spread_ok = float(features.spread_ticks) >= self.y
         obi_ok = abs(float(features.obi)) <= self.obi_limit
@@ -122,6 +112,6 @@ class SignalDetector:
 
         # 4 条件の同時成立
         if phase_gate and dob_thin and spread_ok and obi_ok:
-            return Signal(t=float(t), mid=float(features.mid), trace_id=uuid4().hex[:12])
+            return Signal(t=float(t), mid=float(features.mid), trace_id=_new_trace_id())
 
         return None
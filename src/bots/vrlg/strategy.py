@@ -10,6 +10,7 @@ import contextlib  # 〔この import がすること〕 タイマータスク
 import signal
 import sys
 import time  # 〔この import がすること〕 ブロック間隔の計算（秒）に使用します
+from collections import OrderedDict
 from typing import Optional
 
 # uvloop があれば高速化（なくても動く）
@@ -53,6 +54,9 @@ def load_config(path: str):
 
 logger = logging.getLogger("bots.vrlg")
 
+# 〔この定数がすること〕 order_id → trace_id 対応表の上限件数（cancel が届かなかった注文は古い順に捨てる）
+_ORDER_TRACE_MAX = 1024
+
 
 class VRLGStrategy:
     """〔このクラスがすること〕
@@ -113,7 +117,9 @@ class VRLGStrategy:
 
         # 〔この属性がすること〕直近の特徴量を保持し、発注時に板消費率などの参照に使います。
         self._last_features: Optional[FeatureSnapshot] = None
-        self._order_trace: dict[str, str] = {}  # 〔この行がすること〕 order_id → trace_id の対応を保持して、fills で trace_id を引けるようにする
+        # 〔この属性がすること〕 _last_features が更新されたことを待ち手へ知らせ、スプレッド監視をポーリング無しにします。
+        self._features_updated = asyncio.Event()
+        self._order_trace: "OrderedDict[str, str]" = OrderedDict()  # 〔この行がすること〕 order_id → trace_id の対応を保持して、fills で trace_id を引けるようにする
 
         # 〔この属性がすること〕: 各コンポーネントの実体を生成し司令塔に保持します。
         self.rot = RotationDetector(self.cfg)
@@ -144,6 +150,10 @@ class VRLGStrategy:
         self._tasks.append(asyncio.create_task(self._fills_loop(), name="fills_loop"))
         # 〔この行がすること〕 ブロックWS監視ループを起動して、ブロック間隔→Risk/Metrics/DecisionLogへ反映する
         self._tasks.append(asyncio.create_task(self._blocks_loop(), name="blocks_loop"))
+        # 〔この行がすること〕 live では口座残高を別タスクで定期取得し、発注ループは取得済みの値を読むだけにする
+        equity_refresh_s = float(getattr(self.cfg.exec, "equity_refresh_s", 0.0))
+        if not self.paper and equity_refresh_s > 0.0:
+            self._tasks.append(asyncio.create_task(self._equity_loop(equity_refresh_s), name="equity_loop"))
 
     async def _signal_loop(self) -> None:
         """〔このメソッドがすること〕
@@ -157,6 +167,7 @@ class VRLGStrategy:
                 phase = float(self.rot.current_phase(float(feat.t)))
                 feat = feat.with_phase(phase)
                 self._last_features = feat  # 〔この行がすること〕 スプレッド監視や滑り計算で使うため最新スナップショットを保存
+                self._features_updated.set()  # 〔この行がすること〕 スプレッド縮小を待っている発注ループを起こす
                 # 〔このブロックがすること〕 特徴量の「鮮度」を計算し、メトリクス更新＆しきい値超過なら処理をスキップします
                 now_ts = time.time()
                 feat_ts = float(feat.t)
@@ -187,21 +198,17 @@ class VRLGStrategy:
                     )
                 except Exception:
                     logger.debug("metrics.set_rotation_quality failed (ignored)")
-                try:
-                    self.metrics.set_active(bool(self.rot.is_active()))
-                except Exception:
-                    logger.debug("metrics.set_active failed (ignored)")
-                if not self.rot.is_active():
+                # 〔この行がすること〕 Metrics の各メソッドは内部で例外を握り潰すので、呼び出し側では包まない
+                active = bool(self.rot.is_active())
+                self.metrics.set_active(active)
+                if not active:
                     continue
                 phase = float(self.rot.current_phase(float(feat.t)))
                 feat = feat.with_phase(phase)
-                self.exe.set_period_hint(self.rot.current_period() or 1.0)
+                period = float(self.rot.current_period() or 1.0)
+                self.exe.set_period_hint(period)
                 # 〔この行がすること〕 推定R*に基づくクールダウン窓（秒）を Gauge に反映します
-                try:
-                    period = float(self.rot.current_period() or 1.0)
-                    self.metrics.set_cooldown(self.exe.cooldown_factor * period)
-                except Exception:
-                    logger.debug("metrics.set_cooldown failed (ignored)")
+                self.metrics.set_cooldown(self.exe.cooldown_factor * period)
 
                 sig = self.sigdet.update_and_maybe_signal(float(feat.t), feat)
                 if sig:
@@ -237,13 +244,10 @@ class VRLGStrategy:
             pass
 
         # 〔このブロックがすること〕 "reject"/"cancel" の件数をメトリクスへ加算（運用監視用）
-        try:
-            if kind == "reject":
-                self.metrics.inc_orders_rejected(1)
-            elif kind == "cancel":
-                self.metrics.inc_orders_canceled(1)
-        except Exception:
-            pass
+        if kind == "reject":
+            self.metrics.inc_orders_rejected(1)
+        elif kind == "cancel":
+            self.metrics.inc_orders_canceled(1)
 
 
         # 〔このブロックがすること〕 open_maker_btc が含まれていれば Gauge を更新
@@ -270,7 +274,11 @@ class VRLGStrategy:
                 oid = str(fields.get("order_id", "") or "")
                 tid = fields.get("trace_id")
                 if oid and tid:
-                    self._order_trace[oid] = str(tid)
+                    order_trace = self._order_trace
+                    order_trace[oid] = str(tid)
+                    # 〔この行がすること〕 長時間稼働で表が際限なく育たないよう、上限を超えたら最古の対応を捨てる
+                    if len(order_trace) > _ORDER_TRACE_MAX:
+                        order_trace.popitem(last=False)
             elif kind == "cancel":
                 oid = str(fields.get("order_id", "") or "")
                 if oid:
@@ -316,10 +324,7 @@ class VRLGStrategy:
         except Exception:
             pass
         # Active を 0 に（監視用）
-        try:
-            self.metrics.set_active(False)
-        except Exception:
-            pass
+        self.metrics.set_active(False)
         # 戦略停止フラグ
         self._stopping.set()
 
@@ -415,11 +420,8 @@ class VRLGStrategy:
             slip_ticks = 0.0 if tick <= 0 else abs(price - ref_mid) / tick
 
             # メトリクス：滑り観測 + 件数カウント
-            try:
-                self.metrics.observe_slippage(slip_ticks)
-                self.metrics.inc_fills(1)
-            except Exception:
-                logger.debug("metrics.observe_slippage/inc_fills failed (ignored)")
+            self.metrics.observe_slippage(slip_ticks)
+            self.metrics.inc_fills(1)
 
             # リスク：滑りを登録（1分平均の監視などに利用）
             try:
@@ -480,10 +482,7 @@ class VRLGStrategy:
                     self.risk.update_block_interval(interval)
                 except Exception:
                     logger.debug("risk.update_block_interval failed (ignored)")
-                try:
-                    self.metrics.observe_block_interval_ms(interval)
-                except Exception:
-                    logger.debug("metrics.observe_block_interval_ms failed (ignored)")
+                self.metrics.observe_block_interval_ms(interval)
                 try:
                     self.decisions.log("block_interval", interval_s=float(interval))
                 except Exception:
@@ -499,24 +498,75 @@ class VRLGStrategy:
 
             prev_ts = ts
 
-    async def _wait_spread_collapse(self, threshold_ticks: float, timeout_s: float, poll_s: float = 0.02) -> bool:
+    async def _equity_loop(self, interval_s: float) -> None:
+        """〔このメソッドがすること〕
+        口座残高（marginSummary.accountValue）を interval_s ごとにスレッドで取得し、SizeAllocator へ注入します。
+        Info は最初に 1 回だけ作り、発注ループは REST の往復を待たずに最新の残高でサイズを決められます。
+        """
+        try:
+            from hl_core.config import load_settings  # type: ignore
+            from hl_core.hl_client import make_clients  # type: ignore
+        except Exception as e:
+            logger.warning("account API not available: %s; equity_loop idle.", e)
+            return
+        try:
+            info, _exchange, address = await asyncio.to_thread(make_clients, load_settings())
+        except Exception as e:
+            logger.warning("account client init failed: %s; equity_loop idle.", e)
+            return
+        user_state = getattr(info, "user_state", None)
+        if not address or not callable(user_state):
+            logger.warning("account address/user_state unavailable; equity_loop idle.")
+            return
+
+        while not self._stopping.is_set():
+            try:
+                state = await asyncio.to_thread(user_state, address)
+                equity = float(((state or {}).get("marginSummary") or {})["accountValue"])
+                self.sizer.update_equity_usd(equity)
+            except Exception as e:
+                logger.debug("equity refresh failed (kept previous): %s", e)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _wait_spread_collapse(self, threshold_ticks: float, timeout_s: float) -> bool:
         """〔このメソッドがすること〕
         直近スナップショットの spread_ticks が threshold 以下になるまで待ちます。
+        新しい特徴量が届いたときだけ判定し直します（固定間隔のポーリングはしません）。
         timeout_s を過ぎたら False。停止フラグが立っても False を返します。
         """
 
-        t0 = time.time()
-        while (time.time() - t0) < float(timeout_s):
+        loop_time = asyncio.get_running_loop().time
+        deadline = loop_time() + float(timeout_s)
+        updated = self._features_updated
+        thr = float(threshold_ticks)
+        while True:
             if self._stopping.is_set():
                 return False
+            # 〔この行がすること〕 判定より先に clear し、判定直後に届いた更新を取りこぼさない
+            updated.clear()
             snap = self._last_features
-            if snap is not None and float(getattr(snap, "spread_ticks", 1e9)) <= float(threshold_ticks):
+            if snap is not None and float(getattr(snap, "spread_ticks", 1e9)) <= thr:
                 return True
+            remaining = deadline - loop_time()
+            if remaining <= 0.0:
+                return False
+            # 〔この行がすること〕 特徴量の更新か停止のどちらか早い方で起きる（停止時は待ち切らずに抜ける）
+            waiters = {
+                asyncio.ensure_future(updated.wait()),
+                asyncio.ensure_future(self._stopping.wait()),
+            }
             try:
-                await asyncio.sleep(max(0.0, float(poll_s)))
-            except Exception:
-                break
-        return False
+                done, _ = await asyncio.wait(
+                    waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                for w in waiters:
+                    w.cancel()
+            if not done:
+                return False
 
     async def _exec_loop(self) -> None:
         """〔このメソッドがすること〕
@@ -556,8 +606,11 @@ class VRLGStrategy:
                 # 逆指値（Reduce‑Only の STOP）を両方向に“仮置き”し、Time‑Stop 終了後に自動で片付けます。
                 stop_ticks = float(getattr(self.cfg.risk, "stop_ticks", 3))
                 stop_ids: list[str] = []
-                sid_buy = await self.exe.place_reverse_stop("BUY", sig.mid, stop_ticks)
-                sid_sell = await self.exe.place_reverse_stop("SELL", sig.mid, stop_ticks)
+                # 〔この行がすること〕 両翼の STOP を同時に出し、往復待ちを 1 回分にする
+                sid_buy, sid_sell = await asyncio.gather(
+                    self.exe.place_reverse_stop("BUY", sig.mid, stop_ticks),
+                    self.exe.place_reverse_stop("SELL", sig.mid, stop_ticks),
+                )
                 for _sid in (sid_buy, sid_sell):
                     if _sid:
                         stop_ids.append(_sid)
@@ -569,8 +622,7 @@ class VRLGStrategy:
 
                     with contextlib.suppress(asyncio.CancelledError):
                         await ts_task
-                        for _sid in stop_ids:
-                            await self.exe.cancel_order_safely(_sid)
+                        await self.exe.cancel_orders_safely(stop_ids)
 
                 stops_cleanup_task = asyncio.create_task(_cleanup_stops_after_ts(), name="stops_cleanup")
 
@@ -597,8 +649,7 @@ class VRLGStrategy:
                 self.metrics.inc_orders_submitted(len(order_ids))  # 〔この行がすること〕 提示した注文（maker）の件数を加算
 
                 async def _cancel_stops_and_timers() -> None:
-                    for _sid in stop_ids:
-                        await self.exe.cancel_order_safely(_sid)
+                    await self.exe.cancel_orders_safely(stop_ids)
                     if not ts_task.done():
                         ts_task.cancel()
                         with contextlib.suppress(asyncio.CancelledError):
@@ -619,7 +670,6 @@ class VRLGStrategy:
                 collapsed = await self._wait_spread_collapse(
                     threshold_ticks=float(getattr(self.cfg.exec, "spread_collapse_ticks", 1.0)),
                     timeout_s=ttl_s,
-                    poll_s=0.02,
                 )
                 # 〔このブロックがすること〕 forbid_market の場合は早期IOCをスキップする旨を先に記録（TTL へフォールバック）
                 if collapsed and adv.forbid_market:
@@ -639,35 +689,31 @@ class VRLGStrategy:
                 else:
                     if collapsed and not adv.forbid_market:  # 〔この行がすること〕 forbid_market=True のときは早期IOCを行わず、TTL 処理へ回す
                         self.decisions.log("exit", reason="spread_collapse", trace_id=getattr(sig, "trace_id", None))  # 〔この行がすること〕 スプレッド縮小で早期IOCしたことを記録
-                        # 〔このブロックがすること〕 早期IOCでクローズしたので、保護用STOPを取り消し、Time‑Stopを中断する
-                        try:
-                            for _sid in stop_ids:
-                                await self.exe.cancel_order_safely(_sid)  # STOP注文の取消（reduce-only）
-                        except Exception:
-                            pass
+                        # 〔このブロックがすること〕 早期IOCでクローズしたので、Time‑Stopを中断し、保護用STOPを取り消す
                         try:
                             ts_task.cancel()  # Time‑Stopタスクを中断
                         except Exception:
                             pass
-                        # 先に maker を素早くキャンセルしてから IOC で解消
-                        await self.exe.wait_fill_or_ttl(order_ids, timeout_s=0.0)
+                        # 〔この行がすること〕 STOP の取消と maker の取消は互いに独立なので同時に送り、往復待ちを 1 回分にしてから IOC で解消
+                        await asyncio.gather(
+                            self.exe.cancel_orders_safely(stop_ids),  # STOP注文の取消（reduce-only）
+                            self.exe.wait_fill_or_ttl(order_ids, timeout_s=0.0),
+                        )
 
                         await self.exe.flatten_ioc()
                         await _cancel_stops_and_timers()
                     else:
                         self.decisions.log("exit", reason="ttl", trace_id=getattr(sig, "trace_id", None))  # 〔この行がすること〕 TTL 到達で通常解消したことを記録
-                        # 〔このブロックがすること〕 TTL到達でクローズしたので、保護用STOPを取り消し、Time‑Stopを中断する
-                        try:
-                            for _sid in stop_ids:
-                                await self.exe.cancel_order_safely(_sid)  # STOP注文の取消（reduce-only）
-                        except Exception:
-                            pass
+                        # 〔このブロックがすること〕 TTL到達でクローズしたので、Time‑Stopを中断し、保護用STOPを取り消す
                         try:
                             ts_task.cancel()  # Time‑Stopタスクを中断
                         except Exception:
                             pass
-                        # 縮小しなかった → TTL まで待って通常解消
-                        await self.exe.wait_fill_or_ttl(order_ids, timeout_s=remaining_ttl)
+                        # 縮小しなかった → TTL まで待って通常解消（STOP の取消は TTL 待ちと並行して送る）
+                        await asyncio.gather(
+                            self.exe.cancel_orders_safely(stop_ids),  # STOP注文の取消（reduce-only）
+                            self.exe.wait_fill_or_ttl(order_ids, timeout_s=remaining_ttl),
+                        )
 
                         await self.exe.flatten_ioc()
                         await _cancel_stops_and_timers()
@@ -692,6 +738,7 @@ class VRLGStrategy:
         await asyncio.gather(*self._tasks, return_exceptions=True)
         if self.exe:
             await self.exe.flatten_ioc()
+        self.decisions.close()  # 〔この行がすること〕 まとめ書き待ちの意思決定ログを書き出し、ファイルを閉じる
         logger.info("VRLG stopped.")
 
 
@@ -9,6 +9,8 @@ import anyio
 from typing import Awaitable, Callable, Any, Optional
 import ssl
 
+from hl_core.utils.json_compat import json_loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -162,9 +164,15 @@ class WSClient:
         if ws is None:
             return
 
-        async for raw in ws:  # noqa: E501  type: ignore[operator]
+        while True:
+            # テキストフレームも str に復号せず bytes のまま受け取り、JSON デコーダへ直接渡す
+            # （UTF-8 → str の変換を 1 回省く。orjson / json とも bytes を受け付ける）
+            try:
+                raw = await ws.recv(decode=False)
+            except websockets.ConnectionClosedOK:
+                return
             try:
-                msg = json.loads(raw)
+                msg = _json_loads(raw)
             except Exception as exc:
                 logger.warning("WS message decode error: %s (%s)", exc, raw[:120])
                 continue
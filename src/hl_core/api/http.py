@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import os
 import time
 from typing import Any, Dict, Optional, Tuple
@@ -15,8 +16,9 @@ from hl_core.utils.logger import get_logger
 logger = get_logger("hl_core.api.http")
 
 
+@functools.lru_cache(maxsize=64)
 def _base_coin(symbol: str) -> str:
-    """シンボルから基軸コイン（BTC/ETH 等）を抽出。"""
+    """シンボルから基軸コイン（BTC/ETH 等）を抽出（シンボルごとに 1 回だけ計算）。"""
     token = (symbol or "BTC").split("-", 1)[0].split("/", 1)[0]
     return (token[:-3] if token.endswith("USD") else token).upper() or "BTC"
 
@@ -180,6 +182,30 @@ async def cancel_order(
     raise RuntimeError("cancel_order live path is not implemented yet")
 
 
+async def cancel_orders(
+    symbol: str,
+    order_ids: list[str],
+    *,
+    paper: bool | None = None,
+    **extra: Any,
+) -> list[Dict[str, Any]]:
+    """複数の注文 ID を 1 リクエストでキャンセル（paper はログのみ）。"""
+
+    ids = [str(oid) for oid in order_ids if oid]
+    if not ids:
+        return []
+    logger.info("cancel_orders: try symbol=%s n=%d", symbol, len(ids))
+    settings = load_settings()
+    if paper or settings.dry_run:
+        logger.info(
+            "cancel_orders: ok symbol=%s order_ids=%s status=paper", symbol, ids
+        )
+        return [{"status": "paper", "order_id": oid} for oid in ids]
+
+    # Live は cancel_order と同じく未実装（安全のため拒否）
+    raise RuntimeError("cancel_orders live path is not implemented yet")
+
+
 async def flatten_ioc(symbol: str, *, paper: bool | None = None, **extra: Any) -> None:
     """全建玉を IOC でクローズ（paper はログのみ）。"""
 
@@ -231,7 +257,8 @@ async def _place_order_impl(
     # SDK（またはローカルスタブ）経由で発注
     from hl_core.hl_client import make_clients  # 遅延 import
 
-    _info, exchange, _addr = make_clients(settings)
+    # Info の初期化は meta 取得の同期 HTTP を伴うため、イベントループを塞がないようスレッドで行う
+    _info, exchange, _addr = await asyncio.to_thread(make_clients, settings)
     if exchange is None:  # pragma: no cover - 防御
         raise RuntimeError("Exchange の初期化に失敗しました")
 
@@ -261,4 +288,4 @@ async def _place_order_impl(
     }
 
 
-__all__ = ["place_order", "cancel_order", "flatten_ioc"]
+__all__ = ["place_order", "cancel_order", "cancel_orders", "flatten_ioc"]
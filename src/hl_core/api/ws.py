@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -13,6 +14,7 @@ from typing import Any, Dict, List
 import websockets
 
 from hl_core.config import load_settings
+from hl_core.utils.json_compat import json_loads as _json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,7 @@ def _ws_url() -> str:
     return _MAINNET_WSS if network == "mainnet" else _TESTNET_WSS
 
 
+@functools.lru_cache(maxsize=64)
 def _base_coin(symbol: str | None) -> str:
     if not symbol:
         return "BTC"
@@ -50,8 +53,13 @@ async def _ws_stream(subscription: Dict[str, Any]) -> AsyncGenerator[Dict[str, A
             async with websockets.connect(uri, ping_interval=20, ping_timeout=10) as ws:
                 await ws.send(json.dumps({"method": "subscribe", "subscription": subscription}))
                 backoff = 1.0
-                async for raw in ws:
-                    msg = json.loads(raw)
+                while True:
+                    # テキストフレームを str に復号せず bytes のままデコーダへ渡す
+                    try:
+                        raw = await ws.recv(decode=False)
+                    except websockets.ConnectionClosedOK:
+                        break
+                    msg = _json_loads(raw)
                     channel = msg.get("channel")
                     if channel in {"subscriptionResponse", "pong"}:
                         continue
@@ -96,7 +104,9 @@ async def subscribe_level2(symbol: str) -> AsyncIterator[Dict[str, Any]]:
         if msg.get("channel") != "l2Book":
             continue
         data = msg.get("data") or {}
-        if data.get("coin", "").upper() != coin:
+        c = data.get("coin", "")
+        # 取引所は大文字の coin を送ってくるので、一致すれば upper() を省く
+        if c != coin and c.upper() != coin:
             continue
         try:
             bids, asks = data.get("levels", ([{}], [{}]))
@@ -125,7 +135,8 @@ async def subscribe_trades(symbol: str) -> AsyncIterator[Dict[str, Any]]:
             continue
         trades = msg.get("data") or []
         for trade in trades:
-            if trade.get("coin", "").upper() != coin:
+            c = trade.get("coin", "")
+            if c != coin and c.upper() != coin:
                 continue
             try:
                 side = "BUY" if trade.get("side") == "A" else "SELL"
@@ -163,7 +174,8 @@ async def subscribe_fills(symbol: str, address: str | None = None) -> AsyncItera
         data = msg.get("data") or {}
         fills = data.get("fills", [])
         for fill in fills:
-            if fill.get("coin", "").upper() != coin:
+            c = fill.get("coin", "")
+            if c != coin and c.upper() != coin:
                 continue
             try:
                 price = float(fill.get("px"))
@@ -4,8 +4,13 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Final
 
+import ast
+import hashlib
 import importlib
+import importlib.util
 import json
+import os
+import pprint
 import tomllib
 
 
@@ -48,7 +53,9 @@ def load_config(path: str | Path) -> dict[str, Any]:
         except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
             raise ConfigError("pyyaml is required to load YAML configs") from exc
 
-        data = yaml.safe_load(text)  # type: ignore[attr-defined]
+        # libyaml があれば C 実装の CSafeLoader を使う（safe_load と同じ安全な型だけを作る）
+        loader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader  # type: ignore[attr-defined]
+        data = yaml.load(text, Loader=loader)  # type: ignore[attr-defined]
         if data is None:
             return {}
         if not isinstance(data, dict):
@@ -58,4 +65,72 @@ def load_config(path: str | Path) -> dict[str, Any]:
     raise ConfigError(f"unsupported config extension: {config_path.suffix}")
 
 
-__all__ = ["ConfigError", "load_config"]
+def compiled_config_path(path: str | Path) -> Path:
+    """Return the sibling ``<stem>_data.py`` path used for a compiled config."""
+    config_path = Path(path)
+    return config_path.with_name(f"{config_path.stem}_data.py")
+
+
+def compile_yaml_config(path: str | Path, out_path: str | Path | None = None) -> Path:
+    """Compile a YAML config into a Python module holding ``CONFIG`` as a literal.
+
+    The YAML stays the source of truth: the module records the SHA-256 of the
+    YAML bytes so :func:`load_compiled_config` can ignore it once stale.
+    The module is written to a temporary file and renamed, so readers never
+    see a partial file.
+    """
+    config_path = Path(path)
+    data = load_config(config_path)
+    literal = pprint.pformat(data, sort_dicts=False)
+    try:
+        ast.literal_eval(literal)
+    except (ValueError, SyntaxError) as exc:
+        raise ConfigError(f"config is not representable as a Python literal: {config_path}") from exc
+
+    digest = hashlib.sha256(config_path.read_bytes()).hexdigest()
+    target = Path(out_path) if out_path is not None else compiled_config_path(config_path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_text(
+        f'"""Generated from {config_path.name}; do not edit (regenerate instead)."""\n'
+        f"SOURCE_SHA256 = {digest!r}\n"
+        f"CONFIG = {literal}\n",
+        encoding="utf-8",
+    )
+    os.replace(tmp, target)
+    return target
+
+
+def load_compiled_config(path: str | Path) -> dict[str, Any] | None:
+    """Return ``CONFIG`` from the compiled sibling module if it matches the YAML.
+
+    Returns ``None`` when the module is missing, broken or generated from a
+    different revision of the YAML, so callers can fall back to parsing it.
+    """
+    config_path = Path(path)
+    module_path = compiled_config_path(config_path)
+    if not module_path.exists():
+        return None
+    try:
+        digest = hashlib.sha256(config_path.read_bytes()).hexdigest()
+        spec = importlib.util.spec_from_file_location(
+            f"_compiled_config_{digest[:16]}", module_path
+        )
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+    if getattr(module, "SOURCE_SHA256", None) != digest:
+        return None
+    data = getattr(module, "CONFIG", None)
+    return data if isinstance(data, dict) else None
+
+
+__all__ = [
+    "ConfigError",
+    "compile_yaml_config",
+    "compiled_config_path",
+    "load_compiled_config",
+    "load_config",
+]
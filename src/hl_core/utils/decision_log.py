@@ -1,13 +1,16 @@
 
 # 〔このモジュールがすること〕
 # Bot 横断で使える「意思決定イベントの1行JSONロガー」を提供します（リングバッファ + 任意のJSONL追記）。
+# JSONL への追記は行単位ではなく、件数（batch）か経過秒（flush_interval）でまとめて書き出します。
+# 出力ファイルは最初の書き出しで 1 回だけ開き、以後は開いたまま使います（終了時に閉じます）。
 
 from __future__ import annotations
 
+import atexit
 import json
 import time
 from collections import deque
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, TextIO
 
 from hl_core.utils.logger import get_logger
 
@@ -19,24 +22,81 @@ class DecisionLogger:
     意思決定イベントをリングバッファに蓄え、必要なら JSONL ファイルへ追記します。
     """
 
-    def __init__(self, maxlen: int = 10000, filepath: Optional[str] = None) -> None:
-        """〔このメソッドがすること〕 バッファ長と出力先（任意）を設定します。"""
+    def __init__(
+        self,
+        maxlen: int = 10000,
+        filepath: Optional[str] = None,
+        batch: int = 64,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """〔このメソッドがすること〕 バッファ長・出力先（任意）・まとめ書きの件数/間隔を設定します。"""
         self._buf: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
         self._path: Optional[str] = filepath
+        self._batch = max(1, int(batch))
+        self._flush_interval = float(flush_interval)
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._fh: Optional[TextIO] = None
+        # 〔この属性がすること〕 close 用の atexit フックを登録中か（書き出し待ちが出来たら登録し、close で外す）
+        self._atexit_hooked = False
 
     def log(self, event: str, **fields: Any) -> None:
         """〔このメソッドがすること〕
-        任意のキー/値を受け取り、{t,event,...} 形式で記録します。ファイル指定があれば追記します。
+        任意のキー/値を受け取り、{t,event,...} 形式で記録します。ファイル指定があれば書き出し待ちに積みます。
         """
         rec: Dict[str, Any] = {"t": time.time(), "event": str(event)}
         rec.update(fields)
         self._buf.append(rec)
         if self._path:
             try:
-                with open(self._path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                self._pending.append(json.dumps(rec, ensure_ascii=False) + "\n")
             except Exception as e:  # pragma: no cover
-                logger.debug("decision log write failed: %s", e)
+                logger.debug("decision log encode failed: %s", e)
+                return
+            if not self._atexit_hooked:
+                # 〔この行がすること〕 close し忘れてもプロセス終了時に未書き出しの行を残さず、ファイルを閉じる
+                atexit.register(self.close)
+                self._atexit_hooked = True
+            if (
+                len(self._pending) >= self._batch
+                or time.monotonic() - self._last_flush >= self._flush_interval
+            ):
+                self.flush()
+
+    def flush(self) -> None:
+        """〔このメソッドがすること〕 書き出し待ちの行を 1 回の write で JSONL に追記します（ファイルは開きっぱなし）。"""
+        self._last_flush = time.monotonic()
+        if not self._pending or not self._path:
+            return
+        lines, self._pending = self._pending, []
+        try:
+            fh = self._fh
+            if fh is None:
+                fh = self._fh = open(self._path, "a", encoding="utf-8")
+            fh.write("".join(lines))
+            fh.flush()
+        except Exception as e:  # pragma: no cover
+            logger.debug("decision log write failed: %s", e)
+            self._close_file()
+
+    def close(self) -> None:
+        """〔このメソッドがすること〕
+        書き出し待ちの行を追記してからファイルを閉じ、atexit フックを外します（以後このインスタンスを掴みません）。
+        """
+        self.flush()
+        self._close_file()
+        if self._atexit_hooked:
+            atexit.unregister(self.close)
+            self._atexit_hooked = False
+
+    def _close_file(self) -> None:
+        """〔このメソッドがすること〕 開いている出力ファイルを閉じます（次の書き出しで開き直します）。"""
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:  # pragma: no cover
+                pass
 
     def latest(self, n: int = 100) -> List[Dict[str, Any]]:
         """〔このメソッドがすること〕 直近 n 件の記録を返します（デバッグ用）。"""
@@ -0,0 +1,28 @@
+"""JSON helpers that use :mod:`orjson` when it is installed.
+
+``orjson`` is an optional speed-up for decoding WebSocket frames and encoding
+order payloads.  The import is attempted once here so callers do not repeat the
+try/except block; without it the standard :mod:`json` module is used.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+try:  # pragma: no cover - optional dependency
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+json_loads: Callable[[str | bytes], Any] = (
+    orjson.loads if orjson is not None else json.loads
+)
+
+
+def json_dumps(payload: Any) -> bytes:
+    """Return compact JSON as ``bytes`` (key order is preserved)."""
+
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
@@ -2,9 +2,7 @@
 from __future__ import annotations
 
 import copy
-import csv
 import datetime as _dt
-import io
 import logging
 from os import getenv
 from pathlib import Path
@@ -73,36 +71,58 @@ class _CsvFormatter(logging.Formatter):
     ) -> None:
         super().__init__(None, datefmt)
         self._fields = fields
+        # 役割: asctime を整数秒ごとに 1 回だけ整形して使い回す（同じ秒のログ行は同じ文字列になる）
+        self._asctime_cache: tuple[int, object, str] = (-1, None, "")
 
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
-        record = copy.copy(record)
-        record.message = record.getMessage()
-
+        # 役割: 1 行ごとの StringIO/csv.writer 生成とレコードの複製をやめ、フィールドを直接つないで 1 行を作る
+        message = record.getMessage()
+        record.message = message
         if record.exc_info and not record.exc_text:
             record.exc_text = self.formatException(record.exc_info)
-        if record.stack_info:
-            record.stack_info = self.formatStack(record.stack_info)
+        stack_text = self.formatStack(record.stack_info) if record.stack_info else None
 
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
         row: list[str] = []
         for field in self._fields:
             if field == "asctime":
-                row.append(self.formatTime(record, self.datefmt))
+                value = self._asctime(record)
             elif field == "message":
-                row.append(record.message)
+                value = message
             else:
-                value = getattr(record, field, "")
-                row.append(str(value) if value is not None else "")
-        writer.writerow(row)
-        output = buffer.getvalue().rstrip("\r\n")
+                raw = getattr(record, field, "")
+                value = str(raw) if raw is not None else ""
+            row.append(_csv_field(value))
+        output = ",".join(row)
 
         if record.exc_text:
             output = f"{output}\n{record.exc_text}"
-        if record.stack_info:
-            output = f"{output}\n{record.stack_info}"
+        if stack_text:
+            output = f"{output}\n{stack_text}"
         return output
 
+    def _asctime(self, record: logging.LogRecord) -> str:
+        """datefmt は秒までしか出さないので、整数秒と converter が同じ間は前回の文字列を返す。"""
+        if not self.datefmt:
+            return self.formatTime(record, self.datefmt)
+        created = record.created
+        sec = int(created)
+        converter = self.converter
+        cached_sec, cached_conv, text = self._asctime_cache
+        if sec == cached_sec and converter is cached_conv:
+            return text
+        text = _time.strftime(self.datefmt, converter(created))
+        self._asctime_cache = (sec, converter, text)
+        return text
+
+
+def _csv_field(value: str) -> str:
+    """csv.writer（excel 方言, QUOTE_MINIMAL）と同じ規則で 1 フィールドを引用する。"""
+    if '"' in value:
+        return '"' + value.replace('"', '""') + '"'
+    if "," in value or "\n" in value or "\r" in value:
+        return '"' + value + '"'
+    return value
+
 
 def create_csv_formatter(*, include_logger_name: bool = True) -> logging.Formatter:
     fields = (
@@ -111,23 +131,145 @@ def create_csv_formatter(*, include_logger_name: bool = True) -> logging.Formatt
     return _CsvFormatter(fields=fields, datefmt="%Y-%m-%d %H:%M:%S")
 
 
+# ────────────────────────────────────────────────────────────
+# ファイル書き込みをバックグラウンドスレッドへ逃がすハンドラ
+# ────────────────────────────────────────────────────────────
+class _FanoutListener(logging.handlers.QueueListener):
+    """flush 用の目印レコードを受けたら、配信先を flush して待ち手へ知らせる QueueListener."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        done = getattr(record, "_hl_flush_done", None)
+        if done is not None:
+            for handler in self.handlers:
+                try:
+                    handler.flush()
+                except Exception:  # pragma: no cover
+                    pass
+            done.set()
+            return
+        super().handle(record)
+
+
+class QueuedFileFanoutHandler(logging.handlers.QueueHandler):
+    """
+    1 つのキューに積むだけの QueueHandler。QueueListener のスレッドが
+    登録済みの複数ファイルハンドラ（シンボル別 CSV など）へ配る。
+
+    ファイルごとにキューを持たせると、ログ 1 件ごとにレコード複製とキュー投入が
+    ファイル数だけ走るため、それを 1 回にまとめる。
+    """
+
+    def __init__(self) -> None:
+        super().__init__(queue.SimpleQueue())
+        self._files: dict[str, logging.Handler] = {}
+        self._listener: logging.handlers.QueueListener | None = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 引数は呼び出し後に変わり得るので、メッセージはここで確定させる
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                formatter = self.formatter or logging.Formatter()
+                record.exc_text = formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def has_file(self, filename: str) -> bool:
+        return filename in self._files
+
+    def files(self) -> tuple[logging.Handler, ...]:
+        return tuple(self._files.values())
+
+    def add_file(self, handler: logging.Handler) -> bool:
+        """ファイルハンドラを配信先に加える（baseFilename が既にあれば何もしない）。"""
+        key = str(getattr(handler, "baseFilename", id(handler)))
+        if key in self._files:
+            return False
+        self._files[key] = handler
+        self._restart()
+        return True
+
+    def remove_file(self, filename: str) -> None:
+        handler = self._files.pop(filename, None)
+        if handler is None:
+            return
+        self._restart()
+        try:
+            handler.close()
+        except Exception:  # pragma: no cover
+            pass
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """キューに残ったレコードを書き切るまで待つ（止まっているリスナは再開しない）。"""
+        listener = self._listener
+        if listener is None:
+            return
+        # 目印を積み、リスナがそこまで処理して配信先を flush したら戻る
+        done = threading.Event()
+        self.queue.put_nowait(logging.makeLogRecord({"_hl_flush_done": done}))
+        done.wait(timeout)
+
+    def _restart(self) -> None:
+        listener = self._listener
+        self._listener = None
+        if listener is not None:
+            listener.stop()  # 停止前に積まれた分は書き切られる
+        if self._files:
+            self._listener = _FanoutListener(
+                self.queue, *self._files.values(), respect_handler_level=True
+            )
+            self._listener.start()
+
+    def close(self) -> None:
+        listener = self._listener
+        self._listener = None
+        if listener is not None:
+            try:
+                listener.stop()
+            except Exception:  # pragma: no cover
+                pass
+        for handler in self._files.values():
+            try:
+                handler.close()
+            except Exception:  # pragma: no cover
+                pass
+        self._files.clear()
+        super().close()
+
+
 # ────────────────────────────────────────────────────────────
 # Discord 送信用ハンドラ（エラー以上のみを送る想定）
 # ────────────────────────────────────────────────────────────
 class DiscordHandler(logging.Handler):
-    """非同期キュー経由で Discord Webhook に送信するハンドラ."""
+    """非同期キュー経由で Discord Webhook に送信するハンドラ.
 
-    def __init__(self, webhook_url: str, level: int = logging.ERROR) -> None:
+    キューは maxsize 件で頭打ちにし、溢れたら古い通知を捨てて新しい通知を残す
+    （障害時にエラーが連発しても、メモリを食い続けたり発注側を待たせたりしない）。
+    """
+
+    def __init__(
+        self, webhook_url: str, level: int = logging.ERROR, maxsize: int = 128
+    ) -> None:
         super().__init__(level)
         self._webhook_url = webhook_url
-        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=maxsize)
         self._thread = threading.Thread(target=self._worker, daemon=True)
         self._thread.start()
 
     def emit(self, record: logging.LogRecord) -> None:  # noqa: D401
         try:
             msg = self.format(record)
-            self._queue.put_nowait(msg)
+            while True:
+                try:
+                    self._queue.put_nowait(msg)
+                    return
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()  # 最古を捨てて最新を優先
+                    except queue.Empty:
+                        pass
         except Exception:  # pragma: no cover
             self.handleError(record)
 
@@ -0,0 +1,36 @@
+# tests/unit/test_config.py
+from pathlib import Path
+
+from hl_core.utils.config import (
+    compile_yaml_config,
+    compiled_config_path,
+    load_compiled_config,
+    load_config,
+)
+
+
+def test_compiled_config_matches_yaml_and_goes_stale(tmp_path: Path) -> None:
+    yml = tmp_path / "config.yaml"
+    yml.write_text(
+        "threshold: 0.3\nmode: both\nfunding_guard:\n  enabled: false\n  buffer_sec: 180\n",
+        encoding="utf-8",
+    )
+    assert load_compiled_config(yml) is None
+
+    out = compile_yaml_config(yml)
+    assert out == compiled_config_path(yml) == tmp_path / "config_data.py"
+    assert load_compiled_config(yml) == load_config(yml)
+
+    # YAML を編集したら再生成されるまで使わない
+    yml.write_text("threshold: 0.5\n", encoding="utf-8")
+    assert load_compiled_config(yml) is None
+
+
+def test_compile_yaml_config_leaves_no_temp_file(tmp_path: Path) -> None:
+    yml = tmp_path / "config.yaml"
+    yml.write_text("threshold: 0.3\n", encoding="utf-8")
+
+    out = compile_yaml_config(yml)
+
+    assert load_compiled_config(yml) == {"threshold": 0.3}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.yaml", out.name]
@@ -0,0 +1,55 @@
+import json
+
+import hl_core.utils.decision_log as decision_log
+from hl_core.utils.decision_log import DecisionLogger
+
+
+def test_decision_logger_batches_writes(tmp_path):
+    path = tmp_path / "decisions.jsonl"
+    dlog = DecisionLogger(filepath=str(path), batch=3, flush_interval=3600.0)
+
+    dlog.log("a", x=1)
+    dlog.log("b", x=2)
+    assert not path.exists()
+
+    dlog.log("c", x=3)
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["event"] for r in rows] == ["a", "b", "c"]
+
+    dlog.log("d")
+    dlog.flush()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+    assert [r["event"] for r in dlog.latest(2)] == ["c", "d"]
+
+
+def test_decision_logger_keeps_file_open_between_flushes(tmp_path):
+    path = tmp_path / "decisions.jsonl"
+    dlog = DecisionLogger(filepath=str(path), batch=1, flush_interval=3600.0)
+
+    dlog.log("a")
+    fh = dlog._fh
+    assert fh is not None
+    dlog.log("b")
+    assert dlog._fh is fh
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    dlog.close()
+    assert fh.closed and dlog._fh is None
+    dlog.log("c")
+    dlog.close()
+    assert [json.loads(line)["event"] for line in path.read_text(encoding="utf-8").splitlines()] == ["a", "b", "c"]
+
+
+def test_decision_logger_close_unregisters_atexit_hook(tmp_path, monkeypatch):
+    hooks: list = []
+    monkeypatch.setattr(decision_log.atexit, "register", hooks.append)
+    monkeypatch.setattr(decision_log.atexit, "unregister", hooks.remove)
+    dlog = DecisionLogger(filepath=str(tmp_path / "decisions.jsonl"), batch=64)
+    assert hooks == []
+
+    dlog.log("a")
+    dlog.log("b")
+    assert hooks == [dlog.close]
+
+    dlog.close()
+    assert hooks == [] and dlog._fh is None
@@ -40,3 +40,36 @@ def test_discord_handler_posts(monkeypatch):
     assert called["url"] == "https://example.com/webhook"
     assert json.loads(called["data"].decode()) == {"content": "hello"}
     assert called["headers"]["content-type"] == "application/json"
+
+
+def test_discord_handler_drops_oldest_when_full(monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+    sent: list[str] = []
+
+    def blocking_urlopen(req, timeout=0, *args, **kwargs):
+        started.set()
+        release.wait(2.0)
+        sent.append(json.loads(req.data.decode())["content"])
+
+        class DummyResponse:
+            def close(self):
+                pass
+
+        return DummyResponse()
+
+    monkeypatch.setattr("urllib.request.urlopen", blocking_urlopen)
+
+    handler = DiscordHandler("https://example.com/webhook", maxsize=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def _record(msg: str) -> logging.LogRecord:
+        return logging.LogRecord("test", logging.ERROR, __file__, 0, msg, (), None)
+
+    handler.emit(_record("first"))
+    assert started.wait(1.0)  # worker は "first" の送信中で止まっている
+    for msg in ("a", "b", "c", "d"):
+        handler.emit(_record(msg))
+
+    assert list(handler._queue.queue) == ["c", "d"]
+    release.set()
@@ -87,3 +87,49 @@ async def test_cooldown_skips_same_side() -> None:
     ids = await eng.place_two_sided(mid=mid, total=0.05, deepen=False)
     # BUY がスキップされ SELL のみ=1件になるはず
     assert len(ids) == 1, f"クールダウンで同方向をスキップできていません（ids={ids})"
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_safely_runs_concurrently() -> None:
+    """〔このテストがすること〕 複数 STOP の取消が 1 件ずつ直列ではなく同時に走ることを確認します。"""
+    import asyncio
+
+    class SlowCancel(SpyExec):
+        def __init__(self, cfg: Any, paper: bool) -> None:
+            super().__init__(cfg, paper)
+            self.inflight = 0
+            self.peak = 0
+            self.cancelled: List[str] = []
+
+        async def cancel_order_safely(self, order_id: str) -> None:
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+            await asyncio.sleep(0.01)
+            self.inflight -= 1
+            self.cancelled.append(order_id)
+
+    eng = SlowCancel(_cfg(), paper=True)
+    await eng.cancel_orders_safely(["a", "", "b", "c"])
+    assert sorted(eng.cancelled) == ["a", "b", "c"]
+    assert eng.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_fill_or_ttl_returns_when_fills_arrive() -> None:
+    """〔このテストがすること〕 全子注文の fill が届いたら TTL を待たずに戻ることを確認します。"""
+    import asyncio
+    import time
+
+    eng = SpyExec(_cfg(), paper=True)
+    ids = await eng.place_two_sided(mid=70000.25, total=0.05, deepen=False)
+    assert len(ids) == 2
+
+    loop = asyncio.get_running_loop()
+    for i, oid in enumerate(ids):
+        loop.call_later(0.01 * (i + 1), eng.on_child_filled, oid)
+
+    t0 = time.monotonic()
+    await eng.wait_fill_or_ttl(ids, timeout_s=5.0)
+    assert time.monotonic() - t0 < 1.0
+    assert eng._open_maker_btc == 0.0
+    assert eng._fill_waiters == {}
@@ -95,3 +95,17 @@ async def test_place_order_live_calls_exchange_order(monkeypatch):
     assert kwargs.get("sz") == pytest.approx(0.05)
     assert kwargs.get("limit_px") == pytest.approx(3000.0)
     assert kwargs.get("tif") == "GTT"
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_paper_stub(monkeypatch):
+    # DRY_RUN=true なら一括キャンセルも 1 回の呼び出しで paper 応答を返す
+    monkeypatch.setenv("DRY_RUN", "true")
+    from hl_core.api.http import cancel_orders
+
+    resp = await cancel_orders("BTCUSD-PERP", ["a", "", "b"])
+    assert resp == [
+        {"status": "paper", "order_id": "a"},
+        {"status": "paper", "order_id": "b"},
+    ]
+    assert await cancel_orders("BTCUSD-PERP", []) == []
@@ -1,6 +1,12 @@
 import logging
 import logging.handlers
+import os
+import subprocess
+import sys
+import textwrap
+import threading
 from collections.abc import Iterable
+from pathlib import Path
 
 import pytest
 
@@ -177,3 +183,112 @@ def test_runner_logs_do_not_leak_into_other_bot_log(tmp_path, monkeypatch):
     if runner_log.exists():
         runner_contents = runner_log.read_text(encoding="utf-8")
         assert "runner-before" in runner_contents
+
+
+def test_queued_file_logging_does_not_hang_on_shutdown(tmp_path):
+    # 大量に積んだ直後でも logging.shutdown() が書き切って戻ること（ロック循環が無いこと）
+    path = tmp_path / "queued.csv"
+    script = textwrap.dedent(
+        f"""
+        import logging, logging.handlers
+        from hl_core.utils.logger import QueuedFileFanoutHandler
+
+        fanout = QueuedFileFanoutHandler()
+        fh = logging.handlers.TimedRotatingFileHandler({str(path)!r}, when="midnight", encoding="utf-8")
+        fh.setFormatter(logging.Formatter("%(message)s"))
+        fanout.add_file(fh)
+        log = logging.getLogger("shutdown_test")
+        log.propagate = False
+        log.addHandler(fanout)
+        for i in range(50000):
+            log.warning("line %d", i)
+        logging.shutdown()
+        """
+    )
+    src_dir = str(Path(logger_module.__file__).resolve().parents[2])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src_dir, os.getenv("PYTHONPATH")])))
+    proc = subprocess.run([sys.executable, "-c", script], env=env, timeout=60, capture_output=True, text=True)
+
+    assert proc.returncode == 0, proc.stderr
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 50000 and lines[-1] == "line 49999"
+
+
+def test_fanout_handler_enqueues_once_for_all_files(tmp_path):
+    fanout = logger_module.QueuedFileFanoutHandler()
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv"]
+    for path in paths:
+        fh = logging.handlers.TimedRotatingFileHandler(
+            filename=str(path), when="midnight", encoding="utf-8"
+        )
+        fh.setFormatter(logging.Formatter("%(message)s"))
+        assert fanout.add_file(fh)
+    assert not fanout.add_file(
+        logging.handlers.TimedRotatingFileHandler(
+            filename=str(paths[0]), when="midnight", encoding="utf-8", delay=True
+        )
+    )
+    log = logging.getLogger("tests.fanout_handler")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(fanout)
+    try:
+        payload = {"n": 1}
+        log.info("value=%s", payload)
+        payload["n"] = 2
+    finally:
+        log.removeHandler(fanout)
+        fanout.close()
+
+    for path in paths:
+        assert path.read_text(encoding="utf-8").strip() == "value={'n': 1}"
+
+
+def test_fanout_flush_drains_without_restarting_listener(tmp_path):
+    path = tmp_path / "a.csv"
+    fanout = logger_module.QueuedFileFanoutHandler()
+    fh = logging.handlers.TimedRotatingFileHandler(filename=str(path), when="midnight", encoding="utf-8")
+    fh.setFormatter(logging.Formatter("%(message)s"))
+    fanout.add_file(fh)
+    log = logging.getLogger("tests.fanout_flush")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(fanout)
+    try:
+        listener = fanout._listener
+        log.info("before-flush")
+        fanout.flush()
+        assert path.read_text(encoding="utf-8").strip() == "before-flush"
+        assert fanout._listener is listener  # 止めて作り直していない
+    finally:
+        log.removeHandler(fanout)
+        fanout.close()
+
+    threads_before = threading.active_count()
+    fanout.flush()  # close 後の flush でリスナのスレッドが復活しない
+    assert fanout._listener is None
+    assert threading.active_count() == threads_before
+
+
+def test_csv_formatter_quotes_like_csv_writer():
+    import csv
+    import io
+
+    formatter = logger_module.create_csv_formatter(include_logger_name=True)
+    record = logging.LogRecord(
+        "bots.test", logging.INFO, __file__, 1, 'say "hi", then\nbye', None, None
+    )
+    line = formatter.format(record)
+
+    row = next(csv.reader(io.StringIO(line)))
+    assert row[1:] == ["INFO", str(record.process), "bots.test", 'say "hi", then\nbye']
+
+
+def test_csv_formatter_reuses_asctime_within_same_second():
+    formatter = logger_module.create_csv_formatter(include_logger_name=False)
+    stamps = (1_700_000_000.1, 1_700_000_000.9, 1_700_000_001.0, 1_700_000_061.5)
+    for created in stamps:
+        record = logging.LogRecord("bots.test", logging.INFO, __file__, 1, "m", None, None)
+        record.created = created
+        asctime = formatter.format(record).split(",", 1)[0]
+        assert asctime == formatter.formatTime(record, formatter.datefmt)
@@ -2,6 +2,7 @@
 import asyncio
 from asyncio import Semaphore
 import contextlib
+import json
 from decimal import Decimal, ROUND_DOWN
 import logging
 import threading
@@ -9,7 +10,6 @@ import time
 from typing import Iterator
 from types import SimpleNamespace
 
-import anyio
 import pytest
 
 from bots.pfpl import PFPLStrategy
@@ -149,6 +149,47 @@ def test_evaluate_skips_when_size_rounds_to_zero(
     assert any("quantized to zero" in record.message for record in caplog.records)
 
 
+def test_evaluate_notional_estimate_uses_same_rounding_as_sizing(
+    strategy: PFPLStrategy, caplog: pytest.LogCaptureFixture
+) -> None:
+    # 435 / 100 = 4.35 → 0.01 刻みで 4.35（float の 434.999… を 434 に落とすと 434 USD で弾かれる）
+    strategy.order_usd = Decimal("435")
+    strategy.qty_tick = Decimal("0.01")
+    strategy.min_usd = Decimal("434.5")
+    strategy.fair = Decimal("100")
+    strategy._tick_guard = lambda now_ts: 0  # type: ignore[method-assign]
+
+    caplog.set_level(logging.DEBUG, logger=strategy.log.name)
+    strategy.evaluate()
+    assert not any("skip: notional" in r.getMessage() for r in caplog.records)
+
+
+def test_min_usd_skip_builds_locals_only_when_debug(
+    strategy: PFPLStrategy,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    strategy.config["threshold"] = "0"
+    strategy.config["threshold_pct"] = "0"
+    strategy.fair = Decimal("105")
+    strategy.order_usd = Decimal("25")
+    strategy.qty_tick = Decimal("0.001")
+    strategy.min_usd = Decimal("1000")  # 発注サイズ計算後の min_usd チェックで弾く
+    strategy._tick_guard = lambda now_ts: 0  # type: ignore[method-assign]
+    monkeypatch.setattr(strategy, "_can_fire", lambda now_ts: True)
+    monkeypatch.setattr(strategy, "_effective_min_usd", lambda: 0.0)
+    scopes: list[dict] = []
+    monkeypatch.setattr(strategy, "_log_min_usd_skip", scopes.append)
+
+    caplog.set_level(logging.INFO, logger=strategy.log.name)
+    strategy.evaluate()
+    assert scopes == []
+
+    caplog.set_level(logging.DEBUG, logger=strategy.log.name)
+    strategy.evaluate()
+    assert len(scopes) == 1 and scopes[0]["size"] > 0
+
+
 @pytest.mark.asyncio
 async def test_place_order_quantizes_size(
     strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
@@ -250,11 +291,746 @@ async def test_place_order_retry_waits_between_attempts(
     async def fake_sleep(delay: float, *args, **kwargs) -> None:
         sleep_delays.append(delay)
 
-    monkeypatch.setattr(anyio, "sleep", fake_sleep)
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
 
     strategy.qty_tick = Decimal("0.001")
 
     await strategy.place_order("SELL", 0.02, order_type="market")
 
     assert attempts == 2
-    assert sleep_delays == [0.5]
+    assert len(sleep_delays) == 1
+    assert 0.1 <= sleep_delays[0] <= 0.15
+
+
+def test_eval_params_follow_config_updates(strategy: PFPLStrategy) -> None:
+    strategy.fair = Decimal("100.5")
+    strategy.evaluate()
+    assert strategy._th_abs == Decimal("200")
+    assert strategy._mode_id == 3
+
+    strategy.config["threshold"] = "5"
+    strategy.config.update({"mode": "abs"})
+    strategy.evaluate()
+
+    assert strategy._th_abs == Decimal("5")
+    assert strategy._th_abs_f == 5.0
+    assert strategy._mode_id == 0
+
+
+@pytest.mark.asyncio
+async def test_place_order_retry_reacquires_limits_per_attempt(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class _RateLimited(Exception):
+        status_code = 429
+
+    attempts = 0
+
+    def limited_order(**kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise _RateLimited("429")
+        return {"status": "ok"}
+
+    class _CountingLimiter:
+        acquired = 0
+
+        async def __aenter__(self) -> None:
+            _CountingLimiter.acquired += 1
+
+        async def __aexit__(self, *exc) -> None:
+            return None
+
+    sem_held_while_sleeping: list[bool] = []
+
+    async def fake_sleep(delay: float, *args, **kwargs) -> None:
+        sem_held_while_sleeping.append(strategy.sem.locked())
+
+    monkeypatch.setattr(strategy.exchange, "order", limited_order, raising=False)
+    monkeypatch.setattr(strategy, "_rl", _CountingLimiter())
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    strategy.qty_tick = Decimal("0.001")
+
+    await strategy.place_order("SELL", 0.02, order_type="market")
+
+    assert attempts == 3
+    assert _CountingLimiter.acquired == 3  # 再送ごとにトークンを取る
+    assert sem_held_while_sleeping == [False, False]  # バックオフ中は同時実行枠を手放す
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_resize_wakes_waiter_without_task() -> None:
+    from bots.pfpl.strategy import _TokenBucket
+
+    bucket = _TokenBucket(1, 1.0)
+    await bucket.acquire()  # 残り 0 → 次は約 1 秒待ち
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    tasks_before = len(asyncio.all_tasks())
+    bucket.resize(1000)  # 待ち時間 1ms 相当に縮む
+    assert len(asyncio.all_tasks()) == tasks_before  # 通知用のタスクを作らない
+    await asyncio.wait_for(waiter, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_evaluate_feeds_order_queue_consumer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("HL_ACCOUNT_ADDR", "0xTEST")
+    monkeypatch.setenv("HL_API_SECRET", "0x" + "11" * 32)
+    strat = PFPLStrategy(
+        config={"position_refresh_interval_sec": 0, "eval_coalesce_ms": 0},
+        semaphore=Semaphore(1),
+    )
+    assert strat._order_q is not None and strat._order_consumer_task is not None
+    strat.config.update(
+        {
+            "threshold": "0",
+            "threshold_pct": "0",
+            "threshold_pct_mode": "absolute",
+            "spread_threshold": "0",
+            "spread_threshold_bps": "0",
+        }
+    )
+    strat.max_pos = Decimal("1000000")
+    strat.max_position_usd = strat.max_pos
+    strat.min_usd = Decimal("0")
+    strat.mid = Decimal("100")
+    strat.fair = Decimal("105")
+
+    recorded: list[tuple[str, float]] = []
+
+    async def fake_place_order(self, side: str, size: float, **kwargs) -> None:
+        recorded.append((side, size))
+
+    monkeypatch.setattr(PFPLStrategy, "place_order", fake_place_order)
+
+    try:
+        strat.evaluate()
+        await asyncio.wait_for(strat._order_q.join(), timeout=1.0)
+        assert recorded and recorded[0][0] == "BUY"
+    finally:
+        strat._order_consumer_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await strat._order_consumer_task
+
+
+def test_qty_tick_scale_matches_decimal_quantize(strategy: PFPLStrategy) -> None:
+    strategy.qty_tick = Decimal("0.001")
+    scale, tick_inv = strategy._qty_tick_scale()
+    assert (scale, tick_inv) == (3, 1000.0)
+    for raw in ("0.29", "0.1", "1.2345", "0.0009", "0.2499999999995", "4.35"):
+        assert strategy._quantize_size_fast(float(raw)) == Decimal(raw).quantize(
+            strategy.qty_tick, rounding=ROUND_DOWN
+        )
+
+    strategy.qty_tick = Decimal("0.01")
+    assert strategy._qty_tick_scale() == (2, 100.0)
+    # 4.35 * 100 = 434.99999999999994 は float 誤差なので 4.35 のまま
+    assert strategy._quantize_size_fast(4.35) == Decimal("4.35")
+
+    # 刻みが細かく目盛りが大きくても、刻み直前の値は切り上げない
+    strategy.qty_tick = Decimal("0.00000001")
+    for raw in ("12345.678901239", "0.999999999"):
+        assert strategy._quantize_size_fast(float(raw)) == Decimal(raw).quantize(
+            strategy.qty_tick, rounding=ROUND_DOWN
+        )
+
+    # 10**-n でない刻みは fast path を使わず Decimal.quantize に委ねる
+    strategy.qty_tick = Decimal("0.5")
+    assert strategy._qty_tick_scale() is None
+    assert strategy._quantize_size_fast(1.27) == Decimal("1.2")
+
+
+@pytest.mark.asyncio
+async def test_place_order_does_not_retry_client_errors(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    attempts = 0
+
+    class _ClientError(Exception):
+        status_code = 400
+
+    def bad_order(**kwargs):
+        nonlocal attempts
+        attempts += 1
+        raise _ClientError("invalid size")
+
+    monkeypatch.setattr(strategy.exchange, "order", bad_order, raising=False)
+
+    sleep_delays: list[float] = []
+
+    async def fake_sleep(delay: float, *args, **kwargs) -> None:
+        sleep_delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    strategy.qty_tick = Decimal("0.001")
+
+    await strategy.place_order("SELL", 0.02, order_type="market")
+
+    assert attempts == 1
+    assert sleep_delays == []
+
+
+@pytest.mark.asyncio
+async def test_place_order_backs_off_longer_on_rate_limit(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    attempts = 0
+
+    class _RateLimited(Exception):
+        status_code = 429
+
+    def limited_order(**kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise _RateLimited("too many requests")
+        return {"status": "ok"}
+
+    monkeypatch.setattr(strategy.exchange, "order", limited_order, raising=False)
+
+    sleep_delays: list[float] = []
+    held_during_sleep: list[bool] = []
+
+    async def fake_sleep(delay: float, *args, **kwargs) -> None:
+        sleep_delays.append(delay)
+        held_during_sleep.append(strategy.sem.locked())
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    strategy.qty_tick = Decimal("0.001")
+
+    await strategy.place_order("SELL", 0.02, order_type="market")
+
+    assert attempts == 3
+    assert 2.0 <= sleep_delays[0] <= 2.05
+    assert 4.0 <= sleep_delays[1] <= 4.05
+    # 待機は semaphore を返してから行い、試行ごとに取り直す
+    assert held_during_sleep == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_after_burst() -> None:
+    import bots.pfpl.strategy as strategy_module
+
+    bucket = strategy_module._TokenBucket(2, 0.1)  # 20 回/秒、バースト 2
+    start = time.monotonic()
+    for _ in range(2):
+        async with bucket:
+            pass
+    burst = time.monotonic() - start
+    async with bucket:
+        pass
+    paced = time.monotonic() - start
+
+    assert burst < 0.02
+    assert paced >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_resize_wakes_waiters() -> None:
+    import bots.pfpl.strategy as strategy_module
+
+    bucket = strategy_module._TokenBucket(1, 10.0)  # 0.1 回/秒
+    await bucket.acquire()
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    bucket.resize(100)  # 10 回/秒 → 次のトークンは約 0.1 秒後
+    await asyncio.wait_for(waiter, timeout=1.0)
+    assert bucket.max_rate == 100.0
+
+
+def test_sizing_attributes_keep_float_shadows(strategy: PFPLStrategy) -> None:
+    strategy.order_usd = Decimal("25")
+    strategy.qty_tick = Decimal("0.005")
+    strategy.min_usd = Decimal("3")
+
+    assert strategy._order_usd_f == 25.0
+    assert strategy._qty_tick_f == 0.005
+    assert strategy._effective_min_usd() == 3.0
+
+
+def test_evaluate_skips_threshold_math_when_cannot_fire(
+    strategy: PFPLStrategy,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    caplog.set_level(logging.INFO, logger="bots.pfpl.strategy")
+    strategy.dry_run = True
+    strategy.pos_usd = Decimal("100")
+    strategy.fair = Decimal("101")
+    strategy._tick_guard = lambda now_ts: 0  # type: ignore[method-assign]
+    monkeypatch.setattr(strategy, "_can_fire", lambda now_ts: False)
+
+    def _unexpected(**kwargs):
+        raise AssertionError("threshold evaluation should be skipped")
+
+    monkeypatch.setattr(strategy, "_debug_evaluate_signal", _unexpected)
+
+    strategy.evaluate()
+
+    # 省略しても dry_run の paper_pos 同期は行う
+    assert strategy.paper_pos == Decimal("1")
+
+
+def test_price_with_offset_follows_eps_pct_updates(strategy: PFPLStrategy) -> None:
+    strategy.eps_pct = 0.001
+    assert strategy._price_with_offset(100.0, "BUY") == pytest.approx(99.9)
+    assert strategy._price_with_offset(100.0, "SELL") == pytest.approx(100.1)
+
+    strategy.eps_pct = 0.0
+    assert strategy._price_with_offset(100.0, "BUY") == 100.0
+
+
+def test_taker_limit_price_follows_cushion_updates(strategy: PFPLStrategy) -> None:
+    strategy.taker_mode = True
+    strategy.best_bid = Decimal("99")
+    strategy.best_ask = Decimal("101")
+    strategy.paper_slip_bps = Decimal("0")
+    strategy.eps_pct = 0.01
+    assert strategy._taker_limit_price("BUY", 100.0, Decimal("100")) == pytest.approx(102.01)
+    assert strategy._taker_limit_price("sell", 100.0, Decimal("100")) == pytest.approx(98.01)
+
+    strategy.eps_pct = 0.0
+    strategy.paper_slip_bps = Decimal("100")
+    assert strategy._taker_limit_price("BUY", 100.0, Decimal("100")) == pytest.approx(102.01)
+
+
+@pytest.mark.asyncio
+async def test_place_order_reuses_prebuilt_ioc_order_type(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[dict[str, object]] = []
+
+    def fake_order(**kwargs):
+        calls.append(kwargs)
+        return {"status": "ok"}
+
+    monkeypatch.setattr(strategy.exchange, "order", fake_order, raising=False)
+    strategy.qty_tick = Decimal("0.001")
+
+    await strategy.place_order("BUY", 0.01)
+    await strategy.place_order("SELL", 0.01, time_in_force="Gtc")
+
+    assert calls[0]["order_type"] is strategy._ioc_order_type
+    assert calls[0]["order_type"] == {"limit": {"tif": "Ioc"}}
+    assert calls[1]["order_type"] == {"limit": {"tif": "Gtc"}}
+
+
+def test_check_limits_resets_count_after_day_boundary(strategy: PFPLStrategy) -> None:
+    from datetime import timedelta
+
+    strategy.max_daily_orders = 1
+    strategy._order_count = 1
+    assert strategy._check_limits() is False
+
+    # 日境界の UNIX 秒を過去にし、前日扱いにしてから判定させる
+    strategy._next_day_ts = time.time() - 1
+    strategy._start_day = strategy._start_day - timedelta(days=1)
+    assert strategy._check_limits() is True
+    assert strategy._order_count == 0
+    assert strategy._next_day_ts > time.time()
+
+
+@pytest.mark.asyncio
+async def test_send_order_posts_signed_action_directly(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import httpx
+
+    import bots.pfpl.strategy as strategy_module
+
+    # テストでは SDK がダミーに差し替わるため、署名ユーティリティも最小の代替を使う
+    def fake_wire(order, asset):
+        return {"a": asset, "b": order["is_buy"], "s": str(order["sz"])}
+
+    signatures: list[tuple] = []
+
+    def fake_sign(wallet, action, vault, nonce, expires_after, is_mainnet):
+        signatures.append((action["type"], nonce, is_mainnet))
+        return {"r": "0x1", "s": "0x2", "v": 27}
+
+    monkeypatch.setattr(strategy_module, "order_request_to_order_wire", fake_wire, raising=False)
+    monkeypatch.setattr(
+        strategy_module,
+        "order_wires_to_order_action",
+        lambda wires: {"type": "order", "orders": wires, "grouping": "na"},
+        raising=False,
+    )
+    monkeypatch.setattr(strategy_module, "get_timestamp_ms", lambda: 1234, raising=False)
+    monkeypatch.setattr(strategy_module, "sign_l1_action", fake_sign)
+    monkeypatch.setattr(
+        strategy_module, "MAINNET_API_URL", "https://api.hyperliquid.xyz", raising=False
+    )
+    # coincurve の有無に関わらず sign_l1_action 経由の署名を検証する
+    strategy._ec_key = None
+
+    class _SdkLikeInfo:
+        def name_to_asset(self, name: str) -> int:  # pragma: no cover - _asset_idx を優先する
+            raise AssertionError("asset index should come from the meta cache")
+
+    class _SdkLikeExchange:
+        base_url = "https://api.hyperliquid-testnet.xyz"
+        vault_address = None
+        expires_after = None
+
+        def __init__(self, wallet) -> None:
+            self.wallet = wallet
+            self.info = _SdkLikeInfo()
+
+        def order(self, **kwargs):  # pragma: no cover - 直接 POST されるので呼ばれない
+            raise AssertionError("SDK order should be bypassed")
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"status": "ok"})
+
+    strategy.exchange = _SdkLikeExchange(strategy.wallet)
+    strategy._http = httpx.AsyncClient(
+        base_url=strategy.exchange.base_url, transport=httpx.MockTransport(handler)
+    )
+    order_kwargs = {
+        "coin": "ETH",
+        "is_buy": True,
+        "sz": 0.01,
+        "limit_px": 100.0,
+        "order_type": strategy._ioc_order_type,
+        "reduce_only": False,
+    }
+
+    resp = await strategy._send_order(strategy.exchange.order, order_kwargs)
+
+    assert resp == {"status": "ok"}
+    assert len(requests) == 1 and requests[0].url.path == "/exchange"
+    assert requests[0].headers["content-type"] == "application/json"
+    body = json.loads(requests[0].content)
+    assert body["action"]["type"] == "order"
+    assert body["action"]["orders"][0]["a"] == strategy._asset_idx["ETH"] == 0
+    assert body["nonce"] == 1234
+    assert signatures == [("order", 1234, False)]
+
+    # exchange.order が差し替えられていれば従来どおりそれを呼ぶ
+    called: list[dict] = []
+    assert strategy._direct_order_payload(
+        lambda **kw: called.append(kw), "order", [order_kwargs]
+    ) is None
+    await strategy.aclose()
+    assert strategy._http is None
+
+
+def test_direct_order_payload_skips_only_unwirable_order(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import bots.pfpl.strategy as strategy_module
+
+    def sdk_like_wire(order, asset):
+        # SDK の order_type_to_wire と同じく limit / trigger 以外は ValueError
+        if "limit" not in order["order_type"]:
+            raise ValueError("Invalid order type")
+        return {"a": asset, "b": order["is_buy"], "s": str(order["sz"])}
+
+    monkeypatch.setattr(strategy_module, "order_request_to_order_wire", sdk_like_wire, raising=False)
+    monkeypatch.setattr(
+        strategy_module,
+        "order_wires_to_order_action",
+        lambda wires: {"type": "order", "orders": wires, "grouping": "na"},
+        raising=False,
+    )
+    monkeypatch.setattr(strategy_module, "get_timestamp_ms", lambda: 1234, raising=False)
+    monkeypatch.setattr(
+        strategy_module, "sign_l1_action", lambda *a: {"r": "0x1", "s": "0x2", "v": 27}
+    )
+    monkeypatch.setattr(
+        strategy_module, "MAINNET_API_URL", "https://api.hyperliquid.xyz", raising=False
+    )
+    strategy._ec_key = None
+
+    class _SdkLikeExchange:
+        base_url = "https://api.hyperliquid-testnet.xyz"
+        vault_address = None
+        expires_after = None
+        wallet = None
+
+        def order(self, **kwargs):  # pragma: no cover - 参照比較にだけ使う
+            raise AssertionError
+
+    strategy.exchange = _SdkLikeExchange()
+    base = {"coin": "ETH", "is_buy": False, "sz": 0.01, "limit_px": 100.0, "reduce_only": True}
+
+    # _close_all_positions の成行は wire 化できないので、その注文だけ SDK に回す
+    market = dict(base, order_type={"market": {}})
+    assert strategy._direct_order_payload(strategy.exchange.order, "order", [market]) is None
+    assert strategy._direct_order is True
+
+    # 続く指値注文は直接 POST の経路を使い続ける
+    limit = dict(base, order_type=strategy._ioc_order_type)
+    payload = strategy._direct_order_payload(strategy.exchange.order, "order", [limit])
+    assert payload is not None and payload["action"]["type"] == "order"
+
+    # SDK の形が合わない（ヘルパー欠落など）ときだけ以後の直接 POST をやめる
+    monkeypatch.setattr(strategy_module, "order_wires_to_order_action", None, raising=False)
+    assert strategy._direct_order_payload(strategy.exchange.order, "order", [limit]) is None
+    assert strategy._direct_order is False
+
+
+def test_agent_digest_matches_eip712_encoding() -> None:
+    messages = pytest.importorskip("eth_account.messages")
+    import bots.pfpl.strategy as strategy_module
+
+    strategy_module._load_sdk()
+    if strategy_module._keccak is None:
+        pytest.skip("eth_utils unavailable")
+    connection_id = bytes(range(32))
+    for is_mainnet in (True, False):
+        payload = {
+            "domain": {
+                "chainId": 1337,
+                "name": "Exchange",
+                "verifyingContract": "0x0000000000000000000000000000000000000000",
+                "version": "1",
+            },
+            "types": {
+                "Agent": [
+                    {"name": "source", "type": "string"},
+                    {"name": "connectionId", "type": "bytes32"},
+                ],
+                "EIP712Domain": [
+                    {"name": "name", "type": "string"},
+                    {"name": "version", "type": "string"},
+                    {"name": "chainId", "type": "uint256"},
+                    {"name": "verifyingContract", "type": "address"},
+                ],
+            },
+            "primaryType": "Agent",
+            "message": {
+                "source": "a" if is_mainnet else "b",
+                "connectionId": connection_id,
+            },
+        }
+        signable = messages.encode_typed_data(full_message=payload)
+        expected = messages._hash_eip191_message(signable)
+        assert strategy_module._agent_digest(connection_id, is_mainnet) == expected
+
+
+def test_sign_l1_action_fast_formats_recoverable_signature(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import bots.pfpl.strategy as strategy_module
+
+    strategy_module._load_sdk()
+    if strategy_module._keccak is None:
+        pytest.skip("eth_utils unavailable")
+    monkeypatch.setattr(
+        strategy_module, "action_hash", lambda *a: bytes(32), raising=False
+    )
+    digests: list[bytes] = []
+
+    class FakeKey:
+        def sign_recoverable(self, msg: bytes, hasher=None) -> bytes:
+            assert hasher is None
+            digests.append(msg)
+            return b"\x11" * 32 + b"\x22" * 32 + b"\x01"
+
+    sig = strategy_module._sign_l1_action_fast(
+        FakeKey(), {"type": "order"}, None, 1, None, True
+    )
+    assert sig == {"r": "0x" + "11" * 32, "s": "0x" + "22" * 32, "v": 28}
+    assert digests == [strategy_module._agent_digest(bytes(32), True)]
+
+
+@pytest.mark.parametrize(
+    ("vault", "is_mainnet"),
+    [(None, True), (None, False), ("0x" + "ab" * 20, True)],
+)
+def test_sign_l1_action_fast_matches_sdk_with_real_key(
+    vault: str | None, is_mainnet: bool
+) -> None:
+    coincurve = pytest.importorskip("coincurve")
+    pytest.importorskip("eth_account")
+    from eth_account import Account as EthAccount
+
+    import bots.pfpl.strategy as strategy_module
+
+    strategy_module._load_sdk()
+    if strategy_module._keccak is None or strategy_module.sign_l1_action is None:
+        pytest.skip("hyperliquid SDK signing utilities unavailable")
+
+    private_key = "0x" + "4c" * 32
+    action = {
+        "type": "order",
+        "orders": [
+            {
+                "a": 4,
+                "b": True,
+                "p": "2500.5",
+                "s": "0.01",
+                "r": False,
+                "t": {"limit": {"tif": "Ioc"}},
+            }
+        ],
+        "grouping": "na",
+    }
+    nonce = 1_700_000_000_000
+
+    expected = strategy_module.sign_l1_action(
+        EthAccount.from_key(private_key), action, vault, nonce, None, is_mainnet
+    )
+    ec_key = coincurve.PrivateKey(bytes.fromhex(private_key.removeprefix("0x")))
+    got = strategy_module._sign_l1_action_fast(
+        ec_key, action, vault, nonce, None, is_mainnet
+    )
+    assert got == expected
+
+
+@pytest.mark.asyncio
+async def test_place_orders_sends_one_bulk_action(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    bulk_calls: list[list[dict]] = []
+
+    def fake_bulk_orders(orders):
+        bulk_calls.append(orders)
+        return {"status": "ok"}
+
+    monkeypatch.setattr(strategy.exchange, "bulk_orders", fake_bulk_orders, raising=False)
+    strategy.qty_tick = Decimal("0.001")
+    strategy._order_count = 0
+
+    await strategy.place_orders([("BUY", 0.01), ("SELL", 0.02)])
+
+    assert len(bulk_calls) == 1
+    assert [o["is_buy"] for o in bulk_calls[0]] == [True, False]
+    assert [o["sz"] for o in bulk_calls[0]] == [0.01, 0.02]
+    assert strategy._order_count == 2
+    assert strategy.last_side == "SELL"
+
+
+def test_evaluate_spread_guard_blocks_wide_book(
+    strategy: PFPLStrategy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    strategy.config["threshold"] = "0.5"
+    strategy.config["threshold_pct"] = "0"
+    strategy.config["spread_threshold"] = "0.5"
+    strategy.fair = Decimal("101")
+    strategy.best_bid = Decimal("99")
+    strategy.best_ask = Decimal("101")
+    strategy._tick_guard = lambda now_ts: 0  # type: ignore[method-assign]
+    monkeypatch.setattr(strategy, "_can_fire", lambda now_ts: True)
+    calls: list[str] = []
+
+    def _spy(side: str, candidate: float | None, mid_value: Decimal | None) -> float:
+        calls.append(side)
+        raise RuntimeError("stop after side decision")
+
+    monkeypatch.setattr(strategy, "_taker_limit_price", _spy)
+
+    # spread 2.0 > 0.5 → 発注サイズ計算まで進まない
+    strategy.evaluate()
+    assert calls == []
+
+    # 板が狭ければ同じ乖離で発注処理へ進む
+    strategy.best_ask = Decimal("99.2")
+    with pytest.raises(RuntimeError):
+        strategy.evaluate()
+    assert calls == ["BUY"]
+
+
+def test_evaluate_passes_spread_to_debug_log_when_filter_disabled(
+    strategy: PFPLStrategy,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    strategy.best_bid = Decimal("99")
+    strategy.best_ask = Decimal("101")
+    strategy.fair = Decimal("101")
+    strategy._tick_guard = lambda now_ts: 0  # type: ignore[method-assign]
+    seen: list[dict] = []
+    monkeypatch.setattr(
+        strategy, "_debug_evaluate_signal", lambda **kw: seen.append(kw) or {}
+    )
+
+    # spread フィルタ無効でも DEBUG 時は判定ログ用に spread を渡す
+    caplog.set_level(logging.DEBUG, logger=strategy.log.name)
+    strategy.evaluate()
+    assert seen and seen[-1]["spread_px"] == 2.0
+    assert seen[-1]["spread_ok"] is True
+
+
+def test_signal_hist_quantile_matches_full_sort(strategy: PFPLStrategy) -> None:
+    import random as _random
+
+    rng = _random.Random(7)
+    samples: list[tuple[float, float]] = []
+    for i in range(400):
+        now_ts = i * 0.5
+        val = round(rng.uniform(0.0, 5.0), 2)
+        samples.append((now_ts, val))
+        got = strategy._update_signal_hist(
+            abs_diff=val, now_ts=now_ts, window_sec=30.0, quantile=0.9, min_samples=5
+        )
+        window = sorted(v for ts, v in samples if ts >= now_ts - 30.0)
+        if len(window) < 5:
+            assert got is None
+            continue
+        k = (len(window) - 1) * 0.9
+        lo = int(k)
+        hi = min(lo + 1, len(window) - 1)
+        assert got == pytest.approx(window[lo] + (window[hi] - window[lo]) * (k - lo))
+    assert strategy._signal_sorted == sorted(v for _, v in strategy._signal_hist)
+
+
+def test_percentile_mode_defers_quantile_until_order_can_fire(
+    strategy: PFPLStrategy,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    # DEBUG 時は decision 行のために分位点まで計算するので、INFO に固定して検証する
+    caplog.set_level(logging.INFO, logger=strategy.log.name)
+    strategy.config["threshold_pct_mode"] = "percentile"
+    strategy.config["threshold_pct_quantile"] = "0.5"
+    strategy.fair = Decimal("101")
+    strategy._tick_guard = lambda now_ts: 0  # type: ignore[method-assign]
+    monkeypatch.setattr(strategy, "_can_fire", lambda now_ts: False)
+    monkeypatch.setattr(strategy, "_signal_quantile", lambda *a, **k: pytest.fail("quantile"))
+
+    strategy.evaluate()
+    strategy.evaluate()
+
+    # 発注できない tick でも履歴だけは積まれる
+    assert [v for _, v in strategy._signal_hist] == [1.0, 1.0]
+
+
+def test_signal_quantile_reuses_result_until_history_changes(strategy: PFPLStrategy) -> None:
+    for i in range(5):
+        strategy._push_signal_hist(float(i), float(i), 60.0)
+    assert strategy._signal_quantile(0.5, 1) == 2.0
+
+    # 履歴が同じ版のうちは写しを読み直さない
+    strategy._signal_sorted = [100.0] * 5
+    assert strategy._signal_quantile(0.5, 1) == 2.0
+
+    strategy._push_signal_hist(9.0, 5.0, 60.0)
+    assert strategy._signal_quantile(0.5, 1) == 100.0
+
+
+def test_signal_hist_is_capped_by_max_samples(strategy: PFPLStrategy) -> None:
+    for i in range(10):
+        strategy._push_signal_hist(float(i), float(i), 900.0, 4)
+    assert [v for _, v in strategy._signal_hist] == [6.0, 7.0, 8.0, 9.0]
+    assert strategy._signal_sorted == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_signal_hist_sampling_skips_pushes_within_interval(strategy: PFPLStrategy) -> None:
+    for i in range(10):
+        strategy._push_signal_hist(float(i), 100.0 + i * 0.4, 900.0, 0, 1.0)
+    assert [ts for ts, _ in strategy._signal_hist] == [100.0, 101.2, 102.4, 103.6]
+    assert strategy._signal_sorted == [0.0, 3.0, 6.0, 9.0]
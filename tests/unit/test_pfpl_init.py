@@ -1,12 +1,13 @@
 # tests/unit/test_pfpl_init.py
+import asyncio
 import contextlib
-import importlib
 from asyncio import Semaphore
 from decimal import Decimal
 from pathlib import Path
 import logging
 import logging.handlers  # ensure typeshed exposes logging.handlers for type checker
 import sys
+import time
 
 import pytest
 from bots.pfpl import PFPLStrategy
@@ -37,6 +38,10 @@ def _remove_strategy_handler(symbol: str = "ETH-PERP") -> None:
     # New path: logs/pfpl/<SYMBOL>.csv
     new_path = (Path("logs") / "pfpl" / f"{symbol}.csv").resolve()
     removed = False
+    fanout = strategy_module._SYMBOL_LOG_FANOUT
+    if fanout.has_file(str(new_path)):
+        fanout.remove_file(str(new_path))
+        removed = True
     for handler in list(module_logger.handlers):
         base = getattr(handler, "baseFilename", "")
         if base == str(new_path):
@@ -68,9 +73,11 @@ def test_init_adds_file_handler_once(monkeypatch):
     symbol_log = (Path("logs") / "pfpl" / f"{symbol}.csv").resolve()
 
     def _count_handlers() -> int:
-        return sum(
+        fanout = strategy_module._SYMBOL_LOG_FANOUT
+        attached = module_logger.handlers.count(fanout)
+        return attached * sum(
             1
-            for handler in module_logger.handlers
+            for handler in fanout.files()
             if isinstance(handler, logging.handlers.TimedRotatingFileHandler)
             and getattr(handler, "baseFilename", "") == str(symbol_log)
         )
@@ -90,15 +97,43 @@ def test_init_adds_file_handler_once(monkeypatch):
     assert after_first == after_second == before + 1
 
 
+def test_yaml_config_parsed_once_per_process(monkeypatch):
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDRESS", "HL_PRIVATE_KEY")
+
+    calls: list[str] = []
+
+    def fake_safe_load(raw_conf):
+        calls.append(raw_conf)
+        return {"funding_guard": {"enabled": False}}
+
+    monkeypatch.setattr(strategy_module, "_yaml_load", fake_safe_load)
+    monkeypatch.setattr(strategy_module, "load_compiled_config", lambda path: None)
+    monkeypatch.setattr(PFPLStrategy, "_YAML_CACHE", {})
+
+    strategies: list[PFPLStrategy] = []
+    try:
+        strategies.append(PFPLStrategy(config={}, semaphore=Semaphore(1)))
+        strategies.append(PFPLStrategy(config={}, semaphore=Semaphore(1)))
+
+        assert len(calls) == 1
+        # ネストした設定はインスタンスごとに独立している
+        assert strategies[0].config["funding_guard"] is not strategies[1].config["funding_guard"]
+    finally:
+        for strategy in strategies:
+            _remove_strategy_handler(strategy.symbol)
+        PFPLStrategy._FILE_HANDLERS.clear()
+
+
 def test_cli_args_override_yaml_config(monkeypatch):
     _set_credentials(monkeypatch, "HL_ACCOUNT_ADDRESS", "HL_PRIVATE_KEY")
 
     yaml_override = {"target_symbol": "BTC-PERP", "dry_run": False}
     monkeypatch.setattr(
-        strategy_module.yaml,
-        "safe_load",
+        strategy_module,
+        "_yaml_load",
         lambda raw_conf: yaml_override.copy(),
     )
+    monkeypatch.setattr(PFPLStrategy, "_YAML_CACHE", {})
 
     cli_symbol = "ETH-PERP"
     cli_dry_run = True
@@ -137,6 +172,7 @@ def test_caplog_keeps_symbol_file_logging(monkeypatch, caplog):
             strategy_module.logger.info(log_message)
 
         assert strategy is not None
+        strategy_module._SYMBOL_LOG_FANOUT.flush()
 
         log_path = (Path("logs") / "pfpl" / f"{strategy.symbol}.csv").resolve()
         assert log_path.exists()
@@ -168,44 +204,14 @@ def test_init_loads_yaml_config(monkeypatch):
         PFPLStrategy._FILE_HANDLERS.clear()
 
 
-def test_strategy_import_requires_pyyaml(monkeypatch):
-    module_name = "bots.pfpl.strategy"
-    package_name = "bots.pfpl"
-
-    try:
-        original_yaml_module = importlib.import_module("yaml")
-    except ModuleNotFoundError:
-        original_yaml_module = None
-
-    sys.modules.pop(module_name, None)
-    sys.modules.pop(package_name, None)
-    if original_yaml_module is not None:
-        sys.modules["yaml"] = original_yaml_module
-    else:
-        sys.modules.pop("yaml", None)
+def test_yaml_load_requires_pyyaml(monkeypatch):
+    # PyYAML は設定を読むときに初めて import する（モジュール import 自体は通る）
     monkeypatch.setitem(sys.modules, "yaml", None)
 
-    restored_strategy_module = None
-    restored_package_module = None
-    try:
-        with pytest.raises(RuntimeError) as excinfo:
-            importlib.import_module(module_name)
-
-        assert "PyYAML" in str(excinfo.value)
-    finally:
-        sys.modules.pop(module_name, None)
-        sys.modules.pop(package_name, None)
-        if original_yaml_module is not None:
-            sys.modules["yaml"] = original_yaml_module
-        else:
-            sys.modules.pop("yaml", None)
-
-        restored_package_module = importlib.import_module(package_name)
-        restored_strategy_module = importlib.import_module(module_name)
+    with pytest.raises(RuntimeError) as excinfo:
+        strategy_module._yaml_load("order_usd: 10")
 
-        global strategy_module, PFPLStrategy
-        strategy_module = restored_strategy_module
-        PFPLStrategy = restored_package_module.PFPLStrategy
+    assert "PyYAML" in str(excinfo.value)
 
 
 @pytest.mark.parametrize(
@@ -230,6 +236,31 @@ def test_init_accepts_new_and_legacy_env(monkeypatch, account_env, secret_env):
         PFPLStrategy._FILE_HANDLERS.clear()
 
 
+def test_env_credentials_resolved_once_per_env(monkeypatch):
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDRESS", "HL_PRIVATE_KEY")
+    strategy_module._resolve_env_creds.cache_clear()
+    calls = 0
+    real_load_settings = strategy_module.load_settings
+
+    def counting_load_settings():
+        nonlocal calls
+        calls += 1
+        return real_load_settings()
+
+    monkeypatch.setattr(strategy_module, "load_settings", counting_load_settings)
+    try:
+        assert strategy_module._env_creds() == (TEST_ACCOUNT, TEST_KEY)
+        assert strategy_module._env_creds() == (TEST_ACCOUNT, TEST_KEY)
+        assert calls == 1
+
+        # 環境変数が変われば解決し直す
+        monkeypatch.setenv("HL_ACCOUNT_ADDRESS", "0xOTHER")
+        assert strategy_module._env_creds() == ("0xOTHER", TEST_KEY)
+        assert calls == 2
+    finally:
+        strategy_module._resolve_env_creds.cache_clear()
+
+
 def test_init_missing_credentials_raises(monkeypatch):
     for var in (
         "HL_ACCOUNT_ADDRESS",
@@ -263,6 +294,7 @@ async def test_refresh_position_uses_base_coin(monkeypatch):
         }
 
     monkeypatch.setattr(strategy.exchange.info, "user_state", fake_user_state)
+    monkeypatch.setattr(strategy_module, "_USER_STATE_CACHE", {})
 
     try:
         await strategy._refresh_position()
@@ -273,10 +305,114 @@ async def test_refresh_position_uses_base_coin(monkeypatch):
         PFPLStrategy._FILE_HANDLERS.clear()
 
 
+@pytest.mark.asyncio
+async def test_spawn_uses_loop_captured_at_init(monkeypatch):
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDR", "HL_API_SECRET")
+
+    strategy = PFPLStrategy(config={}, semaphore=Semaphore(1))
+    try:
+        assert strategy._loop is asyncio.get_running_loop()
+
+        async def _noop() -> int:
+            return 1
+
+        task = strategy._spawn(_noop())
+        assert task.get_loop() is strategy._loop
+        assert await task == 1
+    finally:
+        _remove_strategy_handler(strategy.symbol)
+        PFPLStrategy._FILE_HANDLERS.clear()
+
+
+@pytest.mark.asyncio
+async def test_refresh_position_cached_within_ttl(monkeypatch):
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDR", "HL_API_SECRET")
+
+    strategy = PFPLStrategy(config={}, semaphore=Semaphore(1))
+    calls: list[str] = []
+
+    def fake_user_state(account: str):
+        calls.append(account)
+        return {"perpPositions": []}
+
+    monkeypatch.setattr(strategy.exchange.info, "user_state", fake_user_state)
+    monkeypatch.setattr(strategy_module, "_USER_STATE_CACHE", {})
+
+    try:
+        await strategy._refresh_position()
+        await strategy._refresh_position()
+        assert len(calls) == 1
+
+        await strategy._refresh_position(force=True)
+        assert len(calls) == 2
+    finally:
+        _remove_strategy_handler(strategy.symbol)
+        PFPLStrategy._FILE_HANDLERS.clear()
+
+
+@pytest.mark.asyncio
+async def test_user_state_shared_between_strategies_of_same_account(monkeypatch):
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDR", "HL_API_SECRET")
+    monkeypatch.setattr(strategy_module, "_USER_STATE_CACHE", {})
+
+    first = PFPLStrategy(config={}, semaphore=Semaphore(1))
+    second = PFPLStrategy(config={}, semaphore=Semaphore(1))
+    calls: list[str] = []
+
+    def fake_user_state(account: str):
+        calls.append(account)
+        return {"perpPositions": [{"position": {"coin": "ETH", "sz": "1", "entryPx": "10"}}]}
+
+    monkeypatch.setattr(first.exchange.info, "user_state", fake_user_state)
+    monkeypatch.setattr(second.exchange.info, "user_state", fake_user_state)
+
+    try:
+        await first._refresh_position()
+        await second._refresh_position()
+
+        assert len(calls) == 1
+        assert first.pos_usd == second.pos_usd == Decimal("10")
+    finally:
+        _remove_strategy_handler(first.symbol)
+        PFPLStrategy._FILE_HANDLERS.clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_forced_user_state_fetches_are_collapsed(monkeypatch):
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDR", "HL_API_SECRET")
+    monkeypatch.setattr(strategy_module, "_USER_STATE_CACHE", {})
+    monkeypatch.setattr(strategy_module, "_USER_STATE_LOCKS", {})
+
+    strategy = PFPLStrategy(config={}, semaphore=Semaphore(1))
+    calls: list[str] = []
+
+    def slow_user_state(account: str):
+        calls.append(account)
+        time.sleep(0.05)
+        return {"perpPositions": []}
+
+    monkeypatch.setattr(strategy.exchange.info, "user_state", slow_user_state)
+
+    try:
+        # 1 本目の取得中に来た force 要求は、その結果（要求より前に始まった取得）を使わず、
+        # ロック待ちの間に始まった次の 1 回の取得をまとめて共有する
+        await asyncio.gather(
+            *(strategy._get_user_state(force=True) for _ in range(3))
+        )
+        assert len(calls) == 2
+
+        await strategy._get_user_state(force=True)
+        assert len(calls) == 3
+    finally:
+        _remove_strategy_handler(strategy.symbol)
+        PFPLStrategy._FILE_HANDLERS.clear()
+
+
 def test_funding_guard_config_applied(monkeypatch):
     _set_credentials(monkeypatch, "HL_ACCOUNT_ADDRESS", "HL_PRIVATE_KEY")
 
-    monkeypatch.setattr(strategy_module.yaml, "safe_load", lambda raw_conf: {})
+    monkeypatch.setattr(strategy_module, "_yaml_load", lambda raw_conf: {})
+    monkeypatch.setattr(PFPLStrategy, "_YAML_CACHE", {})
     PFPLStrategy._FILE_HANDLERS.clear()
     _remove_strategy_handler()
 
@@ -302,15 +438,20 @@ def test_funding_guard_config_applied(monkeypatch):
         assert strategy.funding_close_buffer_secs == 60
 
         strategy.next_funding_ts = now + 30
-        monkeypatch.setattr(strategy_module.time, "time", lambda: now)
-        assert strategy._check_funding_window() is False
+        strategy._order_count = 0
+        strategy.max_daily_orders = 10
+        # 危険窓（funding の 60 秒前〜15 秒後）では売買停止
+        assert strategy._tick_guard(now) == strategy_module._GUARD_SKIP
         assert strategy._funding_pause is True
 
-        monkeypatch.setattr(strategy_module.time, "time", lambda: now + 61)
-        assert strategy._check_funding_window() is True
+        # 窓を抜けると再開し、funding 前バッファ以降なのでクローズを指示する
+        assert strategy._tick_guard(now + 61) == strategy_module._GUARD_CLOSE
         assert strategy._funding_pause is False
 
-        assert strategy._should_close_before_funding(now) is True
+        # バッファより前は通常運転、日次の発注上限に達していれば停止
+        assert strategy._tick_guard(now - 60) == strategy_module._GUARD_OK
+        strategy._order_count = 10
+        assert strategy._tick_guard(now - 60) == strategy_module._GUARD_SKIP
 
         strategy_disabled = PFPLStrategy(
             config={
@@ -324,10 +465,10 @@ def test_funding_guard_config_applied(monkeypatch):
         )
 
         strategy_disabled.next_funding_ts = now + 5
-        monkeypatch.setattr(strategy_module.time, "time", lambda: now)
+        strategy_disabled._order_count = 0
+        strategy_disabled.max_daily_orders = 10
 
-        assert strategy_disabled._check_funding_window() is True
-        assert strategy_disabled._should_close_before_funding(now) is False
+        assert strategy_disabled._tick_guard(now) == strategy_module._GUARD_OK
     finally:
         if strategy is not None:
             _remove_strategy_handler(strategy.symbol)
@@ -339,7 +480,8 @@ def test_funding_guard_config_applied(monkeypatch):
 def test_funding_guard_string_config_handled(monkeypatch):
     _set_credentials(monkeypatch, "HL_ACCOUNT_ADDRESS", "HL_PRIVATE_KEY")
 
-    monkeypatch.setattr(strategy_module.yaml, "safe_load", lambda raw_conf: {})
+    monkeypatch.setattr(strategy_module, "_yaml_load", lambda raw_conf: {})
+    monkeypatch.setattr(PFPLStrategy, "_YAML_CACHE", {})
     PFPLStrategy._FILE_HANDLERS.clear()
     _remove_strategy_handler()
 
@@ -365,12 +507,50 @@ def test_funding_guard_string_config_handled(monkeypatch):
 
         strategy._funding_pause = True
         strategy.next_funding_ts = now + 5
-        monkeypatch.setattr(strategy_module.time, "time", lambda: now)
+        strategy._order_count = 0
+        strategy.max_daily_orders = 10
 
-        assert strategy._check_funding_window() is True
+        assert strategy._tick_guard(now) == strategy_module._GUARD_OK
         assert strategy._funding_pause is False
-        assert strategy._should_close_before_funding(now) is False
     finally:
         if strategy is not None:
             _remove_strategy_handler(strategy.symbol)
         PFPLStrategy._FILE_HANDLERS.clear()
+
+
+def test_cached_meta_fetches_once_per_endpoint(monkeypatch):
+    monkeypatch.setattr(strategy_module, "_META_CACHE", {})
+    calls: list[int] = []
+
+    class _Info:
+        def meta(self):
+            calls.append(1)
+            return {"universe": [{"name": "BTC"}, {"name": "ETH", "szDecimals": 4}]}
+
+    url = "https://api.hyperliquid-testnet.xyz"
+    meta, by_name, asset_idx = strategy_module._cached_meta(_Info(), url, True)
+    again = strategy_module._cached_meta(_Info(), url, True)
+
+    assert len(calls) == 1
+    assert again[1] is by_name
+    assert by_name["ETH"]["szDecimals"] == 4
+    assert asset_idx == {"BTC": 0, "ETH": 1}
+
+    strategy_module._cached_meta(_Info(), "https://api.hyperliquid.xyz", False)
+    assert len(calls) == 2
+
+
+def test_sdk_imports_deferred_until_strategy_created(monkeypatch):
+    # モジュール import だけでは SDK を読み込まず、PFPLStrategy 生成時に読み込む
+    _set_credentials(monkeypatch, "HL_ACCOUNT_ADDR", "HL_API_SECRET")
+    monkeypatch.setattr(strategy_module, "_SDK_LOADED", False)
+    monkeypatch.setattr(strategy_module, "Exchange", None)
+
+    strategy = PFPLStrategy(config={}, semaphore=Semaphore(1))
+    try:
+        assert strategy_module._SDK_LOADED
+        assert strategy_module.Exchange is not None
+        assert isinstance(strategy.exchange, strategy_module.Exchange)
+    finally:
+        _remove_strategy_handler(strategy.symbol)
+        PFPLStrategy._FILE_HANDLERS.clear()
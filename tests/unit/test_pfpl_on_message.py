@@ -26,6 +26,7 @@ def test_on_message_updates_mid_from_base_coin(strategy: PFPLStrategy, caplog):
     strategy.on_message(_message("ETH", "123.45"))
 
     assert strategy.mid == Decimal("123.45")
+    assert strategy._mid_f == pytest.approx(123.45)
     assert any(
         record.levelno == logging.DEBUG and record.message == "allMids: mid[ETH]=123.45"
         for record in caplog.records
@@ -47,6 +48,18 @@ def test_on_message_missing_mid_keeps_previous(strategy: PFPLStrategy, caplog):
     )
 
 
+def test_all_mids_skips_unchanged_raw_mid(strategy: PFPLStrategy):
+    assert strategy._h_all_mids(_message("ETH", "123.45")["data"]) == (True, False)
+    parsed = strategy.mid
+    assert strategy._h_all_mids(_message("ETH", "123.45")["data"]) == (False, False)
+    assert strategy.mid is parsed
+
+    # 外部から mid が書き換えられていれば同じ文字列でも取り込み直す
+    strategy.mid = Decimal("1")
+    assert strategy._h_all_mids(_message("ETH", "123.45")["data"]) == (True, False)
+    assert strategy.mid == Decimal("123.45")
+
+
 def test_on_message_fair_updates_when_symbol_only_index(strategy: PFPLStrategy):
     strategy.mid = Decimal("1000")
     strategy.fair_feed = "indexPrices"
@@ -89,3 +102,106 @@ def test_on_message_fair_updates_when_symbol_only_oracle(strategy: PFPLStrategy)
     assert strategy.ora == Decimal("4321.09")
     assert strategy.fair == Decimal("4321.09")
     assert calls == [Decimal("4321.09")]
+
+
+@pytest.mark.asyncio
+async def test_on_message_coalesces_evaluate_in_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import asyncio
+
+    monkeypatch.setenv("HL_ACCOUNT_ADDR", "0xTEST")
+    monkeypatch.setenv("HL_API_SECRET", "0x" + "11" * 32)
+    strategy = PFPLStrategy(
+        config={"eval_coalesce_ms": 10, "position_refresh_interval_sec": 0},
+        semaphore=Semaphore(1),
+    )
+    calls: list[Decimal | None] = []
+
+    def fake_evaluate(self: PFPLStrategy) -> None:
+        calls.append(self.mid)
+
+    strategy.evaluate = fake_evaluate.__get__(strategy, PFPLStrategy)
+    strategy.fair = Decimal("100")
+    try:
+        for px in ("100.1", "100.2", "100.3"):
+            strategy.on_message(_message("ETH", px))
+        assert calls == []
+        await asyncio.sleep(0.05)
+        assert calls == [Decimal("100.3")]
+    finally:
+        await strategy.aclose()
+    assert strategy._eval_task is None and strategy._order_consumer_task is None
+
+
+def test_on_message_passes_frame_clock_to_evaluate(strategy: PFPLStrategy):
+    seen: list[tuple[float, float] | None] = []
+    strategy.fair = Decimal("100")
+    strategy.evaluate = lambda: seen.append(strategy._tick_clock)  # type: ignore[method-assign]
+
+    strategy.on_message(_message("ETH", "100.5"))
+
+    assert len(seen) == 1 and seen[0] is not None
+    assert strategy._tick_clock is None
+
+
+def test_on_message_combined_fair_reuses_parsed_prices(strategy: PFPLStrategy):
+    strategy.mid = Decimal("100")
+    strategy.fair_feed = "combined"
+    strategy.evaluate = lambda: None  # type: ignore[method-assign]
+
+    strategy.on_message(
+        {
+            "channel": "activeAssetCtx",
+            "data": {"coin": "ETH", "ctx": {"midPx": "101.0", "oraclePx": "102.5"}},
+        }
+    )
+
+    assert strategy.idx == Decimal("101.0")
+    assert strategy.ora == Decimal("102.5")
+    # 判定用の float は即座に、Decimal の平均は読まれたときに作られる
+    assert strategy._fair_f == pytest.approx(101.75)
+    assert strategy._fair_lazy
+    assert strategy.fair == Decimal("101.75")
+    assert not strategy._fair_lazy
+
+
+def test_on_message_active_asset_ctx_filters_other_coins(strategy: PFPLStrategy):
+    strategy.fair_feed = "indexPrices"
+    strategy.evaluate = lambda: None  # type: ignore[method-assign]
+
+    strategy.on_message(
+        {"channel": "activeAssetCtx", "data": {"coin": "BTC", "ctx": {"midPx": "1"}}}
+    )
+    assert strategy.idx is None
+
+    strategy.on_message(
+        {"channel": "activeAssetCtx", "data": {"coin": "eth", "ctx": {"midPx": "101"}}}
+    )
+    assert strategy.idx == Decimal("101")
+
+
+def test_on_message_active_asset_ctx_skips_unchanged_raw_values(strategy: PFPLStrategy):
+    strategy.fair_feed = "indexPrices"
+    strategy.evaluate = lambda: None  # type: ignore[method-assign]
+    frame = {
+        "channel": "activeAssetCtx",
+        "data": {
+            "coin": "ETH",
+            "ctx": {"midPx": "101.0", "oraclePx": "102.5", "impactPxs": ["100.9", "101.1"]},
+        },
+    }
+
+    strategy.on_message(frame)
+    idx, bid, ask = strategy.idx, strategy.best_bid, strategy.best_ask
+    assert (idx, bid, ask) == (Decimal("101.0"), Decimal("100.9"), Decimal("101.1"))
+
+    # 同じ生の値なら解析し直さず、同じ Decimal オブジェクトのまま
+    strategy.on_message(frame)
+    assert strategy.idx is idx
+    assert strategy.best_bid is bid and strategy.best_ask is ask
+
+    # 外部から差し替えられたら次のフレームで作り直す
+    strategy.best_bid = None
+    strategy.on_message(frame)
+    assert strategy.best_bid == Decimal("100.9")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+from types import SimpleNamespace
+
+# 〔この import がすること〕 src レイアウト/実行環境差に備えた二段構えの import
+try:
+    from bots.vrlg.risk_management import RiskManager
+except Exception:
+    from src.bots.vrlg.risk_management import RiskManager  # type: ignore
+
+
+def _cfg(block_interval_stop_s: float = 4.0) -> SimpleNamespace:
+    """〔この関数がすること〕 リスク設定を最小化した設定オブジェクトを返します。"""
+    return SimpleNamespace(risk=SimpleNamespace(block_interval_stop_s=block_interval_stop_s))
+
+
+def test_block_interval_median_tracks_rolling_window() -> None:
+    """〔このテストがすること〕 昇順の写しから引く移動中央値が statistics.median と一致することを確認します。"""
+    rm = RiskManager(_cfg(block_interval_stop_s=1e9))
+    rng = random.Random(7)
+    for _ in range(300):
+        rm.update_block_interval(rng.choice([0.5, 1.0, 1.0, rng.uniform(0.0, 6.0)]))
+        assert rm._block_window.median() == statistics.median(rm._block_window.values)
+    assert rm._block_window.sorted == sorted(rm._block_window.values)
+
+
+def test_block_interval_median_trips_killswitch() -> None:
+    """〔このテストがすること〕 移動中央値がしきい値を超えたら kill-switch が立つことを確認します。"""
+    rm = RiskManager(_cfg(block_interval_stop_s=4.0))
+    for _ in range(30):
+        rm.update_block_interval(1.0)
+    assert not rm.advice().killswitch
+    for _ in range(30):
+        rm.update_block_interval(5.0)
+    assert rm.advice().killswitch
+
+
+def test_window_sums_follow_trimmed_events(monkeypatch) -> None:
+    """〔このテストがすること〕 増減で持つ窓内合計が、トリム後のイベントの合計と一致することを確認します。"""
+    rm_mod = sys.modules[RiskManager.__module__]
+    clock = [1000.0]
+    monkeypatch.setattr(rm_mod.time, "time", lambda: clock[0])
+    rm = RiskManager(_cfg())
+    for i in range(40):
+        clock[0] += 0.7
+        rm.register_order_post(display_size=0.01 * (i % 5 + 1), top_depth=10.0)
+        rm.register_fill(fill_price=100.0 + 0.5 * (i % 3), ref_mid=100.0, tick_size=0.5)
+        assert abs(rm.book_impact_sum_5s() - sum(x for _, x in rm._impact_events)) < 1e-12
+        slips = [x for _, x in rm._slip_events]
+        assert abs(rm._slip_avg() - sum(slips) / len(slips)) < 1e-12
+    clock[0] += 120.0
+    assert rm.book_impact_sum_5s() == 0.0
+    assert rm._slip_avg() is None
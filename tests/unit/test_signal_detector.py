@@ -36,6 +36,7 @@ def test_signal_detector_triggers() -> None:
     # 発火条件: phase∈{0±0.2}, dob < 1000*(1-0.25)=750, spread>=2, |obi|<=0.6
     sig = det.update_and_maybe_signal(1.0, _feat(1.0, 100.0, 2.0, 600.0, 0.1, phase=0.05))
     assert sig is not None, "条件成立でシグナルが発火しませんでした"
+    assert len(sig.trace_id) == 12 and int(sig.trace_id, 16) >= 0, "相関IDが12桁の16進ではありません"
 
 
 def test_signal_detector_phase_off_no_signal() -> None:
@@ -66,3 +67,14 @@ def test_signal_detector_obi_limit() -> None:
         det.update_and_maybe_signal(i * 0.1, _feat(i * 0.1, 100.0, 1.0, 1000.0, 0.0, phase=0.5))
     sig = det.update_and_maybe_signal(1.0, _feat(1.0, 100.0, 3.0, 600.0, 0.5, phase=0.01))
     assert sig is None, "OBI上限超過でもシグナルが出てしまいました"
+
+
+def test_signal_detector_median_tracks_rolling_window() -> None:
+    """〔このテストがすること〕 窓から押し出された値が中央値に残らないことを確認します。"""
+    import statistics
+
+    det = SignalDetector(_cfg(N=4))
+    vals = [5.0, 1.0, 9.0, 3.0, 7.0, 2.0, 2.0, 8.0]
+    for i, v in enumerate(vals):
+        det.update_and_maybe_signal(i * 0.1, _feat(i * 0.1, 100.0, 1.0, v, 0.0, phase=0.5))
+        assert det._dob_window.median() == statistics.median(vals[max(0, i - 3) : i + 1])
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# 実行環境の import パス差（src 直下 or パッケージ化）に対応
+try:
+    from bots.vrlg.strategy import VRLGStrategy
+except Exception:
+    from src.bots.vrlg.strategy import VRLGStrategy  # type: ignore
+
+
+def _waiter(spread_ticks: float | None) -> SimpleNamespace:
+    """〔この関数がすること〕 _wait_spread_collapse が参照する属性だけを持つ代役を作ります。"""
+    snap = None if spread_ticks is None else SimpleNamespace(spread_ticks=spread_ticks)
+    return SimpleNamespace(
+        _features_updated=asyncio.Event(),
+        _stopping=asyncio.Event(),
+        _last_features=snap,
+    )
+
+
+@pytest.mark.asyncio
+async def test_wait_spread_collapse_returns_on_feature_update() -> None:
+    st = _waiter(5.0)
+    task = asyncio.create_task(VRLGStrategy._wait_spread_collapse(st, 1.0, 5.0))
+    await asyncio.sleep(0.01)
+    st._last_features = SimpleNamespace(spread_ticks=1.0)
+    st._features_updated.set()
+    assert await asyncio.wait_for(task, 0.5) is True
+
+
+@pytest.mark.asyncio
+async def test_wait_spread_collapse_stops_without_waiting_for_timeout() -> None:
+    st = _waiter(5.0)
+    task = asyncio.create_task(VRLGStrategy._wait_spread_collapse(st, 1.0, 30.0))
+    await asyncio.sleep(0.01)
+    st._stopping.set()
+    assert await asyncio.wait_for(task, 0.5) is False
+
+
+@pytest.mark.asyncio
+async def test_wait_spread_collapse_times_out() -> None:
+    st = _waiter(None)
+    assert await VRLGStrategy._wait_spread_collapse(st, 1.0, 0.02) is False